@@ -0,0 +1 @@
+"""BloodWar benchmarks (run from the repository root, e.g. python -m bench.frame_pipeline)."""
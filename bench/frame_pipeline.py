@@ -0,0 +1,262 @@
+"""BloodWar - Frame pipeline benchmark.
+
+Builds deterministic headless Game states with N enemies (plus projectiles,
+gems and particles scaled with N), runs Game.update and renders to an
+offscreen surface with the FrameProfiler enabled, and writes JSON with
+per-stage ops/sec and p50/p99 times. Stages are whatever the profiler
+records, so the bench always measures the game's own frame.
+
+Usage:
+    python -m bench.frame_pipeline
+    python -m bench.frame_pipeline --sizes 100 1000 10000 --frames 120
+    python -m bench.frame_pipeline --baseline bench/results/old.json
+"""
+
+import argparse
+import json
+import math
+import os
+import platform
+import random
+
+import pygame
+
+from constants import FPS, FIXED_DT, SNAPSHOT_RING_SIZE, SNAPSHOT_INTERVAL
+from enemy import Enemy, FastEnemy, TankEnemy
+from game import Game
+from src.renderer import Renderer
+from src.snapshot import SnapshotRing
+
+FRAME_BUDGET_MS = 1000.0 / FPS
+
+# Stage profileru obalující celý snímek (jejich součet = čas snímku)
+FRAME_STAGES = ("update", "draw")
+
+
+def _spawn_enemies(game: Game, rng: random.Random, count: int, radius: float) -> None:
+    """Nepřátelé rovnoměrně v kruhu kolem hráče (hustota ~ pozdní hra).
+
+    Same path as the spawner: room under the population cap, then
+    acquire from the class's ObjectPool (reusing killed enemies).
+    """
+    px, py = game.player.position.x, game.player.position.y
+    elapsed = game.elapsed_seconds
+    for _ in range(game.population.room(count)):
+        angle = rng.uniform(0, math.tau)
+        dist = radius * math.sqrt(rng.random())
+        cls = rng.choice((Enemy, Enemy, FastEnemy, TankEnemy))
+        enemy = game.enemy_pools[cls].acquire(
+            px + math.cos(angle) * dist, py + math.sin(angle) * dist, elapsed_seconds=elapsed,
+        )
+        game.enemies.add(enemy)
+        game.all_sprites.add(enemy)
+
+
+def _spawn_projectiles(game: Game, rng: random.Random, count: int) -> None:
+    for _ in range(count):
+        angle = rng.uniform(0, math.tau)
+        game.combat._spawn_projectile(pygame.math.Vector2(math.cos(angle), math.sin(angle)))
+
+
+def _spawn_gems(game: Game, rng: random.Random, count: int, radius: float) -> None:
+    px, py = game.player.position.x, game.player.position.y
+    for _ in range(count):
+        angle = rng.uniform(0, math.tau)
+        dist = radius * math.sqrt(rng.random())
+        game.gems.add(px + math.cos(angle) * dist, py + math.sin(angle) * dist)
+
+
+class BenchState:
+    """Deterministic game state kept at a fixed entity count between frames."""
+
+    def __init__(self, enemies: int, projectiles: int, gems: int, particles: int, seed: int = 1234) -> None:
+        self.enemies = enemies
+        self.projectiles = projectiles
+        self.gems = gems
+        self.particles = particles
+        self.radius = 400 + 12 * math.sqrt(enemies)
+        self.rng = random.Random(seed)
+
+        game = self.game = Game(headless=True, seed=seed)
+        # Jako okenní hra: rewind buffer a měření přes FrameProfiler
+        game.snapshots = SnapshotRing(SNAPSHOT_RING_SIZE, SNAPSHOT_INTERVAL)
+        game.profiler.enabled = True
+        # Strop populace = měřený počet; nad ENEMY_CAP by se jinak N nikdy nedosáhlo
+        game.population.cap = max(game.population.cap, enemies)
+        self.renderer = Renderer(game)
+        # Víc částic se do pevné kapacity nevejde (nejstarší se vytlačí)
+        self.particles = min(particles, game.particle_system.capacity)
+        # Pozdní fáze hry: 3 minuty, hráč nesmrtelný, pár upgradů do kolizí
+        game.frame_count = 180 * FPS
+        game.player.max_hp = game.player.hp = 10 ** 9
+        game.player.pierce = 2
+        game.player.has_explosion = True
+        game._update_camera()
+        self.top_up()
+
+    def top_up(self) -> None:
+        """Doplní entity na cílový počet (mimo měření)."""
+        game = self.game
+        rng = self.rng
+        game.level_up_pending = False
+        game.game_over = False
+        _spawn_enemies(game, rng, self.enemies - len(game.enemies), self.radius)
+        _spawn_projectiles(game, rng, self.projectiles - len(game.projectiles))
+        _spawn_gems(game, rng, self.gems - len(game.gems), self.radius)
+        while len(game.particle_system) < self.particles:
+            game.particle_system.spawn_death(
+                game.player.position.x + rng.uniform(-400, 400),
+                game.player.position.y + rng.uniform(-300, 300),
+            )
+
+    def frame(self) -> dict[str, float]:
+        """Run one frame (Game.update + render); return ms per profiler stage.
+
+        Stages that did not run this frame (e.g. snapshot between rewind
+        records) are missing from the result.
+        """
+        game = self.game
+        profiler = game.profiler
+        profiler.reset()
+        with profiler.stage("update"):
+            game.update(FIXED_DT)
+        with profiler.stage("draw"):
+            self.renderer.draw()
+        return {name: profiler.recent(name)[-1] for name in profiler.stage_names()}
+
+
+def _percentile(sorted_values: list[float], q: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, math.ceil(q * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def _summarize(samples_ms: list[float]) -> dict[str, float]:
+    ms = sorted(samples_ms)
+    mean = sum(ms) / len(ms)
+    return {
+        "mean_ms": round(mean, 4),
+        "p50_ms": round(_percentile(ms, 0.50), 4),
+        "p99_ms": round(_percentile(ms, 0.99), 4),
+        "ops_per_sec": round(1000.0 / mean, 1) if mean > 0 else None,
+    }
+
+
+def run_size(enemies: int, frames: int, warmup: int, seed: int) -> dict:
+    state = BenchState(
+        enemies=enemies,
+        projectiles=max(20, enemies // 10),
+        gems=enemies,
+        particles=min(5000, enemies),
+        seed=seed,
+    )
+    # Stage v pořadí prvního výskytu; snímek bez dané stage = 0 ms
+    samples: dict[str, list[float]] = {}
+    frame_samples: list[float] = []
+    for i in range(warmup + frames):
+        state.top_up()
+        times = state.frame()
+        if i < warmup:
+            continue
+        measured = i - warmup
+        for name, value in times.items():
+            samples.setdefault(name, [0.0] * measured)
+        for name, values in samples.items():
+            values.append(times.get(name, 0.0))
+        frame_samples.append(sum(times[name] for name in FRAME_STAGES))
+
+    frame = _summarize(frame_samples)
+    return {
+        "enemies": state.enemies,
+        "projectiles": state.projectiles,
+        "gems": state.gems,
+        "particles": state.particles,
+        "frames": frames,
+        "stages": {name: _summarize(values) for name, values in samples.items()},
+        "frame": frame,
+        "within_budget": frame["p99_ms"] <= FRAME_BUDGET_MS,
+        "pools": state.game.pool_stats(),            # reuse = měřila se i recyklace přes ObjectPool
+        "population": state.game.population.stats(),
+    }
+
+
+def _print_table(results: list[dict]) -> None:
+    stages = []
+    for result in results:
+        stages += [name for name in result["stages"] if name not in stages and name not in FRAME_STAGES]
+    header = f"{'enemies':>8} " + " ".join(f"{name[:11]:>11}" for name in stages) + f" {'frame p50':>10} {'frame p99':>10}"
+    print(header)
+    print("-" * len(header))
+    for result in results:
+        cells = " ".join(
+            f"{result['stages'][name]['p50_ms']:>11.3f}" if name in result["stages"] else f"{'-':>11}"
+            for name in stages
+        )
+        flag = "" if result["within_budget"] else "  < 60 FPS"
+        print(f"{result['enemies']:>8} {cells} {result['frame']['p50_ms']:>10.3f} {result['frame']['p99_ms']:>10.3f}{flag}")
+    print(f"(p50 ms per stage; budget {FRAME_BUDGET_MS:.2f} ms/frame)")
+
+
+def _compare(results: list[dict], baseline_path: str, tolerance: float) -> list[str]:
+    """Porovná p50 stage časy s baseline JSON; vrací popisy regresí."""
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = {r["enemies"]: r for r in json.load(f)["results"]}
+    regressions = []
+    for result in results:
+        old = baseline.get(result["enemies"])
+        if old is None:
+            continue
+        for name, stats in result["stages"].items():
+            old_stats = old["stages"].get(name)
+            if not old_stats or old_stats["p50_ms"] <= 0:
+                continue
+            ratio = stats["p50_ms"] / old_stats["p50_ms"]
+            if ratio > 1.0 + tolerance:
+                regressions.append(
+                    f"N={result['enemies']} {name}: {old_stats['p50_ms']:.3f} -> {stats['p50_ms']:.3f} ms (x{ratio:.2f})"
+                )
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="BloodWar frame pipeline benchmark")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 500, 1000, 2000, 5000, 10000])
+    parser.add_argument("--frames", type=int, default=120, help="measured frames per size")
+    parser.add_argument("--warmup", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=1234)
+    parser.add_argument("--out", default="bench/results/frame_pipeline.json")
+    parser.add_argument("--baseline", help="previous results JSON to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed p50 slowdown vs baseline")
+    args = parser.parse_args()
+
+    results = []
+    for size in args.sizes:
+        results.append(run_size(size, args.frames, args.warmup, args.seed))
+        print(f"N={size}: frame p50 {results[-1]['frame']['p50_ms']:.2f} ms")
+
+    _print_table(results)
+    os.makedirs(os.path.dirname(args.out) or ".", exist_ok=True)
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump({
+            "meta": {
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "frames": args.frames,
+                "seed": args.seed,
+                "budget_ms": FRAME_BUDGET_MS,
+            },
+            "results": results,
+        }, f, indent=2)
+    print(f"Results written to {args.out}")
+
+    if args.baseline:
+        regressions = _compare(results, args.baseline, args.tolerance)
+        for line in regressions:
+            print("REGRESSION", line)
+        if regressions:
+            raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -9,6 +9,8 @@ import pygame
 SCREEN_WIDTH = 800
 SCREEN_HEIGHT = 600
 FPS = 60
+FIXED_DT = 1.0 / FPS        # pevný krok simulace (sekundy)
+MAX_FRAME_TIME = 0.25       # strop na dohánění simulace po dlouhém snímku
 
 # ==============================================================================
 # BARVY
@@ -38,6 +40,12 @@ ENEMY_SIZE = 24
 BASE_ENEMY_SPEED = 100      # pixels per second (základ, roste s časem)
 ENEMY_SPEED = 100           # alias pro zpětnou kompatibilitu
 ENEMY_SPAWN_INTERVAL = 60   # frames (základ, klesá s časem)
+# Křivka spawnu (Game._current_spawn_interval, Spawner._spawn_count)
+SPAWN_INTERVAL_START = 45         # frames mezi vlnami na začátku hry
+SPAWN_INTERVAL_MIN = 5            # frames — spodní hranice
+SPAWN_INTERVAL_STEP = 5           # o kolik framů se interval zkrátí...
+SPAWN_INTERVAL_STEP_SECONDS = 10  # ...každých N sekund
+SPAWN_GROUP_STEP_SECONDS = 60     # každých N sekund +1 nepřítel ve vlně
 ENEMY_ANIM_SCALE = 3        # zvětšení sprite
 ENEMY_ANIM_SPEED = 0.3      # sekundy mezi snímky
 
@@ -57,13 +65,31 @@ GEM_SIZE = 10
 GEM_VALUE = 5               # XP za gem
 MAGNET_RADIUS = 100        # pixelů - vzdálenost pro magnet efekt
 GEM_SPEED = 200             # pixels per second - rychlost gemu k hráči
+GEM_BUCKET_SIZE = 128       # px — buňka mřížky GemStore (dotazy magnetu, sběru, renderu)
+GEM_MERGE_CELL = 160        # px — gemy mimo záběr ve stejné buňce se slučují
+GEM_MERGE_INTERVAL = 1.0    # sekundy mezi slučováním
+GEM_MERGE_MIN_GEMS = 200    # slučovat až nad tento počet gemů
+# Vzhled sloučených gemů: (min. počet základních gemů, poloměr, barva)
+GEM_TIERS = [
+    (1,  GEM_SIZE, GREEN),
+    (5,  13, (80, 170, 255)),
+    (25, 16, (255, 80, 80)),
+]
 
 # ==============================================================================
 # MAPA
 # ==============================================================================
 
-WORLD_WIDTH = 6400          # šířka světa v pixelech
-WORLD_HEIGHT = 4800         # výška světa v pixelech
+# Svět je neomezený — generuje se po chuncích (čtverec WORLD_CHUNK_TILES dlaždic)
+WORLD_SPAWN_X = 3200        # px — start hráče (okolí spawnu je bez jezer a stromů)
+WORLD_SPAWN_Y = 2400
+WORLD_CHUNK_TILES = 16      # dlaždic na stranu chunku (16 × 48 px = 768 px)
+WORLD_CHUNK_LAKE_CHANCE = 0.4   # šance na jezero v chunku (~ hustota původní mapy 6400×4800)
+WORLD_CHUNK_TREES = 4       # pokusů o strom na chunk
+WORLD_ACTIVE_RADIUS = 2     # chunků kolem hráče v aktivním okně (překážky, stromy, flow field)
+WORLD_PREFETCH_DISTANCE = 1200  # px — jak daleko ve směru pohybu se chunky generují předem
+WORLD_CHUNK_CACHE = 64      # LRU strop vygenerovaných chunků (voda + stromy)
+WORLD_BACKGROUND_CACHE = 12 # LRU strop upečených pozadí chunků (~2.4 MB každé)
 
 # ==============================================================================
 # XP A LEVEL-UP
@@ -122,6 +148,15 @@ VAMPIRE_HEAL_CAP = 7.5            # max heal_on_kill (3 upgrady po 2.5)
 # ==============================================================================
 
 ENEMY_SEPARATION_DIST = 30        # px — minimální vzdálenost mezi nepřáteli
+ENEMY_INDEX_CELL_SIZE = 64        # px — buňka sdíleného prostorového indexu nepřátel
+# LOD pásma nepřátel: (od vzdálenosti od hráče v px, aktualizace každý N-tý snímek,
+# rozpočet aktualizací za snímek; 0 = bez limitu). Pásmo 0 = plná simulace.
+ENEMY_LOD_BANDS = [
+    (0, 1, 0),
+    (700, 2, 800),        # těsně mimo záběr (800×600) — hrubý pohyb, bez animace a separace
+    (1400, 4, 400),       # daleko — jen občasný posun k hráči
+]
+FLOW_FIELD_SCAN_BUDGET = 8        # skenů přímek flow fieldu za snímek (8 = jeden průchod, ~1.5 ms); 0 = bez limitu
 
 FAST_ENEMY_SPEED_MULT = 2.0       # 2× rychlejší než base
 FAST_ENEMY_SCALE = 2              # menší sprite (oproti ENEMY_ANIM_SCALE = 3)
@@ -149,6 +184,15 @@ ENEMY_HP_SCALE_FACTOR = 1.35      # násobitel HP za interval (exponenciální r
 ENEMY_SPEED_SCALE_INTERVAL = 60   # každých 60 sekund +25% rychlost (bylo 90)
 ENEMY_CONTACT_DMG_INTERVAL = 90   # každých 90 sekund +10 kontaktní poškození (bylo 180)
 
+# POPULACE — strop nepřátel, recyklace vzdálených a hordy (src/population.py)
+ENEMY_CAP = 800                   # tvrdý strop živých nepřátel; nad ním se místo spawnu recyklují nejvzdálenější
+ENEMY_RECYCLE_DISTANCE = 2000     # px — dál od hráče = přesun zpět na spawn ring
+POPULATION_INTERVAL = 0.5         # s — jak často se recyklace a hordy vyhodnocují
+HORDE_MIN_DISTANCE = 1400         # px — shlukovat jen takto daleko od hráče
+HORDE_SPLIT_DISTANCE = 1000       # px — horda se rozpadne, když se hráč přiblíží
+HORDE_CELL = 320                  # px — buňka pro hledání hustých shluků
+HORDE_MIN_SIZE = 8                # min. počet nepřátel v buňce pro vytvoření hordy
+
 # POŠKOZENÍ PROJEKTILŮ A VÝBUCHU
 PROJECTILE_DAMAGE = 10            # damage za jeden zásah projektilu / orbitálu
 EXPLOSION_DAMAGE = 5              # damage výbuchu v AoE (není instant kill)
@@ -174,6 +218,19 @@ AURA_SLOW = 0.4         # násobič rychlosti při aure
 
 _tileset_cache: dict[tuple, pygame.Surface] = {}
 
+PARTICLE_CAPACITY = 4096      # strop živých částic (nejstarší se vytlačí)
+PARTICLE_FADE_LEVELS = 8      # kvantování vyblednutí částic (razítka)
+
+HP_BAR_LEVELS = 16            # kvantování HP barů (počet úrovní výplně v atlasu)
+HP_BARS_DAMAGED_ONLY = True   # False = bar i u nepřátel s plným HP
+
+ASSET_CACHE_DIR = ".asset_cache"   # disková cache zvětšených assetů (None = vypnuto)
+
+# Snímky stavu hry (src/snapshot.py) — F5 uložit, F9 načíst, F6 rewind
+SNAPSHOT_PATH = "saves/quicksave.bws"
+SNAPSHOT_RING_SIZE = 20       # kolik snímků drží rewind buffer
+SNAPSHOT_INTERVAL = 0.5       # s — jak často se do bufferu zapisuje (20 × 0.5 s = 10 s zpět)
+
 # ==============================================================================
 # UPGRADES - seznam dostupných upgradů
 # ==============================================================================
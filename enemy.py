@@ -1,24 +1,28 @@
 """Třídy Enemy, Projectile a OrbitalProjectile - nepřátelé a střelba."""
 
+import itertools
 import math
 
 import pygame
 
 from constants import (
-    ENEMY_SIZE, BASE_ENEMY_SPEED, RED,
+    ENEMY_SIZE, RED,
     PROJECTILE_SPEED, PROJECTILE_SIZE, YELLOW,
-    ENEMY_ANIM_SCALE, ENEMY_ANIM_SPEED,
+    ENEMY_ANIM_SCALE,
     FAST_ENEMY_SPEED_MULT, FAST_ENEMY_SCALE,
     TANK_ENEMY_HP, TANK_ENEMY_SCALE, TANK_ENEMY_SPEED_MULT, TANK_ENEMY_GEM_COUNT,
     TANK_ENEMY_CONTACT_DMG,
     ORBIT_RADIUS, ORBIT_SPEED,
     ENEMY_BASE_HP, ENEMY_HP_SCALE_INTERVAL, ENEMY_HP_SCALE_FACTOR,
-    ENEMY_SPEED_SCALE_INTERVAL,
     ENEMY_CONTACT_DMG_INTERVAL, PROJECTILE_DAMAGE,
     DANGER_TINTS,
 )
 
-from src.sprite_cache import _get_enemy_frames, _get_projectile_surface
+from src.enemy_pool import PooledField, PooledVector
+from src.sprite_cache import _get_enemy_frames, _get_projectile_surface, _get_orbital_surface
+
+# Unikátní ID nepřítele — na rozdíl od id() se nerecykluje s objektem z poolu
+_enemy_uids = itertools.count(1)
 
 
 def enemy_danger_tint(elapsed_seconds: float) -> tuple:
@@ -34,9 +38,59 @@ def enemy_danger_tint(elapsed_seconds: float) -> tuple:
 
 
 class Enemy(pygame.sprite.Sprite):
-    """Nepřítel - slime s animací, pohybuje se k hráči."""
+    """Nepřítel - slime s animací, pohybuje se k hráči.
+
+    Stav (pozice, rychlost, HP, animace) je v EnemyPool uložen ve sloupcových
+    polích; instance je pak jen pohled do svého řádku (viz src/enemy_pool.py).
+    Pohyb a animaci počítá vektorově EnemyPool.update — instance vlastní update nemá.
+    """
+
+    # Řádek v EnemyPool (None = samostatný nepřítel mimo pool)
+    _pool = None
+    _slot = -1
+    # ObjectPool, do kterého se nepřítel vrací po kill() (None = bez recyklace)
+    _object_pool = None
+
+    position = PooledVector()
+    velocity = PooledVector()
+    hp = PooledField()
+    max_hp = PooledField()
+    speed_mult = PooledField()
+    contact_damage = PooledField()
+    animation_timer = PooledField()
+    current_frame = PooledField()
+    half_size = PooledVector()
+    lod_dt = PooledField()
+    lod_band = PooledField()
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__()
+        self._hitbox = pygame.Rect(0, 0, 0, 0)
+        self.reset(*args, **kwargs)
+
+    @classmethod
+    def blank(cls) -> "Enemy":
+        """Nepřítel bez reset() — stav doplní revive() a sloupce EnemyPool (obnova snímku)."""
+        enemy = cls.__new__(cls)
+        pygame.sprite.Sprite.__init__(enemy)
+        enemy._hitbox = pygame.Rect(0, 0, 0, 0)
+        return enemy
+
+    def revive(self, anim_scale: int, color_tint: tuple | None, frames: list, frame: int, gem_count: int) -> None:
+        """Nové uid a vzhled bez reset(); pozici, HP a animaci dodá EnemyPool.add_rows."""
+        self.uid = next(_enemy_uids)
+        self.gem_count = gem_count
+        self.anim_scale = anim_scale
+        self.color_tint = color_tint
+        self.frames = frames
+        self.frame_width = frames[0].get_width()
+        self.frame_height = frames[0].get_height()
+        self.image = frames[frame]
+        self.rect = self.image.get_rect()
+        hb_size = int(min(self.frame_width, self.frame_height) * 0.55)
+        self._hitbox.size = (hb_size, hb_size)
 
-    def __init__(
+    def reset(
         self, x: float, y: float,
         hp: int = None,
         speed_mult: float = 1.0,
@@ -47,7 +101,8 @@ class Enemy(pygame.sprite.Sprite):
         color_tint: tuple = None,
         _auto_tint: bool = True,
     ) -> None:
-        super().__init__()
+        """(Re)inicializuje stav — volá __init__ i ObjectPool.acquire."""
+        self.uid = next(_enemy_uids)
 
         # Automatický tint dle obtížnosti (přepíše se explicitním color_tint)
         if color_tint is None and _auto_tint:
@@ -70,6 +125,8 @@ class Enemy(pygame.sprite.Sprite):
         self.contact_damage = contact_damage
 
         # Cached sprite frames (shared across enemies with same scale+tint)
+        self.anim_scale = anim_scale
+        self.color_tint = color_tint
         self.frames = _get_enemy_frames(anim_scale, color_tint)
         self.frame_width = self.frames[0].get_width()
         self.frame_height = self.frames[0].get_height()
@@ -78,9 +135,14 @@ class Enemy(pygame.sprite.Sprite):
         self.current_frame = 0
         self.animation_timer = 0.0
 
+        # LOD — pásmo vzdálenosti a nasčítaný dt od poslední aktualizace (src/lod.py)
+        self.lod_band = 0
+        self.lod_dt = 0.0
+
         # Nastavení image a rect
         self.image = self.frames[0]
         self.rect = self.image.get_rect(center=(x, y))
+        self.half_size = (self.frame_width * 0.5, self.frame_height * 0.5)
 
         # Pozice a rychlost pomocí Vector2
         self.position = pygame.math.Vector2(x, y)
@@ -88,52 +150,41 @@ class Enemy(pygame.sprite.Sprite):
 
         # Hitbox pro kolize — ~55 % kratší strany spritu
         hb_size = int(min(self.frame_width, self.frame_height) * 0.55)
-        self.hitbox = pygame.Rect(0, 0, hb_size, hb_size)
-        self.hitbox.center = (int(x), int(y))
+        self._hitbox.size = (hb_size, hb_size)
+        self._hitbox.center = (int(x), int(y))
+
+    @property
+    def hitbox(self) -> pygame.Rect:
+        """Hitbox — střed se dorovná na střed rectu až při čtení."""
+        hitbox = self._hitbox
+        hitbox.center = self.rect.center
+        return hitbox
+
+    @hitbox.setter
+    def hitbox(self, value: pygame.Rect) -> None:
+        self._hitbox = value
+
+    def kill(self) -> None:
+        """Odebere ze všech skupin; poolovaný nepřítel se vrátí do ObjectPool."""
+        if self.alive():
+            super().kill()
+            if self._object_pool is not None:
+                self._object_pool.release(self)
 
     def take_hit(self, damage: int = PROJECTILE_DAMAGE) -> bool:
         """Zpracuje zásah. Vrací True pokud nepřítel zemřel."""
         self.hp -= damage
         return self.hp <= 0
 
-    def update(self, dt: float, player_position: pygame.math.Vector2, elapsed_seconds: float = 0.0, slow_factor: float = 1.0) -> None:
-        """Aktualizace pozice nepřítele - pohyb k hráči."""
-        # Vektor od nepřítele k hráči
-        direction = player_position - self.position
-
-        # Normalizace a nastavení rychlosti
-        if direction.length() > 0:
-            self.velocity = direction.normalize()
-        else:
-            self.velocity = pygame.math.Vector2(0, 0)
-
-        # Rychlost roste s časem: každých 90s +25%; násobeno speed_mult a slow_factor
-        speed = BASE_ENEMY_SPEED * self.speed_mult * (1.0 + elapsed_seconds / ENEMY_SPEED_SCALE_INTERVAL) * slow_factor
-
-        # Pohyb podle delta time
-        self.position += self.velocity * speed * dt
-
-        # Aktualizace rect a hitboxu
-        self.rect.center = self.position
-        self.hitbox.center = self.rect.center
-
-        # Animace - střídání 2 framu
-        self.animation_timer += dt
-        if self.animation_timer >= ENEMY_ANIM_SPEED:
-            self.animation_timer = 0.0
-            self.current_frame = (self.current_frame + 1) % 2
-
-        self.image = self.frames[self.current_frame]
-
 
 class FastEnemy(Enemy):
     """Rychlý, malý nepřítel - 2× rychlost, menší sprite, HP škáluje (0.5× base)."""
 
-    def __init__(self, x: float, y: float, elapsed_seconds: float = 0.0) -> None:
+    def reset(self, x: float, y: float, elapsed_seconds: float = 0.0) -> None:
         # HP škáluje s časem jako base enemy, ale na 50 %
         minutes = int(elapsed_seconds / ENEMY_HP_SCALE_INTERVAL)
         scaled_hp = max(10, int(ENEMY_BASE_HP * 0.5 * (ENEMY_HP_SCALE_FACTOR ** minutes)))
-        super().__init__(
+        super().reset(
             x, y,
             hp=scaled_hp,
             speed_mult=FAST_ENEMY_SPEED_MULT,
@@ -147,12 +198,12 @@ class FastEnemy(Enemy):
 class TankEnemy(Enemy):
     """Pomalý, velký nepřítel - 3× HP base, větší sprite, 3 gemy."""
 
-    def __init__(self, x: float, y: float, elapsed_seconds: float = 0.0) -> None:
+    def reset(self, x: float, y: float, elapsed_seconds: float = 0.0) -> None:
         # HP škáluje s časem jako base enemy, ale na 300 %
         minutes = int(elapsed_seconds / ENEMY_HP_SCALE_INTERVAL)
         scaled_hp = int(ENEMY_BASE_HP * 3 * (ENEMY_HP_SCALE_FACTOR ** minutes))
         tank_dmg = TANK_ENEMY_CONTACT_DMG + int(elapsed_seconds / ENEMY_CONTACT_DMG_INTERVAL) * 10
-        super().__init__(
+        super().reset(
             x, y,
             hp=scaled_hp,
             speed_mult=TANK_ENEMY_SPEED_MULT,
@@ -166,11 +217,23 @@ class TankEnemy(Enemy):
 class Projectile(pygame.sprite.Sprite):
     """Projektil - žlutý čtvereček vystřelený směrem k nepříteli."""
 
-    def __init__(
+    # ObjectPool, do kterého se projektil vrací po kill() (None = bez recyklace)
+    _object_pool = None
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__()
+        self.rect = pygame.Rect(0, 0, 0, 0)
+        self.position = pygame.math.Vector2()
+        self.prev_position = pygame.math.Vector2()  # pozice před posledním krokem (swept test)
+        self.velocity = pygame.math.Vector2()
+        self._hit_enemies: set[int] = set()  # enemy uids already hit (max 1 hit per enemy)
+        self.reset(*args, **kwargs)
+
+    def reset(
         self, x: float, y: float, direction: pygame.math.Vector2,
         speed: float = None, size: int = None, lifetime: float = 2.0, pierce: int = 0,
     ) -> None:
-        super().__init__()
+        """(Re)inicializuje stav — volá __init__ i ObjectPool.acquire."""
         if speed is None:
             speed = PROJECTILE_SPEED
         if size is None:
@@ -178,18 +241,29 @@ class Projectile(pygame.sprite.Sprite):
 
         # Cached surface pro sprite
         self.image = _get_projectile_surface(size, YELLOW)
-        self.rect = self.image.get_rect(center=(x, y))
-
-        # Pozice a rychlost pomocí Vector2
-        self.position = pygame.math.Vector2(x, y)
-        self.velocity = direction.normalize() * speed
+        self.rect.size = self.image.get_size()
+        self.rect.center = (x, y)
+
+        # Pozice a rychlost pomocí Vector2 (in-place, bez alokace)
+        self.position.update(x, y)
+        self.prev_position.update(x, y)
+        self.velocity.update(direction)
+        self.velocity.scale_to_length(speed)
         self._lifetime = 0.0
         self._max_lifetime = lifetime
         self.pierce_remaining = pierce
-        self._hit_enemies: set[int] = set()  # enemy IDs already hit (max 1 hit per enemy)
+        self._hit_enemies.clear()
+
+    def kill(self) -> None:
+        """Odebere ze všech skupin; poolovaný projektil se vrátí do ObjectPool."""
+        if self.alive():
+            super().kill()
+            if self._object_pool is not None:
+                self._object_pool.release(self)
 
     def update(self, dt: float) -> None:
         """Aktualizace pozice projektilu."""
+        self.prev_position.update(self.position)
         self.position += self.velocity * dt
         self.rect.center = self.position
 
@@ -209,9 +283,8 @@ class OrbitalProjectile(pygame.sprite.Sprite):
         self.angle = angle_offset
         self._hit_cooldowns: dict[int, float] = {}
 
-        # Fialový kruh
-        self.image = pygame.Surface((18, 18), pygame.SRCALPHA)
-        pygame.draw.circle(self.image, (200, 80, 255), (9, 9), 9)
+        # Fialový kruh (sdílený surface)
+        self.image = _get_orbital_surface(9, (200, 80, 255))
         self.rect = self.image.get_rect()
         self.position = pygame.math.Vector2(0, 0)
 
@@ -232,8 +305,8 @@ class OrbitalProjectile(pygame.sprite.Sprite):
 
     def can_hit(self, enemy) -> bool:
         """Vrací True, pokud lze nepřítele znovu zasáhnout."""
-        return id(enemy) not in self._hit_cooldowns
+        return enemy.uid not in self._hit_cooldowns
 
     def register_hit(self, enemy) -> None:
         """Zaregistruje zásah — spustí cooldown pro daného nepřítele."""
-        self._hit_cooldowns[id(enemy)] = self.HIT_COOLDOWN
+        self._hit_cooldowns[enemy.uid] = self.HIT_COOLDOWN
@@ -1,27 +1,30 @@
 """BloodWar - main game class."""
 
 import math
+import os
 import random
 import sys
+import threading
 from math import sqrt
 
 import pygame
 
 from constants import (
-    SCREEN_WIDTH, SCREEN_HEIGHT, FPS,
-    WORLD_WIDTH, WORLD_HEIGHT,
-    TILE_SIZE, TILESET_SCALE,
-    ENEMY_SEPARATION_DIST,
+    SCREEN_WIDTH, SCREEN_HEIGHT, FPS, FIXED_DT, MAX_FRAME_TIME,
+    WORLD_SPAWN_X, WORLD_SPAWN_Y,
+    GEM_MERGE_INTERVAL, GEM_MERGE_MIN_GEMS,
+    ENEMY_SEPARATION_DIST, ENEMY_INDEX_CELL_SIZE,
+    SPAWN_INTERVAL_START, SPAWN_INTERVAL_MIN, SPAWN_INTERVAL_STEP, SPAWN_INTERVAL_STEP_SECONDS,
     AURA_SLOW, AURA_RADIUS,
     VAMPIRE_HEAL_CAP,
     LEVELUP_INVINCIBILITY_TIME,
     UPGRADES,
     COMBAT_ONLY_UNTIL_LEVEL,
+    SNAPSHOT_PATH, SNAPSHOT_RING_SIZE, SNAPSHOT_INTERVAL,
 )
 from tiles import get_tile, init_grass_variants
 from player import Player
-from items import Tree
-from enemy import OrbitalProjectile
+from enemy import Enemy, FastEnemy, TankEnemy, Projectile, OrbitalProjectile
 
 from src.input_handler import InputHandler
 from src.spawner import Spawner
@@ -29,79 +32,150 @@ from src.combat import Combat
 from src.collision import Collision
 from src.renderer import Renderer
 from src.particles import ParticleSystem
-from src.spatial_grid import SpatialGrid
-from src.world_generator import WorldGenerator
+from src.population import PopulationManager
+from src.enemy_pool import EnemyPool
+from src.flow_field import FlowField
+from src.lod import LodScheduler
+from src.gem_store import GemStore
+from src.object_pool import ObjectPool
+from src.profiler import FrameProfiler
+from src.snapshot import SnapshotRing, dump, restore
+from src.spatial_index import SpatialIndex
+from src.world import World
 
 
 class Game:
     """Main game class - game state manager."""
 
-    def __init__(self) -> None:
+    def __init__(self, headless: bool = False, seed: int | None = None) -> None:
+        """headless=True: bez okna a bez Rendereru (simulace, benchmarky).
+        seed: semínko herního RNG (spawner, stromy, level-up, částice); None = náhodné.
+        """
+        self.headless = headless
+        self.seed = seed
+        self.rng = random.Random(seed)
+
         # Initialize pygame
+        if headless:
+            # Dummy SDL drivery — žádné okno ani zvuk; display 1×1 jen kvůli convert()
+            os.environ["SDL_VIDEODRIVER"] = "dummy"
+            os.environ["SDL_AUDIODRIVER"] = "dummy"
         pygame.init()
-        self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
-        pygame.display.set_caption("BloodWar - Vampire Survivors Clone")
+        if headless:
+            pygame.display.set_mode((1, 1))
+            self.screen = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+        else:
+            self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+            pygame.display.set_caption("BloodWar - Vampire Survivors Clone")
         init_grass_variants()
         self.clock = pygame.time.Clock()
+        # Grass tile for background
+        self.grass_tile = get_tile(2, 3)
 
         # Sprite groups
         self.all_sprites = pygame.sprite.Group()
-        self.enemies = pygame.sprite.Group()
+        self.enemies = EnemyPool()   # struct-of-arrays stav nepřátel
+        # Snapshot pozic nepřátel v mřížce — jednou za snímek, sdílí kolize a další systémy
+        self.enemy_index = SpatialIndex(ENEMY_INDEX_CELL_SIZE)
         self.projectiles = pygame.sprite.Group()
-        self.gems = pygame.sprite.Group()
-        self.trees = pygame.sprite.Group()
+        self.gems = GemStore()       # XP gemy v polích (sloučené gemy mají count > 1)
+        # Recyklace spritů — kill() je vrací do poolu, spawner/combat je berou zpět
+        self.enemy_pools = {cls: ObjectPool(cls) for cls in (Enemy, FastEnemy, TankEnemy)}
+        self.projectile_pool = ObjectPool(Projectile)
         self.orbital_projectiles = pygame.sprite.Group()
-        # Vodní dlaždice — set (tile_col, tile_row) v souřadnicích světa
-        self.water_tiles: set[tuple[int, int]] = set()
 
-        # Create player in world center
-        self.player = Player(WORLD_WIDTH // 2, WORLD_HEIGHT // 2)
-        self.all_sprites.add(self.player)
+        # Nekonečný svět po chuncích — okno kolem hráče, prefetch vláknem jen s oknem
+        # (headless běhy generují synchronně, výsledek je stejný a deterministický)
+        self.world = self._create_world(self.rng.getrandbits(32))
+        # Flow field k hráči nad aktivním oknem překážek
+        self.flow_field = FlowField(self.world.obstacle_map)
+        # Nový svět připravovaný na pozadí (reroll_world)
+        self._next_world: World | None = None
+        self._world_thread: threading.Thread | None = None
+
+        # Debug
+        self.show_grid = False
+        self.profiler = FrameProfiler()   # F3 overlay, F4 export trace
 
-        # Generování vodních ploch NEJDŘÍVE — obdélníky s min. 1-tile mezerou mezi sebou
-        tile_px = TILE_SIZE * TILESET_SCALE          # 48 px
-        world_tw = WORLD_WIDTH // tile_px
-        world_th = WORLD_HEIGHT // tile_px
-        spawn_tc = (WORLD_WIDTH // 2) // tile_px
-        spawn_tr = (WORLD_HEIGHT // 2) // tile_px
-        rng = random.Random(42)
-        size_pool = [
-            (2, 2), (2, 3), (3, 2),                    # malé
-            (3, 4), (4, 3), (4, 4), (5, 3), (3, 5),   # střední
-            (6, 4), (4, 6), (7, 5), (5, 7),            # velká jezírka
-        ]
-        for _ in range(30):
-            w, h = rng.choice(size_pool)
-            cx = rng.randint(2, world_tw - w - 2)
-            cy = rng.randint(2, world_th - h - 2)
-            if abs(cx + w // 2 - spawn_tc) < 10 and abs(cy + h // 2 - spawn_tr) < 10:
-                continue
-            # Zkontrolovat 1-tile okraj kolem nového obdélníku — nesmí se dotýkat jiného jezera
-            if any((tx, ty) in self.water_tiles
-                   for ty in range(cy - 1, cy + h + 1)
-                   for tx in range(cx - 1, cx + w + 1)):
-                continue
-            for ty in range(cy, cy + h):
-                for tx in range(cx, cx + w):
-                    self.water_tiles.add((tx, ty))
-
-        # Generate 200 random trees — ne ve vodě (TREE_WIDTH=2, TREE_HEIGHT=3 tiles)
-        for _ in range(200):
-            x = random.randint(100, WORLD_WIDTH - 100)
-            y = random.randint(100, WORLD_HEIGHT - 100)
-            if self.player.position.distance_to(pygame.math.Vector2(x, y)) < 200:
-                continue
-            # Zkontrolovat zda plocha stromu (2×3 dlaždice) nezasahuje do vody
-            tc0 = x // tile_px
-            tc1 = (x + 2 * tile_px - 1) // tile_px
-            tr0 = (y - 3 * tile_px) // tile_px
-            tr1 = (y - 1) // tile_px
-            if any((tc, tr) in self.water_tiles
-                   for tr in range(tr0, tr1 + 1)
-                   for tc in range(tc0, tc1 + 1)):
-                continue
-            tree = Tree(x, y)
-            self.trees.add(tree)
+        # Initialize modules
+        self.input_handler = InputHandler(self)
+        self.spawner = Spawner(self)
+        self.population = PopulationManager(self)   # strop, recyklace, hordy
+        self.combat = Combat(self)
+        self.collision = Collision(self)
+        self.particle_system = ParticleSystem(random.Random(self.rng.random()))
+        # LOD pásma nepřátel — vzdálení se aktualizují řidčeji a hrubě
+        self.lod = LodScheduler()
+        # Rewind buffer posledních snímků stavu (F6) — jen s oknem
+        self.snapshots = None if headless else SnapshotRing(SNAPSHOT_RING_SIZE, SNAPSHOT_INTERVAL)
+
+        self.player = None
+        self.renderer = None
+        self.reset()
+        self.renderer = None if headless else Renderer(self)
+
+    # --- Svět ---
+
+    def _create_world(self, seed: int) -> World:
+        """Svět se semínkem `seed`; s oknem i prefetch vlákno."""
+        return World(seed, threaded=not self.headless, grass_tile=self.grass_tile)
+
+    @property
+    def trees(self) -> pygame.sprite.Group:
+        """Stromy aktivního okna světa."""
+        return self.world.trees
+
+    @property
+    def obstacle_map(self):
+        """Mapa překážek aktivního okna světa."""
+        return self.world.obstacle_map
+
+    def reroll_world(self) -> None:
+        """Začne na pozadí připravovat nový svět; použije ho reset(new_world=True)."""
+        if self._world_thread is not None or self._next_world is not None:
+            return
+        seed = self.rng.getrandbits(32)
+
+        def work() -> None:
+            self._next_world = self._create_world(seed)
+
+        self._world_thread = threading.Thread(target=work, name="world-reroll", daemon=True)
+        self._world_thread.start()
+
+    # --- Restart ---
+
+    def reset(self, new_world: bool = False) -> None:
+        """Nová hra bez Game.__init__ — display, assety, svět a statické indexy zůstávají.
+
+        Live enemies and projectiles go back to their object pools, gems,
+        particles, hordes and indices are cleared and all run state is
+        reset. With new_world=True the world prepared by reroll_world() is
+        swapped in (waiting for the worker if it is still running);
+        otherwise the current world's window moves back to the spawn.
+        """
+        world_changed = False
+        if new_world:
+            if self._next_world is None:
+                self.reroll_world()
+            self._world_thread.join()
+            self.world.close()
+            self.world = self._next_world
+            self._next_world = None
+            self._world_thread = None
+            world_changed = True
+
+        self._clear_entities()
+
+        # Create player in world center (bot/skript controller zůstává)
+        controller = self.player.controller if self.player is not None else None
+        self.player = Player(WORLD_SPAWN_X, WORLD_SPAWN_Y)
+        self.player.controller = controller
+        if controller is not None:
+            controller.reset()
+        self.all_sprites.add(self.player)
+        self.world.activate(WORLD_SPAWN_X, WORLD_SPAWN_Y)
+        self.flow_field.set_obstacles(self.world.obstacle_map)
+        self.flow_field.clear()
 
         # Game state
         self.running = True
@@ -125,49 +199,80 @@ class Game:
         # Timery (nahrazují frame_count % N)
         self.wand_timer = 0.0
         self.spawn_timer = 0.0
+        self.gem_merge_timer = 0.0
 
-        # Debug
-        self.show_grid = False
         self.camera_x = 0.0
         self.camera_y = 0.0
-
-        # Grass tile for background
-        self.grass_tile = get_tile(2, 3)
-
-        # Initialize modules
-        self.input_handler = InputHandler(self)
-        self.spawner = Spawner(self)
-        self.combat = Combat(self)
-        self.collision = Collision(self)
-        self.renderer = Renderer(self)
-        self.particle_system = ParticleSystem()
-        self._separation_grid = SpatialGrid(ENEMY_SEPARATION_DIST)
-
-        # Spatial grid pro stromy (statický - naplní se jednou)
-        self._tree_grid = SpatialGrid(TILE_SIZE * TILESET_SCALE * 2)  # cell ~ 96px
-        for tree in self.trees:
-            self._tree_grid.insert(tree)
-        # Tree spatial grid - static, populated once
-        tile_px = TILE_SIZE * TILESET_SCALE
-        self._tree_grid = SpatialGrid(tile_px * 2)  # cell size = 2 tiles
-        for tree in self.trees:
-            self._tree_grid.insert(tree)
+        if self.snapshots is not None:
+            self.snapshots.clear()
+        if self.renderer is not None:
+            self.renderer.reset(world_changed)
+
+    def _clear_entities(self) -> None:
+        """Entity zpět do poolů; gemy, částice, hordy a indexy prázdné."""
+        # Pool najednou (bez zápisu stavu zpět), kill() pak vrátí nepřátele do ObjectPool
+        enemies = self.enemies.views[:]
+        self.enemies.empty()
+        for enemy in enemies:
+            enemy.kill()
+        for projectile in list(self.projectiles):
+            projectile.kill()
+        self.orbital_projectiles.empty()
+        self.all_sprites.empty()
+        self.enemy_index.clear()
+        for object_pool in self.enemy_pools.values():
+            object_pool.recycle()
+        self.projectile_pool.recycle()
+        self.gems.clear()
+        self.particle_system.clear()
+        self.population.clear()
+        self.collision.reset()
+
+    # --- Snímky stavu ---
+
+    def save(self, path: str = SNAPSHOT_PATH) -> str:
+        """Uloží stav hry do binárního snímku (atomicky); vrací cestu, selhání = OSError."""
+        data = dump(self)
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp, "wb") as f:
+                f.write(data)
+            os.replace(tmp, path)
+        except OSError:
+            # Plný / read-only disk — nenechat po sobě půlku souboru; chybu hlásí volající
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            raise
+        return path
+
+    def load(self, path: str = SNAPSHOT_PATH) -> None:
+        """Obnoví stav hry ze snímku; poškozený soubor vyhodí ValueError a hru nezmění."""
+        with open(path, "rb") as f:
+            data = f.read()
+        restore(self, data)
+        if self.snapshots is not None:
+            self.snapshots.clear()
+
+    def rewind(self) -> bool:
+        """Vrátí hru o jeden snímek rewind bufferu zpět; False = buffer je prázdný."""
+        return self.snapshots is not None and self.snapshots.rewind(self)
 
     @property
     def elapsed_seconds(self) -> float:
         return self.frame_count / FPS
 
     def _current_spawn_interval(self) -> int:
-        """Spawn interval klesá každých 10s o 5 framů, minimum 5."""
-        reduction = int(self.elapsed_seconds // 10) * 5
-        return max(5, 45 - reduction)  # Základ 45 místo 60, min 5 místo 10
+        """Spawn interval klesá každých SPAWN_INTERVAL_STEP_SECONDS o SPAWN_INTERVAL_STEP framů."""
+        reduction = int(self.elapsed_seconds // SPAWN_INTERVAL_STEP_SECONDS) * SPAWN_INTERVAL_STEP
+        return max(SPAWN_INTERVAL_MIN, SPAWN_INTERVAL_START - reduction)
 
     def _update_camera(self) -> None:
-        """Kamera sleduje hráče, clampováno na hranice světa."""
+        """Kamera sleduje hráče (svět nemá hranice)."""
         self.camera_x = self.player.position.x - SCREEN_WIDTH / 2
         self.camera_y = self.player.position.y - SCREEN_HEIGHT / 2
-        self.camera_x = max(0, min(WORLD_WIDTH - SCREEN_WIDTH, self.camera_x))
-        self.camera_y = max(0, min(WORLD_HEIGHT - SCREEN_HEIGHT, self.camera_y))
 
     def _trigger_level_up(self) -> None:
         """Spustí level-up obrazovku s náhodnými volbami."""
@@ -176,7 +281,7 @@ class Game:
             pool = [u for u in UPGRADES if u.get("combat")]
         else:
             pool = UPGRADES
-        self.upgrade_choices = random.sample(pool, min(3, len(pool)))
+        self.upgrade_choices = self.rng.sample(pool, min(3, len(pool)))
         self.particle_system.spawn_level_up(self.player.position.x, self.player.position.y)
 
     def _scaled(self, uid: str, base: float) -> float:
@@ -261,127 +366,180 @@ class Game:
 
     def update(self, dt: float) -> None:
         """Update game state."""
-        self.particle_system.update(dt)
+        with self.profiler.stage("particles"):
+            self.particle_system.update(dt)
 
         if self.game_over or self.level_up_pending:
+            if self.game_over and self.renderer is not None:
+                # Po smrti připravit nový svět na pozadí — Shift+R ho pak jen vymění
+                self.reroll_world()
             return
 
         self.frame_count += 1
         self.score = self.frame_count // FPS
 
-        # Spawn enemy — timer místo frame_count %
+        stage = self.profiler.stage
+        with stage("spawn_shoot"):
+            self._update_timers(dt)
+        with stage("player"):
+            self.player.update(dt)
+        with stage("world"):
+            self._update_world()
+        with stage("enemies"):
+            self._update_enemies(dt)
+        with stage("population"):
+            self.population.update(dt)
+        with stage("separation"):
+            self._separate_enemies()
+        with stage("obstacles"):
+            self._resolve_enemy_obstacles()
+        with stage("projectiles"):
+            self._update_projectiles(dt)
+        with stage("gems"):
+            self._update_gems(dt)
+        self._update_camera()
+        with stage("enemy_index"):
+            self._rebuild_enemy_index()
+        with stage("collisions"):
+            self.collision.check_collisions()
+        if self.snapshots is not None:
+            with stage("snapshot"):
+                self.snapshots.record(self, dt)
+
+    # --- Fáze update (volané i samostatně z bench/) ---
+
+    def _update_timers(self, dt: float) -> None:
+        """Spawn a střelba — timery místo frame_count %."""
         self.spawn_timer += dt
         spawn_interval_s = self._current_spawn_interval() / FPS
         if self.spawn_timer >= spawn_interval_s:
             self.spawn_timer -= spawn_interval_s
             self.spawner.spawn_enemy()
 
-        # Shoot — timer místo frame_count %
         self.wand_timer += dt
         wand_cooldown_s = self.wand_cooldown_frames / FPS
         if self.wand_timer >= wand_cooldown_s:
             self.wand_timer -= wand_cooldown_s
             self.combat.shoot()
 
-        # Update player
-        self.player.update(dt)
-
-        # Update enemies (s slow_factor z ledové aury) - squared distance pro výkon
-        aura_radius = self.player.aura_radius
-        aura_radius_sq = aura_radius * aura_radius if aura_radius > 0 else 0
-        player_pos = self.player.position
-        for enemy in self.enemies:
-            if aura_radius > 0 and enemy.position.distance_squared_to(player_pos) < aura_radius_sq:
-                slow = self.player.aura_slow
-            else:
-                slow = 1.0
-            enemy.update(dt, self.player.position, self.elapsed_seconds, slow)
-
-        # Enemy separation — spatial grid O(n×k) místo O(n²)
-        grid = self._separation_grid
-        grid.clear()
-        for enemy in self.enemies:
-            grid.insert(enemy)
-        seen: set[tuple[int, int]] = set()
-        for e1 in self.enemies:
-            id1 = id(e1)
-            for e2 in grid.get_neighbors(e1):
-                pair = (id1, id(e2)) if id1 < id(e2) else (id(e2), id1)
-                if pair in seen:
-                    continue
-                seen.add(pair)
-                diff = e1.position - e2.position
-                dist = diff.length()
-                if 0 < dist < ENEMY_SEPARATION_DIST:
-                    push = diff.normalize() * (ENEMY_SEPARATION_DIST - dist) * 0.5
-                    e1.position += push
-                    e2.position -= push
-                    e1.rect.center = e1.position
-                    e2.rect.center = e2.position
-
-        # Enemy vs Tree collision - spatial grid O(n×k) místo O(n×m)
-        tree_grid = self._tree_grid
-        for enemy in self.enemies:
-            for tree in tree_grid.query_point(enemy.position.x, enemy.position.y):
-                if enemy.rect.colliderect(tree.hitbox):
-                    diff = enemy.position - pygame.math.Vector2(
-                        tree.hitbox.centerx, tree.hitbox.centery
-                    )
-                    if diff.length() > 0:
-                        enemy.position += diff.normalize() * 2
-                        enemy.rect.center = enemy.position
-
-        # Enemy vs Water tiles — kontrola okolních dlaždic středu nepřítele
-        tile_px = TILE_SIZE * TILESET_SCALE
-        for enemy in self.enemies:
-            ec = enemy.rect.centerx // tile_px
-            er = enemy.rect.centery // tile_px
-            for dr in range(-1, 2):
-                for dc in range(-1, 2):
-                    col, row = ec + dc, er + dr
-                    if (col, row) not in self.water_tiles:
-                        continue
-                    wr = pygame.Rect(col * tile_px, row * tile_px, tile_px, tile_px)
-                    if not enemy.rect.colliderect(wr):
-                        continue
-                    diff = enemy.position - pygame.math.Vector2(wr.centerx, wr.centery)
-                    if diff.length() > 0:
-                        enemy.position += diff.normalize() * 2
-                        enemy.rect.center = enemy.position
-
-        # Update projectiles
+    def _update_world(self) -> None:
+        """Aktivní okno světa za hráčem + prefetch chunků ve směru jeho pohybu."""
+        player = self.player
+        if self.world.update(player.position.x, player.position.y, player.velocity.x, player.velocity.y):
+            self.flow_field.set_obstacles(self.world.obstacle_map)
+
+    def _update_enemies(self, dt: float) -> None:
+        """Pohyb nepřátel — vektorově nad poli EnemyPool (flow field, ledová aura, animace)."""
+        self.flow_field.update(self.player.position.x, self.player.position.y)
+        self.enemies.update(
+            dt, self.player.position, self.elapsed_seconds,
+            self.player.aura_radius, self.player.aura_slow,
+            flow_field=self.flow_field, lod=self.lod,
+        )
+
+    def _separate_enemies(self) -> None:
+        """Enemy separation — cell list + dávkový scatter-add, jen blízké LOD pásmo."""
+        self.enemies.separate(ENEMY_SEPARATION_DIST, self.enemies.rows_in_band(0))
+
+    def _resolve_enemy_obstacles(self) -> None:
+        """Odtlačení nepřátel od stromů a vodních dlaždic — vektorově přes ObstacleMap.
+
+        Flow field keeps most enemies off obstacles; only enemies on a tile
+        next to one are tested, against the obstacle rects of their 3×3 tiles.
+        Enemies outside the near LOD band are skipped.
+        """
+        pool = self.enemies
+        rows = pool.rows_in_band(0)
+        if rows is None:
+            n = pool.count
+            if self.obstacle_map.push_enemies(pool.position[:n], pool.half_size[:n]):
+                pool.sync_views()
+        else:
+            positions = pool.position[rows]
+            if self.obstacle_map.push_enemies(positions, pool.half_size[rows]):
+                pool.position[rows] = positions
+                pool.sync_views(rows)
+
+    def _rebuild_enemy_index(self) -> None:
+        """Přestaví sdílený index nepřátel — po všech pohybech, před kolizemi.
+
+        Objects released to the object pools before this point are not in
+        the new snapshot, so they become reusable only now.
+        """
+        pool = self.enemies
+        n = pool.count
+        self.enemy_index.build(pool.position[:n], pool.views, pool.half_size[:n])
+        for object_pool in self.enemy_pools.values():
+            object_pool.recycle()
+        self.projectile_pool.recycle()
+
+    def lod_stats(self) -> dict[str, dict[str, int]]:
+        """Metriky LOD z posledního snímku: nepřátel v pásmu / zpracováno / odloženo."""
+        return {f"band{k}": dict(metrics) for k, metrics in enumerate(self.lod.metrics)}
+
+    def pool_stats(self) -> dict[str, dict[str, int]]:
+        """Statistiky object poolů (created / reused / released / dropped / free)."""
+        stats = {cls.__name__: pool.stats() for cls, pool in self.enemy_pools.items()}
+        stats["Projectile"] = self.projectile_pool.stats()
+        return stats
+
+    def _update_projectiles(self, dt: float) -> None:
+        """Projektily a orbitální projektily."""
         self.projectiles.update(dt)
-
-        # Update gems
-        for gem in self.gems:
-            gem.update(dt, self.player.position, self.player.magnet_radius, self.player.gem_speed_mult)
-
-        # Update orbitálních projektilů
         for orb in self.orbital_projectiles:
             orb.update(dt, self.player.position)
 
-        # Update camera
-        self._update_camera()
-
-        # Check collisions
-        self.collision.check_collisions()
+    def _update_gems(self, dt: float) -> None:
+        """Magnet efekt gemů; jednou za GEM_MERGE_INTERVAL sloučení gemů mimo záběr."""
+        self.gems.update(dt, self.player.position, self.player.magnet_radius, self.player.gem_speed_mult)
+        self.gem_merge_timer += dt
+        if self.gem_merge_timer >= GEM_MERGE_INTERVAL:
+            self.gem_merge_timer = 0.0
+            view = pygame.Rect(int(self.camera_x), int(self.camera_y), SCREEN_WIDTH, SCREEN_HEIGHT)
+            self.gems.merge(view, GEM_MERGE_MIN_GEMS)
 
     def handle_events(self) -> None:
         """Process events."""
         self.input_handler.handle_events()
 
+    def notify(self, text: str) -> None:
+        """Krátké hlášení na obrazovce (výsledek hotkeye); headless se zahodí."""
+        if self.renderer is not None:
+            self.renderer.notify(text)
+
     def draw(self) -> None:
         """Draw game."""
-        self.renderer.draw()
+        if self.renderer is not None:
+            self.renderer.draw()
 
     def run(self) -> None:
-        """Main game loop."""
+        """Main game loop — simulace v pevných krocích FIXED_DT, render jednou za snímek."""
+        accumulator = 0.0
+        profiler = self.profiler
         while self.running:
-            dt = self.clock.tick(FPS) / 1000.0
-
-            self.handle_events()
-            self.update(dt)
-            self.draw()
+            accumulator += min(self.clock.tick(FPS) / 1000.0, MAX_FRAME_TIME)
+
+            with profiler.stage("frame"):
+                self.handle_events()
+                while accumulator >= FIXED_DT:
+                    with profiler.stage("update"):
+                        self.update(FIXED_DT)
+                    accumulator -= FIXED_DT
+                with profiler.stage("draw"):
+                    self.draw()
+            if profiler.enabled:
+                profiler.counter(
+                    "entities",
+                    enemies=len(self.enemies), projectiles=len(self.projectiles),
+                    gems=len(self.gems), particles=len(self.particle_system),
+                )
+                profiler.counter("lod_processed", **{
+                    name: metrics["processed"] for name, metrics in self.lod_stats().items()
+                })
+                profiler.counter("world", **self.world.stats())
+                profiler.counter("pool_reused", **{
+                    name: stats["reused"] for name, stats in self.pool_stats().items()
+                })
 
         pygame.quit()
         sys.exit()
@@ -1,11 +1,10 @@
-"""Třídy Tree a ExperienceGem - herní objekty a předměty."""
+"""Třída Tree - herní objekty (XP gemy viz src/gem_store.py)."""
 
 import pygame
 
 from constants import (
     TILE_TREE_X, TILE_TREE_Y, TREE_WIDTH, TREE_HEIGHT,
-    TILE_SIZE, TILESET_SCALE, GEM_SIZE, GREEN,
-    GEM_SPEED,
+    TILE_SIZE, TILESET_SCALE,
 )
 from tiles import get_tile
 
@@ -34,29 +33,3 @@ class Tree(pygame.sprite.Sprite):
 
         # Pozice pro spatial grid (střed hitboxu)
         self.position = pygame.math.Vector2(self.hitbox.centerx, self.hitbox.centery)
-
-
-class ExperienceGem(pygame.sprite.Sprite):
-    """Experience Gem - zelený kroužek po smrti nepřítele."""
-
-    def __init__(self, x: float, y: float) -> None:
-        super().__init__()
-        # Vytvoření surface - krouzek (průhledný střed)
-        self.image = pygame.Surface((GEM_SIZE * 2, GEM_SIZE * 2), pygame.SRCALPHA)
-        pygame.draw.circle(self.image, GREEN, (GEM_SIZE, GEM_SIZE), GEM_SIZE)
-        pygame.draw.circle(self.image, (0, 0, 0), (GEM_SIZE, GEM_SIZE), GEM_SIZE // 2)
-        self.rect = self.image.get_rect(center=(x, y))
-
-        self.position = pygame.math.Vector2(x, y)
-
-    def update(self, dt: float, player_position: pygame.math.Vector2, magnet_radius: float = 100.0, gem_speed_mult: float = 1.0) -> None:
-        """Aktualizace pozice gemu - magnet efekt."""
-        distance = self.position.distance_to(player_position)
-
-        # Magnet efekt - pokud je hráč blízko, gem se pohybuje k hráči
-        if distance < magnet_radius:
-            direction = player_position - self.position
-            if direction.length() > 0:
-                self.position += direction.normalize() * GEM_SPEED * gem_speed_mult * dt
-
-        self.rect.center = self.position
@@ -3,12 +3,13 @@
 import pygame
 
 from constants import (
-    WORLD_WIDTH, WORLD_HEIGHT, PLAYER_SPEED,
+    PLAYER_SPEED,
     ANIMATION_SCALE, ANIMATION_SPEED, BLUE,
     MAGNET_RADIUS, PLAYER_MAX_HP, PLAYER_INVINCIBILITY_TIME,
     PROJECTILE_SPEED, PROJECTILE_SIZE,
     EXPLOSION_DAMAGE, EXPLOSION_RADIUS,
 )
+from src.assets import get_assets
 
 
 class Player(pygame.sprite.Sprite):
@@ -17,34 +18,24 @@ class Player(pygame.sprite.Sprite):
     def __init__(self, x: float, y: float) -> None:
         super().__init__()
 
-        # Načtení sprite sheetu
-        sprite_sheet = pygame.image.load("image/hero_sheet.png").convert()
+        # Sprite sheet zvětšený jednou za běh (src/assets.py) — černá je průhledná
+        sprite_sheet = get_assets().scaled("hero_sheet.png", ANIMATION_SCALE)
 
-        # Nastavení průhlednosti (černá barva)
-        sprite_sheet.set_colorkey((0, 0, 0))
-
-        # Rozměr jednoho snímku
-        frame_width = sprite_sheet.get_width() // 4
-        frame_height = sprite_sheet.get_height() // 4
-
-        # Zvětšení snímku
-        self.frame_width = frame_width * ANIMATION_SCALE
-        self.frame_height = frame_height * ANIMATION_SCALE
+        # Rozměr jednoho (už zvětšeného) snímku
+        self.frame_width = sprite_sheet.get_width() // 4
+        self.frame_height = sprite_sheet.get_height() // 4
 
         # Rozkrájení na 2D pole: self.animations[dir][frame]
         # Řádek 0 = DOLŮ, 1 = DOPRAVA, 2 = DOLEVA, 3 = NAHORU
-        self.animations: list[list[pygame.Surface]] = []
-        for row in range(4):
-            direction_frames = []
-            for col in range(4):
-                # Vyříznutí snímku
-                frame = sprite_sheet.subsurface(
-                    pygame.Rect(col * frame_width, row * frame_height, frame_width, frame_height)
-                )
-                # Zvětšení a přidání do seznamu
-                scaled_frame = pygame.transform.scale(frame, (self.frame_width, self.frame_height))
-                direction_frames.append(scaled_frame)
-            self.animations.append(direction_frames)
+        self.animations: list[list[pygame.Surface]] = [
+            [
+                sprite_sheet.subsurface(pygame.Rect(
+                    col * self.frame_width, row * self.frame_height, self.frame_width, self.frame_height,
+                ))
+                for col in range(4)
+            ]
+            for row in range(4)
+        ]
 
         # Mapování: index 1 = DOLEVA, index 2 = DOPRAVA (opačně než původní řádky)
         self.direction_map = {
@@ -106,19 +97,28 @@ class Player(pygame.sprite.Sprite):
         self.aura_slow = 1.0   # 1.0 = bez efektu; klesá s levely aury
         self.orbital_count = 0
 
+        # Zdroj pohybu: None = klávesnice, jinak objekt s direction(player) -> (dx, dy)
+        self.controller = None
+
         # HP systém
         self.max_hp = PLAYER_MAX_HP
         self.hp = PLAYER_MAX_HP
         self.invincibility_timer = 0.0
 
     def get_input(self) -> None:
-        """Zpracování vstupu z klávesnice."""
-        keys = pygame.key.get_pressed()
-
+        """Zpracování vstupu z klávesnice, případně z controlleru (skript / bot)."""
         # Reset rychlosti
         self.velocity.x = 0
         self.velocity.y = 0
 
+        if self.controller is not None:
+            self.velocity.x, self.velocity.y = self.controller.direction(self)
+            if self.velocity.length() > 0:
+                self.velocity = self.velocity.normalize()
+            return
+
+        keys = pygame.key.get_pressed()
+
         # WASD ovládání
         if keys[pygame.K_w]:
             self.velocity.y = -1
@@ -150,12 +150,6 @@ class Player(pygame.sprite.Sprite):
         effective_speed = self.speed + (150 if adrenalin_active else 0)
         self.position += self.velocity * effective_speed * dt
 
-        # Omezení pohybu na hranice světa
-        half_width = self.frame_width // 2
-        half_height = self.frame_height // 2
-        self.position.x = max(half_width, min(WORLD_WIDTH - half_width, self.position.x))
-        self.position.y = max(half_height, min(WORLD_HEIGHT - half_height, self.position.y))
-
         # Aktualizace rect a hitboxu
         self.rect.center = self.position
         self.hitbox.center = self.rect.center
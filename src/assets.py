@@ -0,0 +1,179 @@
+"""BloodWar - Asset manager module.
+
+Každý obrázek z image/ se dekóduje nejvýš jednou za běh a zvětšené varianty
+(dlaždice tilesetu, sprite sheety hráče a slimů) se postaví jedním průchodem
+při startu hry. Zvětšené pixely se navíc ukládají do diskové cache (surové
+RGBA, klíč = hash zdrojového souboru + výřez + měřítko), kterou další start
+jen namapuje přes mmap místo dekódování PNG a škálování.
+"""
+
+import hashlib
+import mmap
+import os
+import struct
+
+import pygame
+
+from constants import (
+    TILE_SIZE, TILESET_SCALE, GRASS_TILE_COL, GRASS_TILE_ROW,
+    POND_TILE_X, POND_TILE_Y, TILE_TREE_X, TILE_TREE_Y, TREE_WIDTH, TREE_HEIGHT,
+    ANIMATION_SCALE, ENEMY_ANIM_SCALE, FAST_ENEMY_SCALE, TANK_ENEMY_SCALE,
+    ASSET_CACHE_DIR,
+)
+
+_HEADER = struct.Struct("<4sII")     # magic, šířka, výška
+_MAGIC = b"BWA1"
+_COLORKEY = (0, 0, 0)                # průhledná barva sheetů hráče a slimů
+
+
+class AssetManager:
+    """Decode-once image store with prescaled variants and a disk cache.
+
+    `scaled(name, scale, region)` returns the region of image/<name> scaled
+    by an integer factor. Alpha images (tileset) use per-pixel alpha,
+    sprite sheets use a black colorkey. Entries built with `persist=True`
+    (the startup manifest) are written to `cache_dir`; on-demand extras
+    (e.g. the debug grid walking the whole tileset) stay in memory only.
+    """
+
+    def __init__(self, root: str = "image", cache_dir: str | None = ASSET_CACHE_DIR) -> None:
+        self.root = root
+        self.cache_dir = cache_dir
+        self._decoded: dict[str, pygame.Surface] = {}
+        self._scaled: dict[tuple, pygame.Surface] = {}
+        self._hashes: dict[str, str] = {}
+        # Statistiky (kolik PNG se dekódovalo, kolik variant přišlo z disku)
+        self.decodes = 0
+        self.disk_hits = 0
+        self.disk_writes = 0
+
+    @staticmethod
+    def _is_alpha(name: str) -> bool:
+        return name == "tileset.png"
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.root, name)
+
+    # --- Zdroj ---
+
+    def image(self, name: str) -> pygame.Surface:
+        """Dekódovaný (a zkonvertovaný) zdrojový obrázek — jednou za běh."""
+        surface = self._decoded.get(name)
+        if surface is None:
+            raw = pygame.image.load(self._path(name))
+            self.decodes += 1
+            if self._is_alpha(name):
+                surface = raw.convert_alpha()
+            else:
+                surface = raw.convert()
+                surface.set_colorkey(_COLORKEY)
+            self._decoded[name] = surface
+        return surface
+
+    def source_size(self, name: str) -> tuple[int, int]:
+        """Rozměr zdrojového PNG z hlavičky IHDR (bez dekódování)."""
+        if name in self._decoded:
+            return self._decoded[name].get_size()
+        with open(self._path(name), "rb") as f:
+            head = f.read(24)
+        if head[:8] == b"\x89PNG\r\n\x1a\n" and head[12:16] == b"IHDR":
+            return struct.unpack(">II", head[16:24])
+        return self.image(name).get_size()
+
+    def _source_hash(self, name: str) -> str:
+        digest = self._hashes.get(name)
+        if digest is None:
+            with open(self._path(name), "rb") as f:
+                digest = self._hashes[name] = hashlib.sha1(f.read()).hexdigest()[:16]
+        return digest
+
+    # --- Zvětšené varianty ---
+
+    def scaled(self, name: str, scale: int, region: tuple[int, int, int, int] | None = None,
+               persist: bool = False) -> pygame.Surface:
+        """Výřez `region` (x, y, w, h ve zdrojových px; None = celý obrázek) zvětšený `scale`×."""
+        key = (name, scale, region)
+        surface = self._scaled.get(key)
+        if surface is not None:
+            return surface
+        cache_path = self._cache_path(name, scale, region) if persist and self.cache_dir else None
+        if cache_path is not None:
+            surface = self._read_cache(name, cache_path)
+        if surface is None:
+            source = self.image(name)
+            if region is not None:
+                source = source.subsurface(pygame.Rect(region))
+            surface = pygame.transform.scale_by(source, scale)
+            if cache_path is not None:
+                self._write_cache(cache_path, surface)
+        self._scaled[key] = surface
+        return surface
+
+    def preload(self) -> None:
+        """Postaví všechny varianty, které hra používá — jeden průchod při startu."""
+        t = TILE_SIZE
+        self.scaled("tileset.png", TILESET_SCALE, (GRASS_TILE_COL * t, GRASS_TILE_ROW * t, t, t), persist=True)
+        for dy in range(3):
+            for dx in range(3):
+                self.scaled("tileset.png", TILESET_SCALE,
+                            ((POND_TILE_X + dx) * t, (POND_TILE_Y + dy) * t, t, t), persist=True)
+        self.scaled("tileset.png", TILESET_SCALE,
+                    (TILE_TREE_X * t, TILE_TREE_Y * t, TREE_WIDTH * t, TREE_HEIGHT * t), persist=True)
+        self.scaled("hero_sheet.png", ANIMATION_SCALE, persist=True)
+        for scale in (ENEMY_ANIM_SCALE, FAST_ENEMY_SCALE, TANK_ENEMY_SCALE):
+            self.scaled("slime.png", scale, persist=True)
+
+    # --- Disková cache ---
+
+    def _cache_path(self, name: str, scale: int, region: tuple | None) -> str:
+        stem = os.path.splitext(name)[0]
+        where = "full" if region is None else "_".join(map(str, region))
+        return os.path.join(self.cache_dir, f"{stem}-{self._source_hash(name)}-{where}-x{scale}.rgba")
+
+    def _read_cache(self, name: str, path: str) -> pygame.Surface | None:
+        try:
+            with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                magic, width, height = _HEADER.unpack_from(mapped)
+                if magic != _MAGIC or len(mapped) != _HEADER.size + width * height * 4:
+                    return None
+                with memoryview(mapped) as whole, whole[_HEADER.size:] as view:
+                    # convert*() kopíruje — mapování se pak může zavřít
+                    raw = pygame.image.frombuffer(view, (width, height), "RGBA")
+                    if self._is_alpha(name):
+                        surface = raw.convert_alpha()
+                    else:
+                        surface = raw.convert()
+                        surface.set_colorkey(_COLORKEY)
+                    del raw
+        except (OSError, ValueError, BufferError, struct.error):
+            return None
+        self.disk_hits += 1
+        return surface
+
+    def _write_cache(self, path: str, surface: pygame.Surface) -> None:
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            tmp = f"{path}.{os.getpid()}.tmp"
+            with open(tmp, "wb") as f:
+                f.write(_HEADER.pack(_MAGIC, *surface.get_size()))
+                f.write(pygame.image.tobytes(surface, "RGBA"))
+            os.replace(tmp, path)   # atomicky — souběžné starty nikdy nečtou půlku souboru
+            self.disk_writes += 1
+        except OSError:
+            pass    # cache je jen zrychlení; read-only disk nevadí
+
+    def clear(self) -> None:
+        """Zahodí paměťové cache (disková zůstává)."""
+        self._decoded.clear()
+        self._scaled.clear()
+
+
+_assets: AssetManager | None = None
+
+
+def get_assets() -> AssetManager:
+    """Sdílený AssetManager (vytvoří se při prvním použití)."""
+    global _assets
+    if _assets is None:
+        _assets = AssetManager()
+    return _assets
@@ -0,0 +1,63 @@
+"""BloodWar - Background cache module.
+
+Statické pozadí (tráva + autotilovaná voda) se peče po chuncích světa —
+jeden surface na chunk, typicky už ve vlákně prefetche světa. Upečená
+pozadí drží World v LRU (WORLD_BACKGROUND_CACHE), takže paměť je omezená
+bez ohledu na to, kam hráč dojde. Snímek pak stojí pár blitů chunků místo
+stovek blitů dlaždic.
+"""
+
+import pygame
+
+from constants import TILE_SIZE, TILESET_SCALE
+from tiles import get_water_tile
+
+
+def bake_chunk(chunk, grass_tile: pygame.Surface, chunk_tiles: int) -> pygame.Surface:
+    """Vykreslí pozadí jednoho chunku (bez vedlejších efektů — lze volat z vlákna).
+
+    Lakes keep a margin inside their chunk, so water autotiling only needs
+    the chunk's own water tiles.
+    """
+    tile_px = TILE_SIZE * TILESET_SCALE
+    size = chunk_tiles * tile_px
+    water_tiles = chunk.water_tiles
+    col0 = chunk.key[0] * chunk_tiles
+    row0 = chunk.key[1] * chunk_tiles
+
+    # Neprůhledný surface — rychlý blit bez alfa
+    surface = pygame.Surface((size, size)).convert()
+    blits = []
+    for row in range(row0, row0 + chunk_tiles):
+        for col in range(col0, col0 + chunk_tiles):
+            if (col, row) in water_tiles:
+                tile = get_water_tile(
+                    (col, row - 1) in water_tiles,
+                    (col, row + 1) in water_tiles,
+                    (col - 1, row) in water_tiles,
+                    (col + 1, row) in water_tiles,
+                )
+            else:
+                tile = grass_tile
+            blits.append((tile, ((col - col0) * tile_px, (row - row0) * tile_px)))
+    surface.blits(blits, doreturn=False)
+    return surface
+
+
+class BackgroundCache:
+    """Draws the baked chunk backgrounds held by a World."""
+
+    def __init__(self, world) -> None:
+        self.world = world
+
+    def draw(self, screen: pygame.Surface, cx: int, cy: int) -> None:
+        """Blit the chunks covering the screen at camera offset (cx, cy)."""
+        world = self.world
+        size = world.chunk_px
+        width, height = screen.get_size()
+        blits = [
+            (world.background((chunk_x, chunk_y)), (chunk_x * size - cx, chunk_y * size - cy))
+            for chunk_y in range(cy // size, (cy + height - 1) // size + 1)
+            for chunk_x in range(cx // size, (cx + width - 1) // size + 1)
+        ]
+        screen.blits(blits, doreturn=False)
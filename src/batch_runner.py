@@ -0,0 +1,225 @@
+"""BloodWar - Batch simulation runner.
+
+Paralelní balanční sweepy: mřížka konfigurací (přepsané hodnoty z
+constants.py) × semínka, každý běh je headless Simulation s botem v
+samostatném procesu (ProcessPoolExecutor přes všechna jádra). Výsledky se
+agregují do tabulky po konfiguracích a volitelně uloží jako JSON.
+
+Runner měří jen ranou hru (default --seconds 60): BotController (kiting +
+sběr gemů) umírá krátce po první minutě na levelu 1–3 bez ohledu na volbu
+upgradů — FastEnemy je pak rychlejší než hráč a HP nepřátel rostou
+rychleji než jeho palba. Ladit se tak dají konstanty, které působí v první
+minutě (spawn, základní HP a rychlosti, XP křivka); pozdější škálování
+(např. ENEMY_HP_SCALE_FACTOR mění počet zásahů až od 60 s) bot nerozliší.
+Runner proto upozorní, když žádný běh nedosáhne --seconds (a uloží
+`horizon_seconds`), a když různé konfigurace daly shodné výsledky.
+
+Usage:
+    python -m src.batch_runner --seeds 16
+    python -m src.batch_runner --set SPAWN_INTERVAL_START=35,45,55 --set ENEMY_BASE_HP=15,20
+    python -m src.batch_runner --configs sweep.json --json bench/results/sweep.json
+"""
+
+import argparse
+import ast
+import itertools
+import json
+import os
+import statistics
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import constants
+
+# Horizont, který bot pokryje (viz docstring) — výchozí délka běhu
+EARLY_GAME_SECONDS = 60.0
+
+
+def apply_overrides(overrides: dict) -> list[tuple[object, str, object]]:
+    """Přepíše hodnoty z constants.py — v constants i ve všech modulech, které si je importovaly.
+
+    Modules bind names with `from constants import X`, so each loaded module
+    holding the original object under that name is patched too. Values read
+    at call time (HP scaling, spawn curve, UPGRADES, ENEMY_CAP, ...) follow
+    the override; values baked into default arguments at import do not.
+    Returns the undo list for restore_overrides().
+    """
+    undo = []
+    for name, value in overrides.items():
+        if not hasattr(constants, name):
+            raise KeyError(f"Unknown constant: {name}")
+        original = getattr(constants, name)
+        for module in list(sys.modules.values()):
+            if module is not None and getattr(module, name, None) is original:
+                undo.append((module, name, original))
+                setattr(module, name, value)
+    return undo
+
+
+def restore_overrides(undo: list[tuple[object, str, object]]) -> None:
+    for module, name, original in reversed(undo):
+        setattr(module, name, original)
+
+
+def _init_worker() -> None:
+    # Dummy SDL drivery ještě před importem pygame
+    os.environ["SDL_VIDEODRIVER"] = "dummy"
+    os.environ["SDL_AUDIODRIVER"] = "dummy"
+    os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+
+def run_job(config_index: int, overrides: dict, seed: int, seconds: float) -> dict:
+    """Jeden běh v workeru: přepsat konstanty, simulovat, vrátit souhrn."""
+    _init_worker()
+    # Import až ve workeru — přepisované moduly musí být načtené před apply_overrides
+    from src.simulation import Simulation
+
+    undo = apply_overrides(overrides)
+    try:
+        result = Simulation(seed=seed).run(int(seconds * constants.FPS))
+    finally:
+        restore_overrides(undo)
+    result["config"] = config_index
+    return result
+
+
+def config_grid(assignments: list[str]) -> list[dict]:
+    """`NAME=v1,v2` přiřazení → kartézský součin konfigurací."""
+    axes = []
+    for assignment in assignments:
+        name, _, values = assignment.partition("=")
+        if not values:
+            raise ValueError(f"Expected NAME=value[,value...], got {assignment!r}")
+        parsed = ast.literal_eval(f"[{values}]")
+        axes.append([(name.strip(), value) for value in parsed])
+    return [dict(combo) for combo in itertools.product(*axes)]
+
+
+def summarize(configs: list[dict], results: list[dict]) -> list[dict]:
+    """Agregace běhů po konfiguracích (průměry přes semínka)."""
+    rows = []
+    for index, overrides in enumerate(configs):
+        runs = [r for r in results if r["config"] == index]
+        if not runs:
+            continue
+        survived = [r["time_survived"] for r in runs]
+        rows.append({
+            "config": overrides,
+            "runs": len(runs),
+            "survived_mean": statistics.fmean(survived),
+            "survived_stdev": statistics.pstdev(survived),
+            "survived_max": max(survived),
+            "deaths": sum(r["game_over"] for r in runs),
+            "kills_mean": statistics.fmean(r["kills"] for r in runs),
+            "level_mean": statistics.fmean(r["level"] for r in runs),
+            "level_max": max(r["level"] for r in runs),
+            "hp_mean": statistics.fmean(r["player_hp"] for r in runs),
+            "frame_ms_mean": statistics.fmean(r["frame_ms_mean"] for r in runs),
+            "frame_ms_p99": max(r["frame_ms_p99"] for r in runs),
+        })
+    return rows
+
+
+def horizon_note(results: list[dict], seconds: float) -> str | None:
+    """Upozornění, když žádný běh nedosáhl `seconds` — výsledky pak pokrývají jen začátek hry."""
+    horizon = max((r["time_survived"] for r in results), default=0.0)
+    if horizon >= seconds:
+        return None
+    return (
+        f"note: no run reached {seconds:.0f} s (longest {horizon:.0f} s, "
+        f"max level {max(r['level'] for r in results)}) — results cover only the early game"
+    )
+
+
+# Sloupce souhrnu, které popisují průběh hry (ne konfiguraci ani výkon)
+_OUTCOME_KEYS = ("survived_mean", "survived_stdev", "deaths", "kills_mean", "level_mean", "hp_mean")
+
+
+def identical_note(rows: list[dict]) -> str | None:
+    """Upozornění na konfigurace se shodným výsledkem — změna v nich nepůsobí v pokrytém horizontu."""
+    groups: dict[tuple, list[int]] = {}
+    for index, row in enumerate(rows):
+        groups.setdefault(tuple(row[key] for key in _OUTCOME_KEYS), []).append(index)
+    same = [indices for indices in groups.values() if len(indices) > 1]
+    if not same:
+        return None
+    listed = "; ".join(" = ".join(str(i) for i in indices) for indices in same)
+    return (
+        f"note: configs {listed} (table rows, from 0) gave identical runs — "
+        "the overridden values do not act within the time the bot survives"
+    )
+
+
+def _print_table(rows: list[dict]) -> None:
+    header = (
+        f"{'runs':>5} {'survived':>9} {'±':>6} {'max':>6} {'deaths':>6} {'kills':>8} {'level':>6} {'max':>4}"
+        f" {'hp':>5} {'frame ms':>9} {'p99 ms':>8}  config"
+    )
+    print(header)
+    print("-" * len(header))
+    for row in rows:
+        config = " ".join(f"{k}={v!r}" for k, v in row["config"].items()) or "(defaults)"
+        print(
+            f"{row['runs']:>5} {row['survived_mean']:>9.1f} {row['survived_stdev']:>6.1f} {row['survived_max']:>6.1f}"
+            f" {row['deaths']:>6} {row['kills_mean']:>8.1f} {row['level_mean']:>6.1f} {row['level_max']:>4}"
+            f" {row['hp_mean']:>5.1f} {row['frame_ms_mean']:>9.3f} {row['frame_ms_p99']:>8.3f}  {config}"
+        )
+
+
+def run_sweep(configs: list[dict], seeds: list[int], seconds: float, workers: int | None = None,
+              progress: bool = True) -> list[dict]:
+    """Spustí všechny (konfigurace × semínko) běhy paralelně; vrací surové výsledky."""
+    jobs = [(index, overrides, seed) for index, overrides in enumerate(configs) for seed in seeds]
+    results = []
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as executor:
+        futures = [executor.submit(run_job, index, overrides, seed, seconds) for index, overrides, seed in jobs]
+        for done, future in enumerate(as_completed(futures), start=1):
+            results.append(future.result())
+            if progress:
+                print(f"\r{done}/{len(jobs)} runs", end="", file=sys.stderr, flush=True)
+    if progress:
+        print(file=sys.stderr)
+    results.sort(key=lambda r: (r["config"], r["seed"]))
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Parallel headless BloodWar balancing sweeps")
+    parser.add_argument("--seeds", type=int, default=8, help="semínka 0..N-1 pro každou konfiguraci")
+    parser.add_argument("--seconds", type=float, default=EARLY_GAME_SECONDS,
+                        help="max simulated time per run (bot pokryje ~první minutu)")
+    parser.add_argument("--set", action="append", default=[], metavar="NAME=V1,V2",
+                        help="přepsat konstantu (víc hodnot = osa mřížky); opakovatelné")
+    parser.add_argument("--configs", help="JSON soubor se seznamem konfigurací (dict NAME -> hodnota)")
+    parser.add_argument("--workers", type=int, default=None, help="počet procesů (default: všechna jádra)")
+    parser.add_argument("--json", help="uložit souhrn a surové výsledky do JSON")
+    args = parser.parse_args()
+
+    configs = config_grid(args.set) if args.set else [{}]
+    if args.configs:
+        with open(args.configs, encoding="utf-8") as f:
+            configs = json.load(f)
+
+    start = time.perf_counter()
+    results = run_sweep(configs, list(range(args.seeds)), args.seconds, args.workers)
+    rows = summarize(configs, results)
+    _print_table(rows)
+    print(f"({len(results)} runs, {time.perf_counter() - start:.1f} s wall, "
+          f"{args.workers or os.cpu_count()} workers)")
+    for note in (horizon_note(results, args.seconds), identical_note(rows)):
+        if note:
+            print(note)
+
+    if args.json:
+        os.makedirs(os.path.dirname(args.json) or ".", exist_ok=True)
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({
+                "summary": rows,
+                "horizon_seconds": max((r["time_survived"] for r in results), default=0.0),
+                "runs": results,
+            }, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""BloodWar - Cell list module.
+
+Array-based uniform grid: entities are sorted by cell key, so every cell is
+a contiguous run of the sorted order and neighbour lookups are binary
+searches instead of per-entity dict buckets.
+"""
+
+import numpy as np
+
+
+def ragged_ranges(starts: np.ndarray, counts: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Expand ranges [starts[k], starts[k] + counts[k]) into flat arrays.
+
+    Returns (owner, index): owner[m] is the range number k, index[m] is the
+    position inside the concatenated ranges.
+    """
+    total = int(counts.sum())
+    owner = np.repeat(np.arange(len(counts)), counts)
+    if total == 0:
+        return owner, owner
+    first = np.cumsum(counts) - counts
+    index = np.arange(total) - np.repeat(first, counts) + np.repeat(starts, counts)
+    return owner, index
+
+
+class CellList:
+    """Uniform grid over a position array, built by sorting on cell key."""
+
+    # Polovina 3×3 okolí — každá dvojice sousedních buněk se projde jednou
+    _HALF_NEIGHBOURHOOD = ((1, -1), (1, 0), (1, 1), (0, 1))
+
+    def __init__(self, cell_size: float) -> None:
+        self.cell_size = cell_size
+        self._inv = 1.0 / cell_size
+        self.clear()
+
+    def clear(self) -> None:
+        self.order = np.zeros(0, dtype=np.int64)       # seřazené indexy entit
+        self.sorted_keys = np.zeros(0, dtype=np.int64)
+        self._origin = np.zeros(2, dtype=np.int64)
+        self._stride = 1
+
+    def __len__(self) -> int:
+        return len(self.order)
+
+    def _cells(self, pos: np.ndarray) -> np.ndarray:
+        return np.floor(pos * self._inv).astype(np.int64)
+
+    def build(self, pos: np.ndarray) -> None:
+        """Sort entities (rows of an (n, 2) position array) by cell key."""
+        if len(pos) == 0:
+            self.clear()
+            return
+        cells = self._cells(pos)
+        # Okraj 1 buňky kolem bounding boxu — sousední klíče nikdy nepřetečou do jiného sloupce
+        self._origin = cells.min(axis=0) - 1
+        cells -= self._origin
+        self._stride = int(cells[:, 1].max()) + 2
+        keys = cells[:, 0] * self._stride + cells[:, 1]
+        self.order = np.argsort(keys, kind="stable")
+        self.sorted_keys = keys[self.order]
+
+    def neighbour_pairs(self) -> tuple[np.ndarray, np.ndarray]:
+        """Return index arrays (i, j) of all entity pairs in the same or adjacent cells.
+
+        Every unordered pair is reported exactly once.
+        """
+        keys = self.sorted_keys
+        n = len(keys)
+        positions = np.arange(n)
+        firsts = []
+        seconds = []
+
+        # Stejná buňka — jen pozdější entity ve stejném běhu
+        cell_end = np.searchsorted(keys, keys, side="right")
+        owner, other = ragged_ranges(positions + 1, cell_end - positions - 1)
+        firsts.append(owner)
+        seconds.append(other)
+
+        # Sousední buňky (polovina okolí)
+        for dx, dy in self._HALF_NEIGHBOURHOOD:
+            target = keys + (dx * self._stride + dy)
+            lo = np.searchsorted(keys, target, side="left")
+            hi = np.searchsorted(keys, target, side="right")
+            owner, other = ragged_ranges(lo, hi - lo)
+            firsts.append(owner)
+            seconds.append(other)
+
+        order = self.order
+        return order[np.concatenate(firsts)], order[np.concatenate(seconds)]
+
+    def query_rects(
+        self, x0: np.ndarray, y0: np.ndarray, x1: np.ndarray, y1: np.ndarray,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Entities in cells overlapping each rect [x0, x1] × [y0, y1].
+
+        Returns (owner, entity): owner[m] is the rect number, entity[m] the
+        entity index. Cells of one column form a contiguous key range, so
+        each (rect, column) pair costs two binary searches.
+        """
+        empty = np.zeros(0, dtype=np.int64)
+        if len(self.order) == 0 or len(x0) == 0:
+            return empty, empty
+        inv = self._inv
+        ox, oy = self._origin
+        last_col = (self.sorted_keys[-1] // self._stride)
+        # Buňky mimo bounding box jsou prázdné — ořez na rozsah mřížky
+        c0 = np.maximum(np.floor(np.asarray(x0) * inv).astype(np.int64) - ox, 1)
+        c1 = np.minimum(np.floor(np.asarray(x1) * inv).astype(np.int64) - ox, last_col)
+        r0 = np.maximum(np.floor(np.asarray(y0) * inv).astype(np.int64) - oy, 1)
+        r1 = np.minimum(np.floor(np.asarray(y1) * inv).astype(np.int64) - oy, self._stride - 2)
+        valid = (c0 <= c1) & (r0 <= r1)
+        columns = np.where(valid, c1 - c0 + 1, 0)
+
+        # (obdélník, sloupec) dvojice → rozsah klíčů ve sloupci
+        rect_of_column, col_offset = ragged_ranges(np.zeros(len(columns), dtype=np.int64), columns)
+        col = c0[rect_of_column] + col_offset
+        lo = np.searchsorted(self.sorted_keys, col * self._stride + r0[rect_of_column], side="left")
+        hi = np.searchsorted(self.sorted_keys, col * self._stride + r1[rect_of_column], side="right")
+        range_owner, positions = ragged_ranges(lo, hi - lo)
+        return rect_of_column[range_owner], self.order[positions]
@@ -1,11 +1,10 @@
 """BloodWar - Collision module."""
 
+import numpy as np
 import pygame
-from pygame.sprite import spritecollide
 
-from constants import GEM_VALUE, xp_threshold, EXPLOSION_RADIUS, TILE_SIZE, TILESET_SCALE, PROJECTILE_DAMAGE, EXPLOSION_DAMAGE
+from constants import GEM_VALUE, xp_threshold, EXPLOSION_RADIUS, PROJECTILE_DAMAGE, EXPLOSION_DAMAGE
 from math import floor
-from items import ExperienceGem
 
 
 def resolve_rect_pushback(mover_rect: pygame.Rect, obstacle_rect: pygame.Rect) -> tuple[float, float]:
@@ -32,129 +31,90 @@ def resolve_rect_pushback(mover_rect: pygame.Rect, obstacle_rect: pygame.Rect) -
             return (0, overlap_y)
 
 
+def _enemies_near(index, rect: pygame.Rect) -> list:
+    """Živí nepřátelé z indexu, jejichž rozsah zasahuje do rectu (±1 px na zaokrouhlení).
+
+    Přesný test (colliderect) dělá volající.
+    """
+    return index.items_in_rect(
+        rect.left - 1, rect.top - 1, rect.right + 1, rect.bottom + 1, pygame.sprite.Sprite.alive,
+    )
+
+
 class Collision:
     """Handles collision detection and game logic."""
 
     def __init__(self, game) -> None:
         self.game = game
+        self._pending_explosions: list[tuple[float, float]] = []  # středy výbuchů čekající na vyhodnocení
+
+    def reset(self) -> None:
+        """Zahodí rozpracované výbuchy (restart hry)."""
+        self._pending_explosions.clear()
 
     def check_collisions(self) -> None:
         """Check all collision interactions."""
         if self.game.game_over:
             return
 
-        # Projectile vs Enemy — pierce logika (False, False = nemazat automaticky)
-        hits = pygame.sprite.groupcollide(
-            self.game.enemies, self.game.projectiles, False, False
-        )
-        dead_enemies: set[int] = set()
-        dead_projectiles: set[int] = set()
-
         # Damage = base + bonus_damage, × adrenalin
         player = self.game.player
         base_dmg = PROJECTILE_DAMAGE + player.bonus_damage
         dmg_mult = player.adrenalin_damage_mult if player.is_adrenalin_active else 1.0
         proj_damage = floor(base_dmg * dmg_mult)
 
-        for enemy, proj_list in hits.items():
-            if id(enemy) in dead_enemies:
+        # Projectile vs Enemy — zásahy v pořadí po dráze projektilu; pierce logika
+        for proj, enemy in self._projectile_hits():
+            # Mrtvý nepřítel / spotřebovaný projektil z dřívějšího zásahu v tomto snímku
+            if not proj.alive() or not enemy.alive():
                 continue
-            if not enemy.alive():
+            # Každý projektil může zasáhnout daného nepřítele max jednou
+            eid = enemy.uid
+            if eid in proj._hit_enemies:
                 continue
-            for proj in proj_list:
-                if id(proj) in dead_projectiles:
-                    continue
-                # Každý projektil může zasáhnout daného nepřítele max jednou
-                eid = id(enemy)
-                if eid in proj._hit_enemies:
-                    continue
-                proj._hit_enemies.add(eid)
-                # Nepřítel dostane hit
-                killed = enemy.take_hit(proj_damage)
-                # Pierce logika
-                if proj.pierce_remaining > 0:
-                    proj.pierce_remaining -= 1
-                else:
-                    dead_projectiles.add(id(proj))
-                    proj.kill()
-                # Smrt nepřítele
-                if killed:
-                    dead_enemies.add(id(enemy))
-                    self._handle_enemy_death(enemy)
-                    break
+            proj._hit_enemies.add(eid)
+            # Nepřítel dostane hit
+            killed = enemy.take_hit(proj_damage)
+            # Pierce logika
+            if proj.pierce_remaining > 0:
+                proj.pierce_remaining -= 1
+            else:
+                proj.kill()
+            # Smrt nepřítele
+            if killed:
+                self._handle_enemy_death(enemy)
 
         # Orbital vs Enemy
         orbital_damage = floor(base_dmg * dmg_mult)
+        index = self.game.enemy_index
         for orb in self.game.orbital_projectiles:
-            for enemy in spritecollide(orb, self.game.enemies, False):
+            for enemy in _enemies_near(index, orb.rect):
+                if not enemy.alive() or not orb.rect.colliderect(enemy.rect):
+                    continue
                 if orb.can_hit(enemy):
                     orb.register_hit(enemy)
                     if enemy.take_hit(orbital_damage):
                         self._handle_enemy_death(enemy)
 
-        # Player vs Gems
-        collected_gems = pygame.sprite.spritecollide(
-            self.game.player, self.game.gems, True
-        )
-        for gem in collected_gems:
-            self.game.xp += GEM_VALUE + self.game.player.xp_bonus
+        # Výbuchy ze všech zabití v tomto snímku najednou (i řetězové)
+        self._resolve_explosions()
+
+        # Player vs Gems — sloučený gem nese count základních gemů
+        for x, y, count in self.game.gems.collect(self.game.player.rect):
+            self.game.xp += count * (GEM_VALUE + self.game.player.xp_bonus)
             self._check_level_up()
-            self.game.particle_system.spawn_gem_pickup(gem.rect.centerx, gem.rect.centery)
+            self.game.particle_system.spawn_gem_pickup(x, y)
 
-        # Player vs Trees — směrový pushback
-        player = self.game.player
-        for tree in self.game.trees:
-            if player.rect.colliderect(tree.hitbox):
-                pr = player.rect
-                hb = tree.hitbox
-                overlap_x = min(pr.right, hb.right) - max(pr.left, hb.left)
-                overlap_y = min(pr.bottom, hb.bottom) - max(pr.top, hb.top)
-                if overlap_x < overlap_y:
-                    if pr.centerx < hb.centerx:
-                        player.position.x -= overlap_x
-                    else:
-                        player.position.x += overlap_x
-                else:
-                    if pr.centery < hb.centery:
-                        player.position.y -= overlap_y
-                    else:
-                        player.position.y += overlap_y
-                player.rect.center = player.position
-
-        # Player vs Water tiles — pushback z vodních dlaždic
-        tile_px = TILE_SIZE * TILESET_SCALE
-        water_tiles = self.game.water_tiles
-        pc = player.rect.centerx // tile_px
-        pr_row = player.rect.centery // tile_px
-        for dr in range(-1, 2):
-            for dc in range(-1, 2):
-                col, row = pc + dc, pr_row + dr
-                if (col, row) not in water_tiles:
-                    continue
-                wr = pygame.Rect(col * tile_px, row * tile_px, tile_px, tile_px)
-                if not player.rect.colliderect(wr):
-                    continue
-                pr = player.rect
-                overlap_x = min(pr.right, wr.right) - max(pr.left, wr.left)
-                overlap_y = min(pr.bottom, wr.bottom) - max(pr.top, wr.top)
-                if overlap_x < overlap_y:
-                    if pr.centerx < wr.centerx:
-                        player.position.x -= overlap_x
-                    else:
-                        player.position.x += overlap_x
-                else:
-                    if pr.centery < wr.centery:
-                        player.position.y -= overlap_y
-                    else:
-                        player.position.y += overlap_y
-                player.rect.center = player.position
+        # Player vs Trees / Water — směrový pushback přes statickou mapu překážek
+        self.game.obstacle_map.resolve_player(self.game.player)
 
         # Player vs Enemies — HP + neranitelnost (damage = max contact_damage z kolizních nepřátel)
         # Používáme hitbox (menší než rect) pro přesnou detekci dotyku
-        colliding = pygame.sprite.spritecollide(
-            self.game.player, self.game.enemies, False,
-            lambda p, e: p.hitbox.colliderect(e.hitbox),
-        )
+        player_hitbox = self.game.player.hitbox
+        colliding = [
+            e for e in _enemies_near(self.game.enemy_index, player_hitbox)
+            if player_hitbox.colliderect(e.hitbox)
+        ]
         if colliding:
             player = self.game.player
             if player.invincibility_timer <= 0:
@@ -163,23 +123,36 @@ class Collision:
             if player.take_hit(damage):
                 self.game.game_over = True
 
-    def _handle_enemy_death(self, enemy, already_killed: set = None, from_explosion: bool = False) -> None:
+    def _projectile_hits(self) -> list[tuple]:
+        """Candidate (projectile, enemy) hits from the shared enemy index.
+
+        Each projectile is swept from prev_position to position as a box,
+        so fast projectiles cannot tunnel through an enemy between frames.
+        Pairs come ordered by projectile, then by entry time along the path.
+        """
+        index = self.game.enemy_index
+        projectiles = self.game.projectiles.sprites()
+        if not projectiles or not len(index):
+            return []
+        paths = np.array([
+            (p.prev_position.x, p.prev_position.y, p.position.x, p.position.y, p.rect.width * 0.5)
+            for p in projectiles
+        ])
+        box, idx, _ = index.sweep_boxes(paths[:, 0:2], paths[:, 2:4], paths[:, 4])
+        items = index.items
+        return [(projectiles[b], items[i]) for b, i in zip(box.tolist(), idx.tolist())]
+
+    def _handle_enemy_death(self, enemy, from_explosion: bool = False) -> None:
         """Zpracuje smrt nepřítele: dropy, vampirismus, exploze.
 
         from_explosion=True: vampirismus se nepočítá (řetězové exploze by daly příliš mnoho léčení).
+        Exploze se jen zařadí do fronty, vyhodnotí je _resolve_explosions.
         """
         game = self.game
         player = game.player
 
-        if already_killed is None:
-            already_killed = set()
-        already_killed.add(id(enemy))
-
-        # Drop gemů
-        for _ in range(enemy.gem_count):
-            gem = ExperienceGem(enemy.position.x, enemy.position.y)
-            game.gems.add(gem)
-            game.all_sprites.add(gem)
+        # Drop gemů — gem_count gemů na jednom místě = jeden gem s count
+        game.gems.add(enemy.position.x, enemy.position.y, enemy.gem_count)
 
         game.particle_system.spawn_death(enemy.position.x, enemy.position.y)
         enemy.kill()
@@ -195,16 +168,29 @@ class Collision:
 
         # Exploze — AoE kolem zabitého nepřítele; udělá EXPLOSION_DAMAGE, nezabíjí ihned
         if player.has_explosion:
-            explosion_pos = enemy.position.copy()
-            explosion_radius_sq = player.explosion_radius * player.explosion_radius
-            game.particle_system.spawn_explosion(explosion_pos.x, explosion_pos.y)
-            for other in list(game.enemies):
-                if id(other) in already_killed:
-                    continue
-                if other.position.distance_squared_to(explosion_pos) <= explosion_radius_sq:
-                    if other.take_hit(player.explosion_damage):
-                        already_killed.add(id(other))
-                        self._handle_enemy_death(other, already_killed, from_explosion=True)
+            position = enemy.position
+            self._pending_explosions.append((position.x, position.y))
+            game.particle_system.spawn_explosion(position.x, position.y)
+
+    def _resolve_explosions(self) -> None:
+        """Vyhodnotí frontu výbuchů po vlnách (místo rekurze přes celou hordu).
+
+        Every wave queries the enemy index for all pending centers at once;
+        enemies killed by a wave enqueue their own explosions for the next
+        one. An enemy takes damage from every explosion that reaches it
+        while it is alive, as with the recursive chain.
+        """
+        player = self.game.player
+        index = self.game.enemy_index
+        items = index.items
+        while self._pending_explosions:
+            centers = np.array(self._pending_explosions)
+            self._pending_explosions.clear()
+            _, idx = index.within_many(centers, player.explosion_radius)
+            for i in idx.tolist():
+                other = items[i]
+                if other.alive() and other.take_hit(player.explosion_damage):
+                    self._handle_enemy_death(other, from_explosion=True)
 
     def _check_level_up(self) -> None:
         """Zkontroluje, zda hráč dosáhl dalšího levelu."""
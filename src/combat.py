@@ -4,7 +4,7 @@ import math
 
 import pygame
 
-from enemy import Enemy, Projectile
+from enemy import Enemy
 
 
 class Combat:
@@ -13,53 +13,53 @@ class Combat:
     def __init__(self, game) -> None:
         self.game = game
 
-    def find_nearest_enemy(self) -> "Enemy | None":
-        """Find nearest enemy to player using squared distance for performance."""
-        if not self.game.enemies:
-            return None
+    def find_targets(self, count: int) -> list["Enemy"]:
+        """Up to `count` distinct live enemies nearest to the player, nearest first.
 
-        nearest_enemy = None
-        nearest_dist_sq = float('inf')
+        Uses the shared enemy index (snapshot from the last collision pass),
+        so a shot costs an expanding grid search instead of a scan of all enemies.
+        """
+        index = self.game.enemy_index
+        items = index.items
         player_pos = self.game.player.position
+        found = index.k_nearest((player_pos.x, player_pos.y), count, pygame.sprite.Sprite.alive)
+        return [items[i] for i in found]
 
-        for enemy in self.game.enemies:
-            dist_sq = player_pos.distance_squared_to(enemy.position)
-            if dist_sq < nearest_dist_sq:
-                nearest_dist_sq = dist_sq
-                nearest_enemy = enemy
-
-        return nearest_enemy
+    def find_nearest_enemy(self) -> "Enemy | None":
+        """Find nearest enemy to player."""
+        targets = self.find_targets(1)
+        return targets[0] if targets else None
 
     def shoot(self) -> None:
-        """Shoot projectiles toward nearest enemy."""
-        target = self.find_nearest_enemy()
-        if target is None:
+        """Shoot projectiles toward the nearest enemies (multishot = distinct targets)."""
+        count = self.game.player.projectile_count
+        targets = self.find_targets(count)
+        if not targets:
             return
 
-        direction = target.position - self.game.player.position
+        player_pos = self.game.player.position
+        direction = targets[0].position - player_pos
         if direction.length() == 0:
             return
+        self._spawn_projectile(direction)
 
-        count = self.game.player.projectile_count
-
-        if count == 1:
-            self._spawn_projectile(direction)
-        else:
-            # Spread: rozložit projektily symetricky kolem cíle
-            spread_angle = 15.0  # stupňů mezi projektily
-            base_angle = math.atan2(direction.y, direction.x)
-            total_spread = spread_angle * (count - 1)
-            start_angle = base_angle - math.radians(total_spread / 2)
+        # Každý další projektil na jiného nepřítele
+        for target in targets[1:]:
+            target_dir = target.position - player_pos
+            self._spawn_projectile(target_dir if target_dir.length() > 0 else direction)
 
-            for i in range(count):
-                angle = start_angle + math.radians(spread_angle * i)
-                spread_dir = pygame.math.Vector2(math.cos(angle), math.sin(angle))
-                self._spawn_projectile(spread_dir)
+        # Málo cílů — zbylé projektily vějířem kolem nejbližšího, střídavě po stranách
+        spread_angle = 15.0  # stupňů mezi projektily
+        base_angle = math.atan2(direction.y, direction.x)
+        for i in range(1, count - len(targets) + 1):
+            side = 1 if i % 2 else -1
+            angle = base_angle + math.radians(spread_angle * ((i + 1) // 2) * side)
+            self._spawn_projectile(pygame.math.Vector2(math.cos(angle), math.sin(angle)))
 
     def _spawn_projectile(self, direction: pygame.math.Vector2) -> None:
         """Vytvoří projektil z pozice hráče s aktuálními stats hráče."""
         player = self.game.player
-        projectile = Projectile(
+        projectile = self.game.projectile_pool.acquire(
             player.position.x,
             player.position.y,
             direction,
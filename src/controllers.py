@@ -0,0 +1,128 @@
+"""BloodWar - Player controllers.
+
+Non-keyboard movement sources for Player.controller: scripted input for
+regression runs and a simple bot for headless simulations. A controller
+has direction(player) -> (dx, dy) and reset(), which Game.reset() and
+snapshot restore call so a run replays the same from either point.
+"""
+
+import numpy as np
+
+from constants import WORLD_SPAWN_X, WORLD_SPAWN_Y, FIXED_DT
+
+
+class ScriptedController:
+    """Replays a fixed movement script: [(frames, (dx, dy)), ...], looped."""
+
+    def __init__(self, script: list[tuple[int, tuple[float, float]]]) -> None:
+        self._script = script
+        self.reset()
+
+    def reset(self) -> None:
+        """Skript znovu od začátku."""
+        self._index = 0
+        self._frames_left = self._script[0][0] if self._script else 0
+
+    def direction(self, player) -> tuple[float, float]:
+        if not self._script:
+            return 0.0, 0.0
+        while self._frames_left <= 0:
+            self._index = (self._index + 1) % len(self._script)
+            self._frames_left = self._script[self._index][0]
+        self._frames_left -= 1
+        return self._script[self._index][1]
+
+
+class BotController:
+    """Kiting bot: keeps away from the nearest enemies and collects gems.
+
+    Every frame it scores `headings` evenly spaced directions by where the
+    player would be after `lookahead` seconds: threat from enemies within
+    `danger_radius` of that point (weight (danger_radius / d)², so the gap
+    between enemies wins when surrounded), progress toward the nearest gem
+    and the pull back to spawn; headings into blocked tiles are dropped.
+    Simulation takes the level-up choices. Kiting only works while the
+    player is the faster one: from ~60 s FastEnemy (2× base speed, growing
+    with time) outruns it, so bot runs cover the early game only (see
+    src/batch_runner.py).
+    """
+
+    STUCK_PENALTY = 10.0   # skóre ubrané směrům, ve kterých se bot zasekl
+
+    def __init__(self, game, danger_radius: float = 250.0, center_pull: float = 0.8,
+                 home_radius: float = 2400.0, headings: int = 16, lookahead: float = 0.4,
+                 gem_weight: float = 2.0) -> None:
+        self.game = game
+        self.danger_radius = danger_radius
+        self.center_pull = center_pull
+        self.home_radius = home_radius   # px od spawnu, kde tah zpět dosáhne plné síly
+        self.lookahead = lookahead       # s — jak daleko dopředu se kandidátní směry hodnotí
+        self.gem_weight = gem_weight
+        angles = np.linspace(0.0, 2.0 * np.pi, headings, endpoint=False)
+        self._headings = np.stack((np.cos(angles), np.sin(angles)), axis=1)
+        self.reset()
+
+    def reset(self) -> None:
+        """Zapomene pohyb z minulého snímku (detekce zaseknutí)."""
+        self._last_position = None
+        self._last_direction = (0.0, 0.0)
+        self._avoid = None        # směr, ve kterém se bot zasekl
+        self._avoid_frames = 0
+
+    def direction(self, player) -> tuple[float, float]:
+        px, py = player.position.x, player.position.y
+        stuck = (
+            self._last_position is not None
+            and self._last_direction != (0.0, 0.0)
+            and (player.position - self._last_position).length() < 0.4 * player.speed * FIXED_DT
+        )
+        self._last_position = player.position.copy()
+        # Zaseknutí o strom / vodu (roh mezi dlaždicemi) — chvíli ten směr penalizovat
+        if stuck:
+            self._avoid = np.array(self._last_direction)
+            self._avoid_frames = 20
+
+        # Kandidátní pozice po `lookahead` sekundách pro každý směr
+        reach = player.speed * self.lookahead
+        origin = np.array((px, py))
+        ahead = origin + self._headings * reach
+        score = np.zeros(len(ahead))
+
+        # Hrozba — nepřátelé v dosahu kandidátních pozic, váha (danger_radius / d)²
+        pool = self.game.enemies
+        n = pool.count
+        if n:
+            positions = pool.position[:n]
+            diff = positions - origin
+            close = np.einsum("ij,ij->i", diff, diff) < (self.danger_radius + reach) ** 2
+            if close.any():
+                gaps = ahead[:, None, :] - positions[close][None, :, :]
+                dist_sq = np.maximum(np.einsum("hij,hij->hi", gaps, gaps), 1.0)
+                score -= np.where(dist_sq < self.danger_radius ** 2, self.danger_radius ** 2 / dist_sq, 0.0).sum(axis=1)
+
+        # Gem — postup k nejbližšímu (v délkách kroku, -1..1)
+        gem = self.game.gems.nearest(px, py)
+        if gem is not None:
+            target = np.array(gem)
+            progress = np.hypot(*(target - origin)) - np.hypot(*(target - ahead).T)
+            score += self.gem_weight * progress / reach
+
+        # Tah ke spawnu sílí se vzdáleností — bot se v nekonečném světě nezatoulá
+        home = np.array((WORLD_SPAWN_X, WORLD_SPAWN_Y))
+        center_dist = np.hypot(*(home - origin))
+        if center_dist > 0:
+            pull = self.center_pull * min(1.0, center_dist / self.home_radius)
+            score += pull * (center_dist - np.hypot(*(home - ahead).T)) / reach
+
+        # Směry do vody / stromů vyřadit (kontrola v půlce a na konci kroku)
+        obstacle_map = self.game.obstacle_map
+        if obstacle_map is not None:
+            for fraction in (0.5, 1.0):
+                score[obstacle_map.blocked_at(origin + self._headings * (reach * fraction))] -= 1e6
+        if self._avoid_frames > 0:
+            self._avoid_frames -= 1
+            score[self._headings @ self._avoid > 0.5] -= self.STUCK_PENALTY
+
+        dx, dy = self._headings[int(np.argmax(score))].tolist()
+        self._last_direction = (dx, dy)
+        return dx, dy
@@ -0,0 +1,341 @@
+"""BloodWar - Enemy pool module.
+
+Struct-of-arrays backend for enemies. Pozice, rychlosti, HP a animační
+časovače všech nepřátel leží v souvislých NumPy polích, takže pohyb celé
+hordy je pár vektorových operací místo Python smyčky přes jednotlivé sprity.
+Instance `Enemy` zůstávají jako lehké pohledy do polí (kvůli sprite groupám,
+renderu a kolizím).
+"""
+
+import numpy as np
+import pygame
+
+from constants import BASE_ENEMY_SPEED, ENEMY_SPEED_SCALE_INTERVAL, ENEMY_ANIM_SPEED, ENEMY_SEPARATION_DIST
+
+from src.cell_list import CellList
+
+
+class PooledField:
+    """Descriptor for an enemy attribute stored in an EnemyPool column.
+
+    While the enemy is not in a pool, the value lives on the instance
+    (under `_<name>`), so enemies can be created and used standalone.
+    """
+
+    def __set_name__(self, owner, name: str) -> None:
+        self.name = name
+        self.local = "_" + name
+
+    def __get__(self, obj, owner=None):
+        if obj is None:
+            return self
+        pool = obj._pool
+        if pool is None:
+            return getattr(obj, self.local)
+        return getattr(pool, self.name)[obj._slot].item()
+
+    def __set__(self, obj, value) -> None:
+        pool = obj._pool
+        if pool is None:
+            setattr(obj, self.local, value)
+        else:
+            getattr(pool, self.name)[obj._slot] = value
+
+
+class PooledVector(PooledField):
+    """Descriptor for a 2D vector attribute (position, velocity).
+
+    Inside a pool the getter returns a copy: `enemy.position += v` works,
+    `enemy.position.x += 1` does not write back.
+    """
+
+    def __get__(self, obj, owner=None):
+        if obj is None:
+            return self
+        pool = obj._pool
+        if pool is None:
+            return getattr(obj, self.local)
+        return pygame.math.Vector2(getattr(pool, self.name)[obj._slot])
+
+    def __set__(self, obj, value) -> None:
+        pool = obj._pool
+        if pool is None:
+            setattr(obj, self.local, pygame.math.Vector2(value))
+        else:
+            getattr(pool, self.name)[obj._slot] = value
+
+
+class EnemyPool(pygame.sprite.Group):
+    """Sprite group keeping enemy state in contiguous NumPy columns.
+
+    Rows `0..count-1` are live enemies; removal swaps the last row into the
+    freed slot, so every column stays dense and can be processed as a slice.
+    """
+
+    # (název sloupce, tvar jednoho řádku, dtype) — názvy odpovídají atributům Enemy
+    COLUMNS = (
+        ("position", (2,), np.float64),
+        ("velocity", (2,), np.float64),
+        ("hp", (), np.float64),
+        ("max_hp", (), np.int64),
+        ("speed_mult", (), np.float64),
+        ("contact_damage", (), np.int64),
+        ("animation_timer", (), np.float64),
+        ("current_frame", (), np.int64),
+        ("half_size", (2,), np.float64),
+        ("lod_dt", (), np.float64),
+        ("lod_band", (), np.int64),
+    )
+
+    def __init__(self, *sprites, capacity: int = 256) -> None:
+        self._capacity = capacity
+        self._count = 0
+        self._views: list = []
+        self._rects: list[pygame.Rect] = []   # rect každého řádku (pro rychlý sync)
+        self._separation_cells = CellList(ENEMY_SEPARATION_DIST)
+        for name, shape, dtype in self.COLUMNS:
+            setattr(self, name, np.zeros((capacity,) + shape, dtype=dtype))
+        super().__init__(*sprites)
+
+    @property
+    def count(self) -> int:
+        return self._count
+
+    @property
+    def views(self) -> list:
+        """Enemy instances in row order (views[i] is backed by row i)."""
+        return self._views
+
+    def __len__(self) -> int:
+        return self._count
+
+    def _grow(self) -> None:
+        """Zdvojnásobí kapacitu všech sloupců."""
+        new_capacity = self._capacity * 2
+        for name, shape, dtype in self.COLUMNS:
+            old = getattr(self, name)
+            new = np.zeros((new_capacity,) + shape, dtype=dtype)
+            new[:self._count] = old[:self._count]
+            setattr(self, name, new)
+        self._capacity = new_capacity
+
+    def add_internal(self, sprite, layer=None) -> None:
+        if sprite._pool is not None:
+            raise ValueError("Enemy already belongs to an EnemyPool")
+        super().add_internal(sprite, layer)
+        slot = self._count
+        if slot == self._capacity:
+            self._grow()
+        for name, _, _ in self.COLUMNS:
+            getattr(self, name)[slot] = getattr(sprite, "_" + name)
+        self._views.append(sprite)
+        self._rects.append(sprite.rect)
+        sprite._slot = slot
+        sprite._pool = self
+        self._count += 1
+
+    def add_rows(self, sprites: list, columns: dict[str, np.ndarray]) -> None:
+        """Přidá nepřátele najednou se stavem z `columns` (název sloupce → pole řádků).
+
+        Bulk counterpart of add() for restoring snapshots: column values are
+        copied as slices instead of per enemy; rects are not synced.
+        """
+        if any(sprite._pool is not None for sprite in sprites):
+            raise ValueError("Enemy already belongs to an EnemyPool")
+        start = self._count
+        end = start + len(sprites)
+        while end > self._capacity:
+            self._grow()
+        for name, _, _ in self.COLUMNS:
+            getattr(self, name)[start:end] = columns[name]
+        for slot, sprite in enumerate(sprites, start):
+            pygame.sprite.Group.add_internal(self, sprite)
+            sprite.add_internal(self)
+            sprite._slot = slot
+            sprite._pool = self
+        self._views.extend(sprites)
+        self._rects.extend(sprite.rect for sprite in sprites)
+        self._count = end
+
+    def empty(self) -> None:
+        """Odebere všechny nepřátele najednou — bez zápisu stavu zpět do instancí.
+
+        Unlike remove(), the removed enemies keep their stale standalone
+        state; use it only for enemies that are being discarded or re-reset.
+        """
+        for sprite in self._views:
+            pygame.sprite.Group.remove_internal(self, sprite)
+            sprite.remove_internal(self)
+            sprite._pool = None
+            sprite._slot = -1
+        self._views.clear()
+        self._rects.clear()
+        self._count = 0
+
+    def remove_internal(self, sprite) -> None:
+        super().remove_internal(sprite)
+        slot = sprite._slot
+        # Stav zpět do instance — po kill() se ještě čte např. pozice pro dropy
+        sprite._pool = None
+        sprite._slot = -1
+        for name, shape, _ in self.COLUMNS:
+            value = getattr(self, name)[slot]
+            setattr(sprite, "_" + name, pygame.math.Vector2(value) if shape else value.item())
+
+        # Poslední řádek přesunout do uvolněného slotu
+        last = self._count - 1
+        if slot != last:
+            for name, _, _ in self.COLUMNS:
+                column = getattr(self, name)
+                column[slot] = column[last]
+            moved = self._views[last]
+            self._views[slot] = moved
+            self._rects[slot] = self._rects[last]
+            moved._slot = slot
+        self._views.pop()
+        self._rects.pop()
+        self._count -= 1
+
+    def update(
+        self, dt: float, player_position: pygame.math.Vector2,
+        elapsed_seconds: float = 0.0,
+        aura_radius: float = 0.0, aura_slow: float = 1.0,
+        flow_field=None, lod=None,
+    ) -> None:
+        """Move and animate every enemy at once (the only enemy update path).
+
+        Seek-player movement, ice aura slow and the 2-frame animation are
+        advanced for all enemies at once, then rects/images are synced.
+        With a `flow_field`, enemies inside its window follow the field
+        around water and trees instead of walking straight at the player.
+        With a `lod` scheduler (src/lod.py), only band-0 enemies get the
+        full update; farther ones move straight at the player with their
+        accumulated dt when due and skip animation.
+        """
+        n = self._count
+        if n == 0:
+            return
+        pos = self.position[:n]
+        vel = self.velocity[:n]
+
+        # Směr k hráči (normalizovaný; nulový, pokud nepřítel stojí na hráči)
+        diff = np.array((player_position.x, player_position.y)) - pos
+        dist = np.hypot(diff[:, 0], diff[:, 1])
+        moving = dist > 0
+        vel[:] = 0.0
+        vel[moving] = diff[moving] / dist[moving, None]
+
+        if lod is None:
+            near = None
+            step_dt = dt
+        else:
+            lod_dt = self.lod_dt[:n]
+            band, due = lod.schedule(dist, lod_dt, dt)
+            self.lod_band[:n] = band
+            near = band == 0
+            step_dt = np.where(due, lod_dt, 0.0)
+            lod_dt[due] = 0.0
+            due_rows = np.flatnonzero(due)
+
+        if flow_field is not None:
+            if near is None:
+                directions, valid = flow_field.sample(pos)
+                vel[valid] = directions[valid]
+            else:
+                rows = np.flatnonzero(near)
+                directions, valid = flow_field.sample(pos[rows])
+                vel[rows[valid]] = directions[valid]
+
+        # Rychlost roste s časem; aura zpomalí nepřátele uvnitř poloměru
+        speed = self.speed_mult[:n] * (BASE_ENEMY_SPEED * (1.0 + elapsed_seconds / ENEMY_SPEED_SCALE_INTERVAL))
+        if aura_radius > 0:
+            speed = np.where(dist < aura_radius, speed * aura_slow, speed)
+        pos += vel * (speed * step_dt)[:, None]
+
+        # Animace — střídání 2 framů (při LOD jen blízké pásmo)
+        timer = self.animation_timer[:n]
+        if near is None:
+            timer += dt
+        else:
+            timer[near] += dt
+        flip = timer >= ENEMY_ANIM_SPEED
+        timer[flip] = 0.0
+        frames = self.current_frame[:n]
+        frames[flip] ^= 1
+
+        # Image jen u nepřátel, kterým se přepnul snímek
+        views = self._views
+        for slot, frame in zip(np.flatnonzero(flip).tolist(), frames[flip].tolist()):
+            enemy = views[slot]
+            enemy.image = enemy.frames[frame]
+
+        self.sync_views(None if lod is None else due_rows)
+
+    def rows_in_band(self, band: int = 0) -> np.ndarray | None:
+        """Řádky s LOD pásmem <= band; None, pokud jsou to všechny."""
+        n = self._count
+        inside = self.lod_band[:n] <= band
+        if inside.all():
+            return None
+        return np.flatnonzero(inside)
+
+    def separate(self, min_dist: float = ENEMY_SEPARATION_DIST, rows: np.ndarray | None = None) -> None:
+        """Push apart enemies closer than min_dist.
+
+        Candidate pairs come from a cell list (cell = min_dist, 3×3 okolí),
+        each overlapping pair is pushed apart by half the overlap, and all
+        pushes are applied in one scatter-add. Pushes are computed from the
+        positions at the start of the pass (Jacobi), not sequentially.
+        `rows` limits the pass to a subset (e.g. the LOD near band).
+        """
+        if rows is not None:
+            if len(rows) >= 2:
+                subset = self.position[rows]
+                if self._separate_positions(subset, min_dist):
+                    self.position[rows] = subset
+                    self.sync_views(rows)
+            return
+        n = self._count
+        if n >= 2 and self._separate_positions(self.position[:n], min_dist):
+            self.sync_views()
+
+    def _separate_positions(self, pos: np.ndarray, min_dist: float) -> bool:
+        """Separace nad (n, 2) polem pozic in place; vrací True, pokud se něco posunulo."""
+        n = len(pos)
+        cells = self._separation_cells
+        if cells.cell_size != min_dist:
+            cells = self._separation_cells = CellList(min_dist)
+        cells.build(pos)
+        i, j = cells.neighbour_pairs()
+
+        diff = pos[i] - pos[j]
+        dist = np.hypot(diff[:, 0], diff[:, 1])
+        close = (dist > 0) & (dist < min_dist)
+        if not close.any():
+            return False
+        i = i[close]
+        j = j[close]
+        dist = dist[close]
+        push = diff[close] * ((min_dist - dist) * 0.5 / dist)[:, None]
+
+        # Scatter-add: +push pro první, -push pro druhého z dvojice
+        for axis in (0, 1):
+            pos[:, axis] += (
+                np.bincount(i, push[:, axis], minlength=n)
+                - np.bincount(j, push[:, axis], minlength=n)
+            )
+        return True
+
+    def sync_views(self, rows: np.ndarray | None = None) -> None:
+        """Copy row positions to the enemies' rects (hitbox follows rect lazily).
+
+        `rows` limits the copy to rows that actually moved.
+        """
+        if rows is not None:
+            rects = self._rects
+            for row, center in zip(rows.tolist(), self.position[rows].tolist()):
+                rects[row].center = center
+            return
+        n = self._count
+        for rect, center in zip(self._rects, self.position[:n].tolist()):
+            rect.center = center
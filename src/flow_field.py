@@ -0,0 +1,254 @@
+"""BloodWar - Flow field module.
+
+Distance field od hráče přes dlaždicovou mřížku (voda a kmeny stromů
+blokují) nad stejným oknem jako aktivní ObstacleMap. Přepočítává se jen při
+změně hráčovy dlaždice, rozložené do několika snímků; nepřátelé pak berou
+směr pohybu jedním vyhledáním v poli.
+"""
+
+import itertools
+import math
+
+import numpy as np
+
+from constants import TILE_SIZE, TILESET_SCALE, FLOW_FIELD_SCAN_BUDGET
+
+_UNREACHABLE = 1e9
+
+# 8-okolí: (dx, dy, cena kroku)
+_NEIGHBOURS = [
+    (dx, dy, math.hypot(dx, dy))
+    for dx in (-1, 0, 1) for dy in (-1, 0, 1) if dx or dy
+]
+_UNIT_STEPS = np.array([(dx / cost, dy / cost) for dx, dy, cost in _NEIGHBOURS])
+
+# Směry přímek pro sken: podél x, podél y, diagonála, antidiagonála
+_LINE_DIRECTIONS = ((1, 0), (0, 1), (1, 1), (1, -1))
+
+# Posun mezi úseky přímky při skenu (> každá konečná vzdálenost v okně)
+_SEGMENT_OFFSET = 1e6
+# Rozdíl menší než tohle je jen zaokrouhlení posunu úseků
+_EPSILON = 1e-6
+
+
+def _line_tiles(cols: int, rows: int, dx: int, dy: int) -> tuple[np.ndarray, np.ndarray]:
+    """(x, y) dlaždic všech přímek okna ve směru (dx, dy); sloupec matice = jedna přímka.
+
+    Row k holds the k-th tile of every line, so a scan along axis 0 is one
+    vector operation per step over all lines at once. Lines shorter than
+    the longest one are padded with tiles outside the window (x = -1).
+    """
+    if dy == 0:
+        x, y = np.meshgrid(np.arange(cols), np.arange(rows), indexing="ij")
+        return x, y
+    if dx == 0:
+        x, y = np.meshgrid(np.arange(cols), np.arange(rows), indexing="xy")
+        return x, y
+    step = np.arange(min(cols, rows))
+    if dy > 0:
+        # Konstantní x - y; začátek na levém nebo horním okraji
+        d = np.arange(-(rows - 1), cols)
+        x0 = np.maximum(d, 0)
+        y0 = x0 - d
+    else:
+        # Konstantní x + y; začátek na levém nebo dolním okraji
+        s = np.arange(cols + rows - 1)
+        x0 = np.maximum(s - (rows - 1), 0)
+        y0 = s - x0
+    x = x0 + step[:, None]
+    y = y0 + dy * step[:, None]
+    outside = (x >= cols) | (y < 0) | (y >= rows)
+    x[outside] = -1
+    y[outside] = 0
+    return x, y
+
+
+class FlowField:
+    """Tile flow field toward the player over the active ObstacleMap window.
+
+    The field covers exactly the obstacle map's `blocked` grid (same tile
+    `origin` and shape), so detours around obstacles anywhere in the window
+    are found; enemies outside it (or in the player's immediate
+    neighbourhood) keep straight seek.
+
+    A recompute is a job of line scans spread over frames: update() runs at
+    most `scan_budget` scans per frame (0 = unlimited) and enemies keep the
+    last finished field meanwhile. Without a finished field (start, clear())
+    the job runs to completion at once.
+    """
+
+    def __init__(self, obstacle_map, scan_budget: int = FLOW_FIELD_SCAN_BUDGET) -> None:
+        self.tile_px = TILE_SIZE * TILESET_SCALE
+        self.scan_budget = scan_budget
+        self.obstacle_map = obstacle_map
+        self._lines: dict[tuple[int, int], list] = {}   # přímky pro sken podle tvaru okna
+        self._prepared = None                             # (mapa překážek, kroky, skeny) — viz _prepare
+        self.recomputes = 0
+        self.passes = 0                                   # průchody skenu posledního výpočtu
+        self.clear()
+
+    def clear(self) -> None:
+        """Zahodí pole i rozpracovaný přepočet (hráč se přesunul skokem)."""
+        self.center: tuple[int, int] | None = None   # dlaždice hráče, ke které pole vede
+        self.origin = np.zeros(2, dtype=np.int64)    # dlaždice levého horního rohu okna
+        self.distance = np.full((0, 0), _UNREACHABLE)
+        self.direction = np.zeros((0, 0, 2))
+        self._job = None
+
+    def set_obstacles(self, obstacle_map) -> None:
+        """Nové aktivní okno překážek — platí od příštího přepočtu.
+
+        Obstacles are static, so the finished field (and a job in progress)
+        stay correct for their own window until replaced.
+        """
+        self.obstacle_map = obstacle_map
+
+    def update(self, player_x: float, player_y: float) -> bool:
+        """Posune přepočet pole k hráčově dlaždici. Vrací True, když je hotové nové pole."""
+        if self._job is None:
+            tile = (math.floor(player_x / self.tile_px), math.floor(player_y / self.tile_px))
+            if tile == self.center:
+                return False
+            self._job = self._compute(tile)
+        budget = 0 if self.center is None else self.scan_budget
+        for _ in itertools.count() if budget == 0 else range(budget):
+            if next(self._job, None) is None:
+                self._job = None
+                self.recomputes += 1
+                return True
+        return False
+
+    def _scan_lines(self, cols: int, rows: int) -> list:
+        """Přímky okna (dx, dy, indexy do zploštělého pole, cena kroku); cols * rows = mimo okno."""
+        lines = self._lines.get((cols, rows))
+        if lines is None:
+            lines = self._lines[(cols, rows)] = []
+            for dx, dy in _LINE_DIRECTIONS:
+                x, y = _line_tiles(cols, rows, dx, dy)
+                lines.append((dx, dy, np.where(x >= 0, x * rows + y, cols * rows), math.hypot(dx, dy)))
+        return lines
+
+    def _prepare(self, obstacle_map, source: tuple[int, int] | None) -> tuple[dict, list]:
+        """Povolené kroky a skeny přímek pro okno překážek (dlaždice `source` vždy průchozí).
+
+        Obstacles are static, so the result for the plain obstacle map is
+        cached until the map changes; only a player standing on a blocked
+        tile needs a fresh one.
+        """
+        cols, rows = obstacle_map.blocked.shape
+        forced = source is not None and bool(obstacle_map.blocked[source])
+        cached = self._prepared
+        if not forced and cached is not None and cached[0] is obstacle_map:
+            return cached[1], cached[2]
+        passable = ~obstacle_map.blocked
+        if forced:
+            passable[source] = True   # hráč stojí na své dlaždici, i kdyby byla blokovaná
+
+        # Krok ze sousední dlaždice; diagonála jen když obě sousední
+        # ortogonální dlaždice jsou průchozí (bez řezání rohů)
+        padded_pass = np.zeros((cols + 2, rows + 2), dtype=bool)
+        padded_pass[1:-1, 1:-1] = passable
+        step_ok = {}
+        for dx, dy, _ in _NEIGHBOURS:
+            ok = passable & padded_pass[1 + dx:1 + dx + cols, 1 + dy:1 + dy + rows]
+            if dx and dy:
+                ok = ok & padded_pass[1 + dx:1 + dx + cols, 1:-1] & padded_pass[1:-1, 1 + dy:1 + dy + rows]
+            step_ok[(dx, dy)] = ok
+
+        # Úseky přímek mezi zakázanými kroky; posun úseků drží minimum
+        # akumulace uvnitř úseku
+        scans = []
+        for dx, dy, index, cost in self._scan_lines(cols, rows):
+            link = np.append(step_ok[(-dx, -dy)].reshape(-1), False)[index]
+            link[0] = False
+            walk = np.arange(len(index))[:, None] * cost
+            forward = np.cumsum(~link, axis=0) * _SEGMENT_OFFSET + walk
+            back_link = np.zeros_like(link)
+            back_link[1:] = link[:0:-1]
+            backward = np.cumsum(~back_link, axis=0) * _SEGMENT_OFFSET + walk
+            scans.append((index, forward))
+            scans.append((index[::-1].copy(), backward))
+        if not forced:
+            self._prepared = (obstacle_map, step_ok, scans)
+        return step_ok, scans
+
+    def _compute(self, tile: tuple[int, int]):
+        """Přepočet jako generátor — yield po každém kroku (sken přímek, směry), na konci zveřejní pole."""
+        obstacle_map = self.obstacle_map
+        cols, rows = obstacle_map.blocked.shape
+        origin = obstacle_map.origin.copy()
+        sx, sy = tile[0] - int(origin[0]), tile[1] - int(origin[1])
+        inside = 0 <= sx < cols and 0 <= sy < rows
+        step_ok, scans = self._prepare(obstacle_map, (sx, sy) if inside else None)
+
+        # Relaxace po celých přímkách (tam i zpět ve 4 směrech): jeden průchod
+        # posune vlnu o celý rovný úsek cesty, průchodů je ~počet jejích zlomů.
+        # Hráč mimo okno překážek (okno se ještě nepřestavělo) = pole bez cíle.
+        dist = np.full(cols * rows + 1, np.inf)   # + strážná buňka mimo okno
+        passes = 0
+        if inside:
+            dist[sx * rows + sy] = 0.0
+            for _ in range(cols + rows):
+                passes += 1
+                changed = False
+                for index, offset in scans:
+                    yield True
+                    line = dist[index]
+                    candidate = np.minimum.accumulate(line - offset, axis=0) + offset
+                    # Kandidát přenesený přes hranici úseku vyjde >= _SEGMENT_OFFSET
+                    better = (candidate < line - _EPSILON) & (candidate < _SEGMENT_OFFSET)
+                    if better.any():
+                        changed = True
+                        dist[index[better]] = candidate[better]
+                if not changed:
+                    break
+        dist = dist[:-1].reshape(cols, rows)
+        dist[np.isinf(dist)] = _UNREACHABLE
+        yield True
+
+        # Směr = vážený součet kroků k bližším sousedům (hladší než 8 pevných směrů)
+        padded = np.full((cols + 2, rows + 2), _UNREACHABLE)
+        padded[1:-1, 1:-1] = dist
+        gains = np.empty((len(_NEIGHBOURS), cols, rows))
+        for k, (dx, dy, cost) in enumerate(_NEIGHBOURS):
+            # Rozdíly pod _EPSILON jsou šum skenu, ne skutečný spád
+            drop = dist - padded[1 + dx:1 + dx + cols, 1 + dy:1 + dy + rows]
+            gains[k] = np.where(step_ok[(dx, dy)] & (drop > _EPSILON), drop / cost, 0.0)
+        gains[:, dist >= _UNREACHABLE] = 0.0
+        direction = np.tensordot(gains, _UNIT_STEPS, axes=(0, 0))
+        length = np.hypot(direction[:, :, 0], direction[:, :, 1])
+        # Stejně dobré protilehlé kroky se vyruší — pak rovnou nejstrmější krok
+        tied = (length < _EPSILON) & (gains.max(axis=0) > 0)
+        if tied.any():
+            direction[tied] = _UNIT_STEPS[gains[:, tied].argmax(axis=0)]
+            length[tied] = 1.0
+        moving = length > 0
+        direction[moving] /= length[moving, None]
+
+        self.center = tile
+        self.origin = origin
+        self.distance = dist
+        self.direction = direction
+        self.passes = passes
+
+    def sample(self, positions: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """Směry pro (n, 2) pozice; vrací (directions, valid).
+
+        valid is False outside the window, on unreachable tiles and within
+        1.5 tiles of the field's target tile (there straight seek is exact
+        and smoother).
+        """
+        n = len(positions)
+        directions = np.zeros((n, 2))
+        if self.center is None or n == 0:
+            return directions, np.zeros(n, dtype=bool)
+        tiles = np.floor(positions / self.tile_px).astype(np.int64) - self.origin
+        cols, rows = self.distance.shape
+        valid = (tiles[:, 0] >= 0) & (tiles[:, 0] < cols) & (tiles[:, 1] >= 0) & (tiles[:, 1] < rows)
+        ix, iy = tiles[valid, 0], tiles[valid, 1]
+        dist = self.distance[ix, iy]
+        good = (dist < _UNREACHABLE) & (dist > 1.5)
+        inside = np.flatnonzero(valid)
+        valid[inside[~good]] = False
+        directions[inside[good]] = self.direction[ix[good], iy[good]]
+        return directions, valid
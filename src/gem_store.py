@@ -0,0 +1,262 @@
+"""BloodWar - Gem store module.
+
+XP gemy bez sprite objektů: pozice a počet sloučených gemů leží v polích
+s pevnými sloty (volné sloty se recyklují), sloty jsou navíc zařazené do
+bucketů mřížky. Magnet řeší jen gemy v dosahu hráče (dotaz do mřížky),
+mimo záběr se gemy slučují do větších ("big gem") se zachováním XP.
+"""
+
+import math
+
+import numpy as np
+
+from constants import GEM_SIZE, GEM_SPEED, GEM_BUCKET_SIZE, GEM_MERGE_CELL
+
+
+class GemStore:
+    """Array-backed XP gems with slot pooling and a bucket grid.
+
+    A gem is a slot: position, `count` (how many base gems it stands for;
+    XP per base gem is applied at pickup) and a moving flag for gems pulled
+    by the magnet. Freed slots go to a free list and are reused.
+    """
+
+    def __init__(self, capacity: int = 256, bucket_size: float = GEM_BUCKET_SIZE) -> None:
+        self._capacity = capacity
+        self.position = np.zeros((capacity, 2))
+        self.count = np.zeros(capacity, dtype=np.int64)
+        self.alive = np.zeros(capacity, dtype=bool)
+        self._key = np.zeros(capacity, dtype=np.int64)
+        self._free: list[int] = []
+        self._high = 0                        # sloty 0.._high-1 už byly použity
+        self._size = 0
+        self._inv = 1.0 / bucket_size
+        self._buckets: dict[int, set[int]] = {}
+        self._moving: set[int] = set()       # sloty přitahované magnetem
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def total_count(self) -> int:
+        """Počet základních gemů ve store (součet count)."""
+        return int(self.count[self.alive].sum())
+
+    def clear(self) -> None:
+        self.alive[:] = False
+        self.count[:] = 0
+        self._free.clear()
+        self._high = 0
+        self._size = 0
+        self._buckets.clear()
+        self._moving.clear()
+
+    def restore(self, positions: np.ndarray, counts: np.ndarray, moving: np.ndarray) -> None:
+        """Nahradí obsah gemy ze snímku (src/snapshot.py) — sloty 0..n-1 najednou."""
+        self.clear()
+        n = len(positions)
+        while self._capacity < n:
+            self._grow()
+        self.position[:n] = positions
+        self.count[:n] = counts
+        self.alive[:n] = True
+        cells = np.floor(positions * self._inv).astype(np.int64)
+        keys = self._key[:n] = (cells[:, 0] << 32) ^ (cells[:, 1] & 0xFFFFFFFF)
+        # Buckety po skupinách stejného klíče (ne gem po gemu)
+        order = np.argsort(keys, kind="stable")
+        unique, starts = np.unique(keys[order], return_index=True)
+        self._buckets = {
+            key: set(group.tolist())
+            for key, group in zip(unique.tolist(), np.split(order, starts[1:]))
+        }
+        self._moving.update(np.flatnonzero(moving).tolist())
+        self._high = n
+        self._size = n
+
+    # --- Sloty a buckety ---
+
+    def _cell(self, x: float, y: float) -> tuple[int, int]:
+        return math.floor(x * self._inv), math.floor(y * self._inv)
+
+    @staticmethod
+    def _pack(cx: int, cy: int) -> int:
+        # Klíč bucketu — dvě 32bit souřadnice v jednom int
+        return (cx << 32) ^ (cy & 0xFFFFFFFF)
+
+    def _grow(self) -> None:
+        new_capacity = self._capacity * 2
+        for name in ("position", "count", "alive", "_key"):
+            old = getattr(self, name)
+            new = np.zeros((new_capacity,) + old.shape[1:], dtype=old.dtype)
+            new[:self._capacity] = old
+            setattr(self, name, new)
+        self._capacity = new_capacity
+
+    def add(self, x: float, y: float, count: int = 1) -> int:
+        """Přidá gem (count = kolik základních gemů reprezentuje); vrací slot."""
+        if self._free:
+            slot = self._free.pop()
+        else:
+            if self._high == self._capacity:
+                self._grow()
+            slot = self._high
+            self._high += 1
+        self.position[slot] = (x, y)
+        self.count[slot] = count
+        self.alive[slot] = True
+        key = self._key[slot] = self._pack(*self._cell(x, y))
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            self._buckets[key] = {slot}
+        else:
+            bucket.add(slot)
+        self._size += 1
+        return slot
+
+    def remove(self, slots) -> None:
+        """Uvolní sloty (vrátí je do free listu)."""
+        buckets = self._buckets
+        for slot in slots:
+            key = int(self._key[slot])
+            bucket = buckets[key]
+            bucket.discard(slot)
+            if not bucket:
+                del buckets[key]
+            self._moving.discard(slot)
+        slots = list(slots)
+        self.alive[slots] = False
+        self.count[slots] = 0
+        self._free.extend(slots)
+        self._size -= len(slots)
+
+    def _rebucket(self, slots: np.ndarray) -> None:
+        """Přeřadí přesunuté gemy do bucketů (jen ty, které změnily buňku)."""
+        cells = np.floor(self.position[slots] * self._inv).astype(np.int64)
+        keys = (cells[:, 0] << 32) ^ (cells[:, 1] & 0xFFFFFFFF)
+        changed = keys != self._key[slots]
+        buckets = self._buckets
+        for slot, old, new in zip(slots[changed].tolist(), self._key[slots][changed].tolist(), keys[changed].tolist()):
+            bucket = buckets[old]
+            bucket.discard(slot)
+            if not bucket:
+                del buckets[old]
+            buckets.setdefault(new, set()).add(slot)
+        self._key[slots] = keys
+
+    # --- Dotazy ---
+
+    def query_rect(self, x0: float, y0: float, x1: float, y1: float) -> np.ndarray:
+        """Sloty gemů s pozicí uvnitř [x0, x1) × [y0, y1)."""
+        cx0, cy0 = self._cell(x0, y0)
+        cx1, cy1 = self._cell(x1, y1)
+        buckets = self._buckets
+        found: list[int] = []
+        for cx in range(cx0, cx1 + 1):
+            for cy in range(cy0, cy1 + 1):
+                bucket = buckets.get(self._pack(cx, cy))
+                if bucket:
+                    found.extend(bucket)
+        slots = np.array(found, dtype=np.int64)
+        if len(slots):
+            pos = self.position[slots]
+            inside = (pos[:, 0] >= x0) & (pos[:, 0] < x1) & (pos[:, 1] >= y0) & (pos[:, 1] < y1)
+            slots = slots[inside]
+        return slots
+
+    def within(self, x: float, y: float, radius: float) -> np.ndarray:
+        """Sloty gemů ve vzdálenosti < radius od (x, y)."""
+        slots = self.query_rect(x - radius, y - radius, x + radius, y + radius)
+        diff = self.position[slots] - (x, y)
+        return slots[diff[:, 0] * diff[:, 0] + diff[:, 1] * diff[:, 1] < radius * radius]
+
+    def nearest(self, x: float, y: float) -> tuple[float, float] | None:
+        """Pozice nejbližšího gemu, nebo None."""
+        if not self._size:
+            return None
+        slots = np.flatnonzero(self.alive[:self._high])
+        diff = self.position[slots] - (x, y)
+        best = slots[np.argmin(diff[:, 0] * diff[:, 0] + diff[:, 1] * diff[:, 1])]
+        return tuple(self.position[best].tolist())
+
+    # --- Simulace ---
+
+    def update(self, dt: float, player_position, magnet_radius: float, gem_speed_mult: float = 1.0) -> None:
+        """Magnet — gemy v dosahu letí k hráči (vektorově, jen přitahované sloty)."""
+        px, py = player_position.x, player_position.y
+        self._moving.update(self.within(px, py, magnet_radius).tolist())
+        if not self._moving:
+            return
+        slots = np.fromiter(self._moving, dtype=np.int64, count=len(self._moving))
+        diff = np.array((px, py)) - self.position[slots]
+        dist = np.hypot(diff[:, 0], diff[:, 1])
+        pulled = dist < magnet_radius
+        step = pulled & (dist > 0)
+        self.position[slots[step]] += diff[step] * (GEM_SPEED * gem_speed_mult * dt / dist[step])[:, None]
+        self._rebucket(slots[step])
+        # Mimo dosah (hráč utekl) — gem zůstane ležet
+        self._moving.difference_update(slots[~pulled].tolist())
+
+    def collect(self, rect) -> list[tuple[float, float, int]]:
+        """Odebere gemy překrývající rect (gem = čtverec 2×GEM_SIZE); vrací (x, y, count)."""
+        slots = self.query_rect(
+            rect.left - GEM_SIZE, rect.top - GEM_SIZE, rect.right + GEM_SIZE, rect.bottom + GEM_SIZE,
+        )
+        if not len(slots):
+            return []
+        picked = [
+            (x, y, c) for x, y, c in zip(
+                self.position[slots, 0].tolist(), self.position[slots, 1].tolist(), self.count[slots].tolist(),
+            )
+        ]
+        self.remove(slots.tolist())
+        return picked
+
+    def merge(self, keep_rect=None, min_gems: int = 0, cell: float = GEM_MERGE_CELL) -> int:
+        """Sloučí ležící gemy ve stejné buňce (mimo keep_rect) do jednoho.
+
+        The merged gem sits at the count-weighted centroid and carries the
+        summed count, so total XP is preserved. Returns the number of
+        slots freed.
+        """
+        if self._size <= min_gems:
+            return 0
+        slots = np.flatnonzero(self.alive[:self._high])
+        if self._moving:
+            slots = slots[~np.isin(slots, np.fromiter(self._moving, dtype=np.int64))]
+        pos = self.position[slots]
+        if keep_rect is not None:
+            # Gemy v záběru (s okrajem) nechat — hráč by viděl, jak mizí
+            margin = cell
+            visible = (
+                (pos[:, 0] > keep_rect.left - margin) & (pos[:, 0] < keep_rect.right + margin)
+                & (pos[:, 1] > keep_rect.top - margin) & (pos[:, 1] < keep_rect.bottom + margin)
+            )
+            slots, pos = slots[~visible], pos[~visible]
+        if len(slots) < 2:
+            return 0
+
+        cells = np.floor(pos / cell).astype(np.int64)
+        _, group, sizes = np.unique(cells, axis=0, return_inverse=True, return_counts=True)
+        group = group.ravel()
+        merged = sizes[group] > 1
+        if not merged.any():
+            return 0
+        slots, group = slots[merged], group[merged]
+        counts = self.count[slots].astype(np.float64)
+        total = np.bincount(group, counts)
+        cx = np.bincount(group, self.position[slots, 0] * counts) / np.maximum(total, 1)
+        cy = np.bincount(group, self.position[slots, 1] * counts) / np.maximum(total, 1)
+
+        # První slot každé skupiny přežije a převezme součet, ostatní se uvolní
+        order = np.argsort(group, kind="stable")
+        first = np.ones(len(order), dtype=bool)
+        first[1:] = group[order][1:] != group[order][:-1]
+        keepers = slots[order][first]
+        keeper_groups = group[order][first]
+        freed = slots[order][~first].tolist()
+        self.remove(freed)
+        self.count[keepers] = total[keeper_groups].astype(np.int64)
+        self.position[keepers, 0] = cx[keeper_groups]
+        self.position[keepers, 1] = cy[keeper_groups]
+        self._rebucket(keepers)
+        return len(freed)
@@ -1,5 +1,7 @@
 """BloodWar - Input handler module."""
 
+import time
+
 import pygame
 
 
@@ -20,9 +22,34 @@ class InputHandler:
                 if event.key == pygame.K_g:
                     self.game.show_grid = not self.game.show_grid
 
-                # Restart after game over
+                # Profiler overlay (zapíná i měření) a export Chrome trace
+                if event.key == pygame.K_F3:
+                    self.game.profiler.toggle()
+                if event.key == pygame.K_F4:
+                    path = time.strftime("traces/trace_%Y%m%d_%H%M%S.json")
+                    try:
+                        self.game.notify(f"Trace exported to {self.game.profiler.export_chrome_trace(path)}")
+                    except OSError as exc:
+                        self.game.notify(f"Trace export failed: {exc}")
+
+                # Snímky stavu: F5 quicksave, F9 quickload, F6 rewind (o SNAPSHOT_INTERVAL zpět)
+                if event.key == pygame.K_F5:
+                    try:
+                        self.game.notify(f"Game saved to {self.game.save()}")
+                    except OSError as exc:
+                        self.game.notify(f"Quicksave failed: {exc}")
+                if event.key == pygame.K_F9:
+                    try:
+                        self.game.load()
+                        self.game.notify("Game loaded")
+                    except (OSError, ValueError) as exc:
+                        self.game.notify(f"Quickload failed: {exc}")
+                if event.key == pygame.K_F6 and not self.game.rewind():
+                    self.game.notify("Nothing to rewind")
+
+                # Restart after game over (Shift+R = nový svět, připravený na pozadí)
                 if self.game.game_over and event.key == pygame.K_r:
-                    self.game.__init__()
+                    self.game.reset(new_world=bool(event.mod & pygame.KMOD_SHIFT))
 
                 # Level-up choice
                 if self.game.level_up_pending:
@@ -0,0 +1,54 @@
+"""BloodWar - Enemy level-of-detail module.
+
+Pásma podle vzdálenosti od hráče: blízcí nepřátelé se simulují plně
+každý snímek, vzdálenější jen každý N-tý snímek s nasčítaným dt, hrubým
+pohybem (přímo k hráči), bez animace, separace a odtlačování od překážek.
+Každé pásmo má rozpočet aktualizací za snímek; co se nevejde, počká.
+"""
+
+import numpy as np
+
+from constants import ENEMY_LOD_BANDS
+
+
+class LodScheduler:
+    """Assigns enemies to distance bands and picks the ones due this frame.
+
+    `bands` is a list of (min_distance, interval, budget): a band-k enemy is
+    due once it has accumulated `interval` frames of dt; at most `budget`
+    due enemies per band are updated per frame (0 = unlimited), the ones
+    that waited longest first. Band 0 must start at distance 0.
+    """
+
+    def __init__(self, bands: list[tuple[float, int, int]] = ENEMY_LOD_BANDS) -> None:
+        self.bands = bands
+        self._thresholds = np.array([band[0] for band in bands[1:]], dtype=np.float64)
+        # Metriky posledního snímku po pásmech
+        self.metrics = [{"enemies": 0, "processed": 0, "deferred": 0} for _ in bands]
+
+    def schedule(self, dist: np.ndarray, lod_dt: np.ndarray, dt: float) -> tuple[np.ndarray, np.ndarray]:
+        """Přiřadí pásma a vybere řádky k aktualizaci.
+
+        `lod_dt` (per-row accumulated dt) is advanced by dt in place. Returns
+        (band, due): the caller advances due rows by their `lod_dt` and then
+        zeroes it.
+        """
+        band = np.searchsorted(self._thresholds, dist, side="right")
+        lod_dt += dt
+        due = band == 0
+        metrics = self.metrics
+        metrics[0]["enemies"] = metrics[0]["processed"] = int(due.sum())
+        metrics[0]["deferred"] = 0
+        for k, (_, interval, budget) in enumerate(self.bands[1:], start=1):
+            in_band = band == k
+            ready = np.flatnonzero(in_band & (lod_dt >= (interval - 0.5) * dt))
+            deferred = 0
+            if budget and len(ready) > budget:
+                # Nejdéle čekající první
+                deferred = len(ready) - budget
+                ready = ready[np.argpartition(-lod_dt[ready], budget - 1)[:budget]]
+            due[ready] = True
+            metrics[k]["enemies"] = int(in_band.sum())
+            metrics[k]["processed"] = len(ready)
+            metrics[k]["deferred"] = deferred
+        return band, due
@@ -0,0 +1,83 @@
+"""BloodWar - Object pool module.
+
+Free-list pooly pro často vytvářené sprity (projektily, nepřátelé), aby
+těžké vlny nevytvářely a nesbíraly tisíce objektů za sekundu.
+"""
+
+from typing import Callable
+
+
+class ObjectPool:
+    """Free list of reusable objects of one class.
+
+    `acquire(*args)` reuses a released object via `obj.reset(*args)` or
+    builds a new one with `factory(*args)`. Released objects are held back
+    until `recycle()` (called once per frame after the enemy index is
+    rebuilt), so a snapshot taken before the release never sees the same
+    object come back to life somewhere else.
+    """
+
+    def __init__(self, factory: Callable, max_free: int = 2048) -> None:
+        self.factory = factory
+        self.max_free = max_free
+        self._free: list = []
+        self._released: list = []
+        self.created = 0
+        self.reused = 0
+        self.released = 0
+        self.dropped = 0     # uvolněné objekty nad max_free (nechají se GC)
+
+    def acquire(self, *args, **kwargs):
+        if self._free:
+            obj = self._free.pop()
+            obj.reset(*args, **kwargs)
+            self.reused += 1
+        else:
+            obj = self.factory(*args, **kwargs)
+            obj._object_pool = self
+            self.created += 1
+        return obj
+
+    def acquire_bulk(self, count: int, blank: Callable) -> list:
+        """`count` objektů bez reset() — stav celý nastaví volající.
+
+        Free objects are taken as they are and the rest come from `blank()`
+        (a constructor that skips reset() too). Meant for snapshot restore,
+        which overwrites every field anyway.
+        """
+        reused = min(count, len(self._free))
+        objects = self._free[len(self._free) - reused:]
+        del self._free[len(self._free) - reused:]
+        for _ in range(count - reused):
+            obj = blank()
+            obj._object_pool = self
+            objects.append(obj)
+        self.reused += reused
+        self.created += count - reused
+        return objects
+
+    def release(self, obj) -> None:
+        self.released += 1
+        if len(self._free) + len(self._released) < self.max_free:
+            self._released.append(obj)
+        else:
+            self.dropped += 1
+
+    def recycle(self) -> None:
+        """Uvolněné objekty z minulého snímku zpřístupní pro acquire."""
+        if self._released:
+            self._free.extend(self._released)
+            self._released.clear()
+
+    def clear(self) -> None:
+        self._free.clear()
+        self._released.clear()
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "created": self.created,
+            "reused": self.reused,
+            "released": self.released,
+            "dropped": self.dropped,
+            "free": len(self._free) + len(self._released),
+        }
@@ -0,0 +1,228 @@
+"""BloodWar - Obstacle map module.
+
+Statická vrstva překážek nad aktivním oknem světa (staví se při posunu
+okna o chunk): hustá mřížka dlaždic (voda / kmen stromu), CSR seznamy
+obdélníků překážek na dlaždici a znaménková vzdálenost (SDF) s normálami
+po dlaždicích.
+Odtlačení nepřátel je pak pár vektorových operací nad celým poolem, hráč
+projde jen obdélníky ze svých dlaždic — bez alokace Rect/Vector2.
+"""
+
+import math
+
+import numpy as np
+
+from constants import TILE_SIZE, TILESET_SCALE
+
+from src.cell_list import ragged_ranges
+
+TILE_WATER = 1
+TILE_TREE = 2
+
+_NEIGHBOURS = [(dx, dy) for dx in (-1, 0, 1) for dy in (-1, 0, 1)]
+
+# SDF stačí blízko překážek (odtlačování, normály) — dál zůstává "nekonečno"
+_SDF_MAX_STEPS = 8
+
+
+def _chamfer(seeds: np.ndarray, max_steps: int | None = None) -> np.ndarray:
+    """Chamfer vzdálenost (kroky 1 / √2, v dlaždicích) od True buněk; nejvýš max_steps vln."""
+    cols, rows = seeds.shape
+    if not seeds.any():
+        return np.full(seeds.shape, np.inf)
+    dist = np.where(seeds, 0.0, np.inf)
+    padded = np.full((cols + 2, rows + 2), np.inf)
+    steps = 0
+    while max_steps is None or steps < max_steps:
+        steps += 1
+        padded[1:-1, 1:-1] = dist
+        new = dist.copy()
+        for dx, dy in _NEIGHBOURS:
+            if dx or dy:
+                np.minimum(new, padded[1 + dx:1 + dx + cols, 1 + dy:1 + dy + rows] + math.hypot(dx, dy), out=new)
+        if np.array_equal(new, dist):
+            return dist
+        dist = new
+    return dist
+
+
+class ObstacleMap:
+    """Static obstacle layer over a window of the world tile grid.
+
+    The window is `cols` × `rows` tiles starting at world tile `origin`;
+    array indices are window-relative, everything outside is free.
+    `tiles[col, row]` holds TILE_WATER / TILE_TREE flags. Obstacle rects
+    (water tiles and tree hitboxes, as left/top/right/bottom) are listed
+    per tile in CSR form: rects overlapping tile t are
+    `rect_index[tile_start[t]:tile_start[t + 1]]`. `distance` is the signed
+    distance in px from each tile to the nearest obstacle tile (negative
+    inside; saturated a few tiles away from obstacles) and `normal` its
+    unit gradient, pointing away from obstacles.
+    """
+
+    def __init__(self, cols: int, rows: int, water_tiles, trees, origin: tuple[int, int] = (0, 0)) -> None:
+        self.tile_px = TILE_SIZE * TILESET_SCALE
+        self.cols, self.rows = cols, rows
+        self.origin = np.array(origin, dtype=np.int64)
+        ox, oy = origin
+        tile_px = self.tile_px
+        self.tiles = np.zeros((cols, rows), dtype=np.uint8)
+
+        # Obdélníky: nejdřív stromy (pořadí skupiny), pak voda po řádcích
+        rects = []
+        for tree in trees:
+            hb = tree.hitbox
+            rects.append((hb.left, hb.top, hb.right, hb.bottom))
+        tree_count = len(rects)
+        for col, row in sorted(water_tiles, key=lambda t: (t[1], t[0])):
+            if 0 <= col - ox < cols and 0 <= row - oy < rows:
+                rects.append((col * tile_px, row * tile_px, (col + 1) * tile_px, (row + 1) * tile_px))
+        self.rects = np.array(rects, dtype=np.float64).reshape(-1, 4)
+        self._rect_list = [tuple(r) for r in rects]
+
+        # Dlaždice, které každý obdélník překrývá → CSR (tile → obdélníky)
+        bounds = np.array(rects, dtype=np.int64).reshape(-1, 4)
+        c0 = np.maximum(bounds[:, 0] // tile_px - ox, 0)
+        c1 = np.minimum((bounds[:, 2] - 1) // tile_px - ox, cols - 1)
+        r0 = np.maximum(bounds[:, 1] // tile_px - oy, 0)
+        r1 = np.minimum((bounds[:, 3] - 1) // tile_px - oy, rows - 1)
+        height = np.maximum(r1 - r0 + 1, 0)
+        counts = np.maximum(c1 - c0 + 1, 0) * height
+        # Rozsah k-tého obdélníku projde jeho dlaždice po sloupcích (owners vzestupně)
+        owners, cell = ragged_ranges(np.zeros(len(counts), dtype=np.int64), counts)
+        span = np.maximum(height[owners], 1)
+        tile_ids = (c0[owners] + cell // span) * rows + r0[owners] + cell % span
+        flags = np.where(owners < tree_count, TILE_TREE, TILE_WATER).astype(np.uint8)
+        np.bitwise_or.at(self.tiles.reshape(-1), tile_ids, flags)
+        order = np.argsort(tile_ids, kind="stable")
+        self.rect_index = owners[order]
+        self.tile_start = np.zeros(cols * rows + 1, dtype=np.int64)
+        np.cumsum(np.bincount(tile_ids, minlength=cols * rows), out=self.tile_start[1:])
+
+        # SDF po dlaždicích + normály (gradient)
+        blocked = self.tiles != 0
+        self.blocked = blocked
+        sdf = (_chamfer(blocked, _SDF_MAX_STEPS) - _chamfer(~blocked, _SDF_MAX_STEPS)) * tile_px
+        sdf[np.isinf(sdf)] = np.sign(sdf[np.isinf(sdf)]) * 1e6
+        self.distance = sdf
+        gx, gy = np.gradient(sdf)
+        length = np.hypot(gx, gy)
+        length[length == 0] = 1.0
+        self.normal = np.stack((gx / length, gy / length), axis=-1)
+        # Dlaždice nejvýš 1 (i diagonálně) od překážky — jen tam se odtlačuje
+        self.near = sdf <= 1.5 * tile_px
+
+    # --- Dotazy ---
+
+    def tiles_at(self, positions: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """(tx, ty, inside) okna pod (n, 2) pozicemi; indexy mimo okno oříznuté k okraji."""
+        tiles = np.floor(positions / self.tile_px).astype(np.int64) - self.origin
+        inside = (tiles[:, 0] >= 0) & (tiles[:, 0] < self.cols) & (tiles[:, 1] >= 0) & (tiles[:, 1] < self.rows)
+        return np.clip(tiles[:, 0], 0, self.cols - 1), np.clip(tiles[:, 1], 0, self.rows - 1), inside
+
+    def blocked_at(self, positions: np.ndarray) -> np.ndarray:
+        """Leží (n, 2) pozice na vodě / kmeni stromu? Mimo okno = volno (False)."""
+        tx, ty, inside = self.tiles_at(positions)
+        return inside & self.blocked[tx, ty]
+
+    def sample(self, positions: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """(distance, normal) dlaždic pod (n, 2) pozicemi; mimo okno = volno."""
+        tx, ty, inside = self.tiles_at(positions)
+        distance = np.where(inside, self.distance[tx, ty], 1e6)
+        normal = self.normal[tx, ty] * inside[:, None]
+        return distance, normal
+
+    def rects_near(self, x0: float, y0: float, x1: float, y1: float) -> list[int]:
+        """Indexy obdélníků z dlaždic překrytých [x0, x1) × [y0, y1), seřazené."""
+        tile_px = self.tile_px
+        ox, oy = self.origin.tolist()
+        c0, c1 = max(int(x0 // tile_px) - ox, 0), min(int((x1 - 1) // tile_px) - ox, self.cols - 1)
+        r0, r1 = max(int(y0 // tile_px) - oy, 0), min(int((y1 - 1) // tile_px) - oy, self.rows - 1)
+        found: set[int] = set()
+        start, index, rows = self.tile_start, self.rect_index, self.rows
+        for c in range(c0, c1 + 1):
+            base = c * rows
+            lo, hi = start[base + r0], start[base + r1 + 1]
+            found.update(index[lo:hi].tolist())
+        return sorted(found)
+
+    # --- Řešení kolizí ---
+
+    def push_enemies(self, positions: np.ndarray, half_sizes: np.ndarray, push: float = 2.0) -> int:
+        """Odtlačí nepřátele (in place) od překrývajících se překážek.
+
+        Every (enemy, obstacle) overlap pushes the enemy `push` px away from
+        the obstacle centre (along the tile normal if the centres coincide);
+        pushes are summed in one scatter-add. Returns the number of overlaps.
+        """
+        if len(positions) == 0 or len(self.rects) == 0:
+            return 0
+        tx, ty, inside = self.tiles_at(positions)
+        candidates = np.flatnonzero(inside & self.near[tx, ty])
+        if len(candidates) == 0:
+            return 0
+        cx, cy = tx[candidates], ty[candidates]
+
+        # Obdélníky z 3×3 okolí dlaždice každého kandidáta (CSR rozsahy)
+        owners, starts, counts = [], [], []
+        rows = self.rows
+        for dx, dy in _NEIGHBOURS:
+            nx, ny = cx + dx, cy + dy
+            ok = (nx >= 0) & (nx < self.cols) & (ny >= 0) & (ny < rows)
+            tile = np.where(ok, nx * rows + ny, 0)
+            lo = self.tile_start[tile]
+            owners.append(candidates)
+            starts.append(lo)
+            counts.append(np.where(ok, self.tile_start[tile + 1] - lo, 0))
+        owners = np.concatenate(owners)
+        owner, flat = ragged_ranges(np.concatenate(starts), np.concatenate(counts))
+        enemy = owners[owner]
+        rect = self.rect_index[flat]
+        # Strom přes více dlaždic by se započítal víckrát
+        pair = np.unique(enemy * len(self.rects) + rect)
+        enemy, rect = pair // len(self.rects), pair % len(self.rects)
+
+        pos = positions[enemy]
+        r = self.rects[rect]
+        # Celočíselný rect jako u spritu (rect.center = pozice ořízne k nule)
+        size = (half_sizes[enemy] * 2).astype(np.int64)
+        left_top = np.trunc(pos).astype(np.int64) - size // 2
+        right_bottom = left_top + size
+        hit = (
+            (left_top[:, 0] < r[:, 2]) & (right_bottom[:, 0] > r[:, 0])
+            & (left_top[:, 1] < r[:, 3]) & (right_bottom[:, 1] > r[:, 1])
+        )
+        if not hit.any():
+            return 0
+        enemy, pos, r = enemy[hit], pos[hit], r[hit]
+        diff = pos - np.stack(((r[:, 0] + r[:, 2]) * 0.5, (r[:, 1] + r[:, 3]) * 0.5), axis=1)
+        length = np.hypot(diff[:, 0], diff[:, 1])
+        degenerate = length == 0
+        if degenerate.any():
+            diff[degenerate] = self.sample(pos[degenerate])[1]
+            length[degenerate] = 1.0
+        np.add.at(positions, enemy, diff * (push / length)[:, None])
+        return len(enemy)
+
+    def resolve_player(self, player) -> None:
+        """Směrové odtlačení hráče (nejmenší překryv) od stromů a vody."""
+        pr = player.rect
+        rects = self._rect_list
+        for i in self.rects_near(pr.left, pr.top, pr.right, pr.bottom):
+            left, top, right, bottom = rects[i]
+            pr = player.rect
+            if not (pr.left < right and pr.right > left and pr.top < bottom and pr.bottom > top):
+                continue
+            overlap_x = min(pr.right, right) - max(pr.left, left)
+            overlap_y = min(pr.bottom, bottom) - max(pr.top, top)
+            if overlap_x < overlap_y:
+                if pr.centerx < (left + right) / 2:
+                    player.position.x -= overlap_x
+                else:
+                    player.position.x += overlap_x
+            else:
+                if pr.centery < (top + bottom) / 2:
+                    player.position.y -= overlap_y
+                else:
+                    player.position.y += overlap_y
+            player.rect.center = player.position
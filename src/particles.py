@@ -1,77 +1,151 @@
-"""BloodWar - Particle system."""
+"""BloodWar - Particle system.
+
+Částice žijí v NumPy polích s pevnou kapacitou (pozice, rychlost, životnost,
+index barvy, poloměr). Update je pár vektorových operací + kompaktace,
+kreslení jde přes předrenderovaná razítka kruhů (barva × poloměr × úroveň
+vyblednutí) v jednom fblits.
+"""
 
 import math
 import random
 
+import numpy as np
 import pygame
 
+from constants import PARTICLE_CAPACITY, PARTICLE_FADE_LEVELS
 
-class Particle:
-    """Single particle: position, velocity, lifetime, color, radius."""
-
-    __slots__ = ('x', 'y', 'vx', 'vy', 'lifetime', 'max_lifetime', 'color', 'radius')
-
-    def __init__(self, x: float, y: float, vx: float, vy: float,
-                 lifetime: float, color: tuple, radius: int = 3) -> None:
-        self.x = x
-        self.y = y
-        self.vx = vx
-        self.vy = vy
-        self.lifetime = lifetime
-        self.max_lifetime = lifetime
-        self.color = color
-        self.radius = radius
-
-    def update(self, dt: float) -> bool:
-        self.x += self.vx * dt
-        self.y += self.vy * dt
-        self.lifetime -= dt
-        return self.lifetime > 0
+_STAMP_KEY = (255, 0, 255)   # colorkey razítek — žádná částice tuto barvu nemá
 
 
 class ParticleSystem:
-    """Manages all active particles."""
-
-    def __init__(self) -> None:
-        self._particles: list[Particle] = []
+    """Manages all active particles in fixed-capacity arrays.
+
+    Rows 0..count-1 are live particles in spawn order; compaction keeps
+    that order, so row 0 is always the oldest. When a burst does not fit,
+    the oldest particles are evicted first.
+    """
+
+    def __init__(self, rng: random.Random | None = None, capacity: int = PARTICLE_CAPACITY) -> None:
+        # Vlastní RNG — headless simulace je tak deterministická
+        self._rng = rng if rng is not None else random.Random()
+        self._np_rng = np.random.default_rng(self._rng.getrandbits(64))
+        self.capacity = capacity
+        self._count = 0
+        self.x = np.zeros(capacity)
+        self.y = np.zeros(capacity)
+        self.vx = np.zeros(capacity)
+        self.vy = np.zeros(capacity)
+        self.life = np.zeros(capacity)
+        self.max_life = np.ones(capacity)
+        self.color = np.zeros(capacity, dtype=np.int64)    # index do self._palette
+        self.radius = np.zeros(capacity, dtype=np.int64)
+        self._palette: list[tuple] = []
+        self._palette_index: dict[tuple, int] = {}
+        self._stamps: dict[int, pygame.Surface] = {}
+        self.evicted = 0   # počet částic vytlačených kvůli kapacitě (statistika)
+
+    def __len__(self) -> int:
+        return self._count
 
     def clear(self) -> None:
-        self._particles.clear()
+        self._count = 0
 
     def update(self, dt: float) -> None:
-        self._particles = [p for p in self._particles if p.update(dt)]
+        n = self._count
+        if n == 0:
+            return
+        self.x[:n] += self.vx[:n] * dt
+        self.y[:n] += self.vy[:n] * dt
+        life = self.life[:n]
+        life -= dt
+        alive = life > 0
+        if alive.all():
+            return
+        # Kompaktace — živé řádky na začátek, pořadí (= stáří) zůstává
+        keep = np.flatnonzero(alive)
+        for column in (self.x, self.y, self.vx, self.vy, self.life, self.max_life, self.color, self.radius):
+            column[:len(keep)] = column[keep]
+        self._count = len(keep)
 
     def draw(self, surface: pygame.Surface, camera_x: int, camera_y: int) -> None:
-        for p in self._particles:
-            ratio = p.lifetime / p.max_lifetime
-            r = max(1, int(p.radius * ratio))
-            color = (
-                int(p.color[0] * ratio),
-                int(p.color[1] * ratio),
-                int(p.color[2] * ratio),
-            )
-            sx = int(p.x - camera_x)
-            sy = int(p.y - camera_y)
-            pygame.draw.circle(surface, color, (sx, sy), r)
+        n = self._count
+        if n == 0:
+            return
+        ratio = self.life[:n] / self.max_life[:n]
+        r = np.maximum(1, (self.radius[:n] * ratio).astype(np.int64))
+        sx = (self.x[:n] - camera_x).astype(np.int64)
+        sy = (self.y[:n] - camera_y).astype(np.int64)
+        width, height = surface.get_size()
+        visible = (sx + r >= 0) & (sx - r < width) & (sy + r >= 0) & (sy - r < height)
+        if not visible.any():
+            return
+        r = r[visible]
+        fade = np.ceil(ratio[visible] * PARTICLE_FADE_LEVELS).astype(np.int64)
+        # Klíč razítka: (barva, poloměr, vyblednutí) zakódované do jednoho int
+        keys = (self.color[:n][visible] * 256 + r) * (PARTICLE_FADE_LEVELS + 1) + fade
+
+        stamps = self._stamps
+        for key in np.unique(keys).tolist():
+            if key not in stamps:
+                stamps[key] = self._make_stamp(key)
+        surface.fblits(list(zip(
+            map(stamps.__getitem__, keys.tolist()),
+            zip((sx[visible] - r).tolist(), (sy[visible] - r).tolist()),
+        )))
+
+    def _make_stamp(self, key: int) -> pygame.Surface:
+        """Předrenderuje kruh pro klíč (barva, poloměr, úroveň vyblednutí)."""
+        fade = key % (PARTICLE_FADE_LEVELS + 1)
+        radius = key // (PARTICLE_FADE_LEVELS + 1) % 256
+        base = self._palette[key // (PARTICLE_FADE_LEVELS + 1) // 256]
+        ratio = fade / PARTICLE_FADE_LEVELS
+        color = tuple(int(c * ratio) for c in base)
+        stamp = pygame.Surface((radius * 2, radius * 2))
+        stamp.fill(_STAMP_KEY)
+        stamp.set_colorkey(_STAMP_KEY, pygame.RLEACCEL)
+        pygame.draw.circle(stamp, color, (radius, radius), radius)
+        return stamp
 
     # --- Private helper ---
 
+    def _color_indices(self, colors: list) -> np.ndarray:
+        indices = []
+        for color in colors:
+            index = self._palette_index.get(color)
+            if index is None:
+                index = self._palette_index[color] = len(self._palette)
+                self._palette.append(color)
+            indices.append(index)
+        return np.array(indices, dtype=np.int64)
+
     def _burst(self, x: float, y: float, count: int,
                speed_min: float, speed_max: float,
                lifetime_min: float, lifetime_max: float,
                colors: list, radius_min: int, radius_max: int) -> None:
-        for _ in range(count):
-            angle = random.uniform(0, math.tau)
-            speed = random.uniform(speed_min, speed_max)
-            lifetime = random.uniform(lifetime_min, lifetime_max)
-            self._particles.append(Particle(
-                x, y,
-                math.cos(angle) * speed,
-                math.sin(angle) * speed,
-                lifetime,
-                random.choice(colors),
-                random.randint(radius_min, radius_max),
-            ))
+        count = min(count, self.capacity)
+        overflow = self._count + count - self.capacity
+        if overflow > 0:
+            # Plno — vytlačit nejstarší (začátek polí)
+            n = self._count
+            for column in (self.x, self.y, self.vx, self.vy, self.life, self.max_life, self.color, self.radius):
+                column[:n - overflow] = column[overflow:n]
+            self._count -= overflow
+            self.evicted += overflow
+
+        gen = self._np_rng
+        angle = gen.uniform(0, math.tau, count)
+        speed = gen.uniform(speed_min, speed_max, count)
+        lifetime = gen.uniform(lifetime_min, lifetime_max, count)
+        rows = slice(self._count, self._count + count)
+        self.x[rows] = x
+        self.y[rows] = y
+        self.vx[rows] = np.cos(angle) * speed
+        self.vy[rows] = np.sin(angle) * speed
+        self.life[rows] = lifetime
+        self.max_life[rows] = lifetime
+        self.color[rows] = self._color_indices(colors)[gen.integers(0, len(colors), count)]
+        self.radius[rows] = gen.integers(radius_min, radius_max + 1, count)
+        self._count += count
 
     # --- Spawn helpers ---
 
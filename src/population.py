@@ -0,0 +1,196 @@
+"""BloodWar - Population module.
+
+Správa populace nepřátel nad Spawnerem: tvrdý strop počtu živých
+nepřátel, recyklace nepřátel, kteří se zatoulali daleko za kameru (přesun
+zpět na spawn ring místo nové alokace), a slučování hustých vzdálených
+shluků do hord, které se při přiblížení hráče zase rozpadnou.
+"""
+
+import math
+
+import numpy as np
+
+from constants import (
+    SCREEN_WIDTH, SCREEN_HEIGHT, ENEMY_SIZE, BASE_ENEMY_SPEED, ENEMY_SPEED_SCALE_INTERVAL,
+    ENEMY_CAP, ENEMY_RECYCLE_DISTANCE, POPULATION_INTERVAL,
+    HORDE_MIN_DISTANCE, HORDE_SPLIT_DISTANCE, HORDE_CELL, HORDE_MIN_SIZE,
+)
+
+
+class Horde:
+    """Aggregated far-away enemies: one position, members kept as data.
+
+    A member is (enemy class, hp fraction); on split every member is
+    re-acquired from its ObjectPool with current-time stats and the stored
+    fraction of HP, so difficulty keeps scaling while it was aggregated.
+    """
+
+    __slots__ = ("x", "y", "members", "speed_mult")
+
+    def __init__(self, x: float, y: float, members: list[tuple[type, float]], speed_mult: float) -> None:
+        self.x = x
+        self.y = y
+        self.members = members
+        self.speed_mult = speed_mult   # nejpomalejší člen určuje rychlost hordy
+
+
+class PopulationManager:
+    """Enemy cap, far-enemy recycling and horde aggregation.
+
+    The cap counts live enemies only; horde members are cheap data and
+    come back even above the cap when a horde splits.
+    """
+
+    def __init__(self, game, cap: int | None = None, hordes: bool = True) -> None:
+        self.game = game
+        self.cap = ENEMY_CAP if cap is None else cap   # čteno až tady — batch_runner ho přepisuje
+        self.hordes_enabled = hordes
+        self.hordes: list[Horde] = []
+        self.timer = 0.0
+        # Statistiky
+        self.recycled = 0
+        self.capped = 0
+        self.aggregated = 0
+        self.splits = 0
+
+    def clear(self) -> None:
+        self.hordes.clear()
+        self.timer = 0.0
+
+    @property
+    def horde_members(self) -> int:
+        return sum(len(horde.members) for horde in self.hordes)
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "enemies": len(self.game.enemies),
+            "hordes": len(self.hordes),
+            "horde_members": self.horde_members,
+            "recycled": self.recycled,
+            "capped": self.capped,
+            "aggregated": self.aggregated,
+            "splits": self.splits,
+        }
+
+    # --- Strop a recyklace ---
+
+    def room(self, wanted: int) -> int:
+        """Kolik z `wanted` nových nepřátel se ještě vejde pod strop."""
+        room = max(0, min(wanted, self.cap - len(self.game.enemies)))
+        self.capped += wanted - room
+        return room
+
+    def _move_to_ring(self, rows: np.ndarray) -> None:
+        """Přesune nepřátele (řádky EnemyPool) na spawn ring."""
+        pool = self.game.enemies
+        spawner = self.game.spawner
+        views = pool.views
+        for row in rows.tolist():
+            x, y = spawner.spawn_position()
+            pool.position[row] = (x, y)
+            pool.lod_dt[row] = 0.0
+            views[row].rect.center = (x, y)
+        self.recycled += len(rows)
+
+    def recycle_farthest(self, count: int) -> None:
+        """Místo spawnu nad stropem přesune `count` nejvzdálenějších nepřátel na ring."""
+        pool = self.game.enemies
+        n = pool.count
+        if n == 0 or count <= 0:
+            return
+        dist = self._distances()
+        # Jen ti, kdo jsou za spawn ringem — nepřítel u hráče se nepřesouvá
+        ring = math.hypot(SCREEN_WIDTH / 2, SCREEN_HEIGHT / 2) + ENEMY_SIZE
+        candidates = np.flatnonzero(dist > ring)
+        if len(candidates) > count:
+            candidates = candidates[np.argpartition(-dist[candidates], count - 1)[:count]]
+        self._move_to_ring(candidates)
+
+    def _distances(self) -> np.ndarray:
+        pool = self.game.enemies
+        player = self.game.player.position
+        diff = pool.position[:pool.count] - (player.x, player.y)
+        return np.hypot(diff[:, 0], diff[:, 1])
+
+    # --- Update ---
+
+    def update(self, dt: float) -> None:
+        """Pohyb hord každý snímek; recyklace a slučování jednou za POPULATION_INTERVAL."""
+        if self.hordes:
+            self._update_hordes(dt)
+        self.timer += dt
+        if self.timer < POPULATION_INTERVAL:
+            return
+        self.timer -= POPULATION_INTERVAL
+        dist = self._distances()
+        far = np.flatnonzero(dist > ENEMY_RECYCLE_DISTANCE)
+        if len(far):
+            self._move_to_ring(far)
+            dist[far] = 0.0
+        if self.hordes_enabled:
+            self._aggregate(dist)
+
+    def _aggregate(self, dist: np.ndarray) -> None:
+        """Husté vzdálené shluky (>= HORDE_MIN_SIZE v buňce HORDE_CELL) sloučí do hord."""
+        rows = np.flatnonzero(dist > HORDE_MIN_DISTANCE)
+        if len(rows) < HORDE_MIN_SIZE:
+            return
+        pool = self.game.enemies
+        pos = pool.position[rows]
+        cells = np.floor(pos / HORDE_CELL).astype(np.int64)
+        _, group, sizes = np.unique(cells, axis=0, return_inverse=True, return_counts=True)
+        group = group.ravel()
+        dense = sizes[group] >= HORDE_MIN_SIZE
+        if not dense.any():
+            return
+        views = pool.views
+        members_by_group: dict[int, list] = {}
+        for row, g in zip(rows[dense].tolist(), group[dense].tolist()):
+            members_by_group.setdefault(g, []).append(views[row])
+        for enemies in members_by_group.values():
+            x = sum(e.position.x for e in enemies) / len(enemies)
+            y = sum(e.position.y for e in enemies) / len(enemies)
+            members = [(type(e), max(e.hp, 1) / e.max_hp) for e in enemies]
+            speed_mult = min(e.speed_mult for e in enemies)
+            for enemy in enemies:
+                enemy.kill()   # bez dropu — vrací se do ObjectPool
+            self.hordes.append(Horde(x, y, members, speed_mult))
+            self.aggregated += len(members)
+
+    def _update_hordes(self, dt: float) -> None:
+        game = self.game
+        px, py = game.player.position.x, game.player.position.y
+        speed = BASE_ENEMY_SPEED * (1.0 + game.elapsed_seconds / ENEMY_SPEED_SCALE_INTERVAL)
+        remaining = []
+        for horde in self.hordes:
+            dx, dy = px - horde.x, py - horde.y
+            dist = math.hypot(dx, dy)
+            if dist < HORDE_SPLIT_DISTANCE:
+                self._split(horde)
+                continue
+            if dist > ENEMY_RECYCLE_DISTANCE:
+                # Hráč hordě utekl — členové se vrátí na spawn ring
+                self._split(horde, on_ring=True)
+                continue
+            step = speed * horde.speed_mult * dt / dist
+            horde.x += dx * step
+            horde.y += dy * step
+            remaining.append(horde)
+        self.hordes = remaining
+
+    def _split(self, horde: Horde, on_ring: bool = False) -> None:
+        """Rozpadne hordu zpět na nepřátele (z ObjectPool), bez ohledu na strop."""
+        game = self.game
+        rng = game.rng
+        spread = HORDE_CELL * 0.5
+        for enemy_class, hp_fraction in horde.members:
+            if on_ring:
+                x, y = game.spawner.spawn_position()
+            else:
+                x = horde.x + rng.uniform(-spread, spread)
+                y = horde.y + rng.uniform(-spread, spread)
+            enemy = game.enemy_pools[enemy_class].acquire(x, y, elapsed_seconds=game.elapsed_seconds)
+            game.enemies.add(enemy)
+            game.all_sprites.add(enemy)
+            enemy.hp = max(1, round(enemy.max_hp * hp_fraction))
+        self.splits += 1
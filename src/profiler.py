@@ -0,0 +1,139 @@
+"""BloodWar - Frame profiler module.
+
+Per-stage timers for Game.update and Renderer.draw with rolling sample
+windows (mean / p50 / p99 per stage) and Chrome trace-event export
+(chrome://tracing, Perfetto). When disabled, `stage()` returns a shared
+no-op context manager, so instrumented code costs one method call.
+"""
+
+import json
+import os
+import time
+from collections import deque
+
+
+class _NullStage:
+    """No-op context manager used while profiling is disabled."""
+
+    __slots__ = ()
+
+    def __enter__(self) -> None:
+        return None
+
+    def __exit__(self, *exc) -> bool:
+        return False
+
+
+_NULL_STAGE = _NullStage()
+
+
+class _Stage:
+    """Active timer for one stage; records the sample on exit."""
+
+    __slots__ = ("_profiler", "_name", "_start")
+
+    def __init__(self, profiler: "FrameProfiler", name: str) -> None:
+        self._profiler = profiler
+        self._name = name
+
+    def __enter__(self) -> None:
+        self._profiler._depth += 1
+        self._start = time.perf_counter_ns()
+
+    def __exit__(self, *exc) -> bool:
+        end = time.perf_counter_ns()
+        profiler = self._profiler
+        profiler._depth -= 1
+        profiler._record(self._name, self._start, end)
+        return False
+
+
+class FrameProfiler:
+    """Collects stage timings while enabled."""
+
+    def __init__(self, history: int = 240, trace_capacity: int = 200_000) -> None:
+        self.enabled = False
+        self.history = history
+        self._samples: dict[str, deque[int]] = {}
+        self._depths: dict[str, int] = {}      # hloubka vnoření (pro odsazení v overlay)
+        self._depth = 0
+        self._trace: deque[tuple] = deque(maxlen=trace_capacity)
+        self._origin_ns = time.perf_counter_ns()
+
+    def toggle(self) -> bool:
+        self.enabled = not self.enabled
+        return self.enabled
+
+    def reset(self) -> None:
+        self._samples.clear()
+        self._depths.clear()
+        self._trace.clear()
+
+    def stage(self, name: str):
+        """Context manager timing one stage: `with profiler.stage("collisions"): ...`."""
+        if not self.enabled:
+            return _NULL_STAGE
+        return _Stage(self, name)
+
+    def _record(self, name: str, start_ns: int, end_ns: int) -> None:
+        samples = self._samples.get(name)
+        if samples is None:
+            samples = self._samples[name] = deque(maxlen=self.history)
+            self._depths[name] = self._depth
+        samples.append(end_ns - start_ns)
+        self._trace.append(("X", name, start_ns, end_ns - start_ns, None))
+
+    def counter(self, name: str, **values: int) -> None:
+        """Record counter values (e.g. entity counts) into the trace."""
+        if self.enabled:
+            self._trace.append(("C", name, time.perf_counter_ns(), 0, values))
+
+    # --- Statistiky ---
+
+    def stage_names(self) -> list[str]:
+        """Stage names in order of first appearance."""
+        return list(self._samples)
+
+    def depth(self, name: str) -> int:
+        return self._depths.get(name, 0)
+
+    def stats(self, name: str) -> dict[str, float]:
+        """Mean / p50 / p99 / max in milliseconds over the rolling window."""
+        samples = self._samples.get(name)
+        if not samples:
+            return {"mean": 0.0, "p50": 0.0, "p99": 0.0, "max": 0.0}
+        ordered = sorted(samples)
+        count = len(ordered)
+        return {
+            "mean": sum(ordered) / count / 1e6,
+            "p50": ordered[count // 2] / 1e6,
+            "p99": ordered[min(count - 1, int(count * 0.99))] / 1e6,
+            "max": ordered[-1] / 1e6,
+        }
+
+    def recent(self, name: str) -> list[float]:
+        """Rolling window of samples for one stage, in milliseconds (oldest first)."""
+        return [v / 1e6 for v in self._samples.get(name, ())]
+
+    # --- Export ---
+
+    def trace_events(self) -> list[dict]:
+        """Buffered samples as Chrome trace-event dicts (timestamps in µs)."""
+        origin = self._origin_ns
+        events = []
+        for kind, name, start_ns, dur_ns, values in self._trace:
+            event = {"name": name, "ph": kind, "ts": (start_ns - origin) / 1000.0, "pid": 1, "tid": 1}
+            if kind == "X":
+                event["dur"] = dur_ns / 1000.0
+                event["cat"] = "frame"
+            else:
+                event["args"] = values
+            events.append(event)
+        return events
+
+    def export_chrome_trace(self, path: str) -> str:
+        """Write buffered samples as a Chrome trace JSON file; returns the path."""
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": self.trace_events(), "displayTimeUnit": "ms"}, f)
+        return path
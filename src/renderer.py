@@ -1,12 +1,28 @@
 """BloodWar - Renderer module."""
 
+from bisect import bisect_left, bisect_right
+from operator import itemgetter
+
+import numpy as np
 import pygame
 
 from constants import (
-    SCREEN_WIDTH, SCREEN_HEIGHT, WHITE, TILE_SIZE, TILESET_SCALE,
+    SCREEN_WIDTH, SCREEN_HEIGHT, FPS, WHITE, TILE_SIZE, TILESET_SCALE,
+    HP_BAR_LEVELS, HP_BARS_DAMAGED_ONLY, GEM_TIERS,
     xp_threshold,
 )
-from tiles import get_tile, get_tileset_dims, get_water_tile
+from tiles import get_tile, get_tileset_dims
+from src.background_cache import BackgroundCache
+from src.sprite_cache import _get_hp_bars, _get_aura_surface, _get_gem_surface
+
+PROFILER_REFRESH_FRAMES = 15   # jak často přerenderovat text profileru
+NOTICE_MS = 2500               # jak dlouho zůstane hlášení hotkeye (F4 trace, ...) na obrazovce
+
+_depth_key = itemgetter(0)
+
+
+def _sprite_depth(sprite) -> int:
+    return sprite.rect.centery
 
 
 class Renderer:
@@ -23,6 +39,66 @@ class Renderer:
         self.font_debug = pygame.font.Font(None, 12)
         # HUD text cache: key → (text_str, rendered_surface)
         self._hud_cache: dict[str, tuple[str, pygame.Surface]] = {}
+        # Krátké hlášení dole na obrazovce: (text, čas vypršení v ms)
+        self._notice: tuple[str, int] | None = None
+        # Profiler overlay — přerenderuje se jen každých N snímků
+        self._profiler_surface: pygame.Surface | None = None
+        self._profiler_age = 0
+        # Statické pozadí upečené po chuncích světa (tráva + voda)
+        self.background = BackgroundCache(game.world)
+        # Hloubkové pořadí: stromy aktivního okna seřazené jednou, pohyblivé sprity z minulého snímku
+        self._trees_by_depth: list[tuple[int, pygame.sprite.Sprite]] = []
+        self._tree_bottoms: list[int] = []
+        self._tree_max_height = 0
+        self._tree_source: tuple | None = None   # (svět, verze okna), pro který platí pořadí
+        self.rebuild_tree_order()
+        self._moving_order: list = []      # hráč + nepřátelé v záběru, seřazení dle Y
+        self._visible_enemies: list = []   # nepřátelé v záběru (z _draw_objects, pro HP bary)
+        self._gem_tier_counts = np.array([min_count for min_count, _, _ in GEM_TIERS])
+        self._gem_surfaces = [(_get_gem_surface(radius, color), radius) for _, radius, color in GEM_TIERS]
+
+    def reset(self, world_changed: bool = False) -> None:
+        """Restart hry — zahodí pořadí spritů z minulé hry; po novém světě přepne pozadí."""
+        self._moving_order = []
+        self._visible_enemies = []
+        if world_changed:
+            self.background.world = self.game.world
+
+    def rebuild_tree_order(self) -> None:
+        """Seřadí stromy podle rect.bottom (znovu jen po posunu aktivního okna světa)."""
+        world = self.game.world
+        self._tree_source = (world, world.version)
+        self._trees_by_depth = sorted(((t.rect.bottom, t) for t in self.game.trees), key=_depth_key)
+        self._tree_bottoms = [bottom for bottom, _ in self._trees_by_depth]
+        self._tree_max_height = max((t.rect.height for t in self.game.trees), default=0)
+
+    def _visible_trees(self, view: pygame.Rect) -> list[tuple[int, pygame.sprite.Sprite]]:
+        """Stromy v záběru, už seřazené — bisect podle spodní hrany + test v ose X."""
+        lo = bisect_right(self._tree_bottoms, view.top)
+        hi = bisect_left(self._tree_bottoms, view.bottom + self._tree_max_height)
+        left, right = view.left, view.right
+        return [
+            entry for entry in self._trees_by_depth[lo:hi]
+            if entry[1].rect.right > left and entry[1].rect.left < right
+            and entry[1].rect.top < view.bottom
+        ]
+
+    def _update_moving_order(self, moving: list) -> list:
+        """Seřadí pohyblivé sprity; začíná od pořadí z minulého snímku.
+
+        Survivors keep last frame's order and newcomers are appended, so
+        Timsort sees one long nearly-sorted run plus a short tail: the cost
+        follows how many sprites changed place, not the sprite count.
+        """
+        current = set(moving)
+        previous = self._moving_order
+        order = [s for s in previous if s in current]
+        if len(order) != len(moving):
+            kept = set(order)
+            order.extend(s for s in moving if s not in kept)
+        order.sort(key=_sprite_depth)
+        self._moving_order = order
+        return order
 
     def _cached_render(self, font: pygame.font.Font, text: str, color, cache_key: str) -> pygame.Surface:
         """Render text only when it changes, otherwise return cached surface."""
@@ -37,11 +113,19 @@ class Renderer:
         """Draw game to screen."""
         cx = int(self.game.camera_x)
         cy = int(self.game.camera_y)
-
-        self._draw_background(cx, cy)
-        self._draw_objects(cx, cy)
-        self.game.particle_system.draw(self.game.screen, cx, cy)
-        self._draw_ui()
+        profiler = self.game.profiler
+        stage = profiler.stage
+
+        with stage("draw_background"):
+            self._draw_background(cx, cy)
+        with stage("draw_ysort"):
+            self._draw_objects(cx, cy)
+        with stage("draw_hp_bars"):
+            self._draw_hp_bars(cx, cy)
+        with stage("draw_particles"):
+            self.game.particle_system.draw(self.game.screen, cx, cy)
+        with stage("draw_ui"):
+            self._draw_ui()
 
         if self.game.show_grid:
             self._draw_debug_grid()
@@ -49,97 +133,110 @@ class Renderer:
         if self.game.level_up_pending:
             self._draw_level_up_overlay()
 
-        pygame.display.flip()
+        if profiler.enabled:
+            self._draw_profiler_overlay()
+
+        if self._notice is not None:
+            self._draw_notice()
+
+        # Headless hra kreslí jen do offscreen surface (benchmarky)
+        if not self.game.headless:
+            pygame.display.flip()
 
     def _draw_background(self, cx: int, cy: int) -> None:
-        """Draw tiled grass background with autotiled water tiles."""
-        grass_tile = self.game.grass_tile
-        tw = TILE_SIZE * TILESET_SCALE
-        th = TILE_SIZE * TILESET_SCALE
-        water_tiles = self.game.water_tiles
-
-        start_col = cx // tw
-        start_row = cy // th
-        cols_needed = (SCREEN_WIDTH // tw) + 2
-        rows_needed = (SCREEN_HEIGHT // th) + 2
-
-        for row in range(start_row, start_row + rows_needed):
-            for col in range(start_col, start_col + cols_needed):
-                sx = col * tw - cx
-                sy = row * th - cy
-                if (col, row) in water_tiles:
-                    top    = (col, row - 1) in water_tiles
-                    bottom = (col, row + 1) in water_tiles
-                    left   = (col - 1, row) in water_tiles
-                    right  = (col + 1, row) in water_tiles
-                    self.game.screen.blit(get_water_tile(top, bottom, left, right), (sx, sy))
-                else:
-                    self.game.screen.blit(grass_tile, (sx, sy))
+        """Draw the baked grass/water background chunks."""
+        self.background.draw(self.game.screen, cx, cy)
 
     def _draw_objects(self, cx: int, cy: int) -> None:
-        """Draw all game objects with Y-sorting, offset by camera."""
+        """Draw on-screen game objects with Y-sorting, offset by camera.
+
+        Enemies are culled through the enemy index, trees by a bisect on
+        their pre-sorted bottoms, the other layers by a rect test; every
+        layer is one fblits call.
+        """
+        game = self.game
+        screen = game.screen
+        view = pygame.Rect(cx, cy, SCREEN_WIDTH, SCREEN_HEIGHT)
+        world = game.world
+        if self._tree_source != (world, world.version):
+            self.rebuild_tree_order()
+        # ±1 px — rect se zaokrouhluje, index drží float pozice
+        x0, y0, x1, y1 = cx - 1, cy - 1, cx + SCREEN_WIDTH + 1, cy + SCREEN_HEIGHT + 1
+
         # Player — přeskočit každý druhý snímek při neranitelnosti (blikání)
-        player = self.game.player
+        player = game.player
         show_player = (
             player.invincibility_timer <= 0
             or int(player.invincibility_timer * 8) % 2 == 0
         )
 
-        # Build renderables via list comprehension (avoids repeated .append)
-        renderables = (
-            ([(player.position.y, player)] if show_player else [])
-            + [(e.position.y, e) for e in self.game.enemies]
-            + [(t.rect.bottom, t) for t in self.game.trees]
-        )
-
-        # Sort by Y — Timsort is efficient on nearly-sorted data
-        renderables.sort(key=lambda x: x[0])
+        enemies = game.enemy_index.items_in_rect(x0, y0, x1, y1, pygame.sprite.Sprite.alive)
+        self._visible_enemies = enemies
+        moving = self._update_moving_order(enemies + [player] if show_player else enemies)
 
-        # Draw sorted objects with camera offset
-        blit = self.game.screen.blit
-        for _, obj in renderables:
-            blit(obj.image, (obj.rect.left - cx, obj.rect.top - cy))
+        # Sloučení dvou seřazených běhů — Timsort je spojí jedním merge průchodem
+        renderables = [(sprite.rect.centery, sprite) for sprite in moving] + self._visible_trees(view)
+        renderables.sort(key=_depth_key)
+        screen.fblits([(obj.image, (obj.rect.left - cx, obj.rect.top - cy)) for _, obj in renderables])
 
         # Ledová aura hráče
-        player = self.game.player
         if player.aura_radius > 0:
             r = int(player.aura_radius)
-            aura_surf = pygame.Surface((r * 2, r * 2), pygame.SRCALPHA)
-            pygame.draw.circle(aura_surf, (100, 180, 255, 35), (r, r), r)
-            pygame.draw.circle(aura_surf, (150, 220, 255, 90), (r, r), r, 2)
-            self.game.screen.blit(
-                aura_surf,
+            screen.blit(
+                _get_aura_surface(r),
                 (int(player.position.x) - cx - r, int(player.position.y) - cy - r),
             )
 
-        # Draw gems and projectiles with camera offset
-        for sprite in self.game.gems:
-            sx = sprite.rect.left - cx
-            sy = sprite.rect.top - cy
-            self.game.screen.blit(sprite.image, (sx, sy))
-
-        for sprite in self.game.projectiles:
-            sx = sprite.rect.left - cx
-            sy = sprite.rect.top - cy
-            self.game.screen.blit(sprite.image, (sx, sy))
-
-        # Orbitální projektily (fialové orby)
-        for orb in self.game.orbital_projectiles:
-            sx = orb.rect.left - cx
-            sy = orb.rect.top - cy
-            self.game.screen.blit(orb.image, (sx, sy))
-
-        # HP bary nepřátel s více než 1 HP
-        for enemy in self.game.enemies:
-            if enemy.max_hp > 1:
-                bar_w = enemy.rect.width
-                bar_h = 4
-                bx = enemy.rect.left - cx
-                by = enemy.rect.top - cy - 6
-                pygame.draw.rect(self.game.screen, (60, 0, 0), (bx, by, bar_w, bar_h))
-                fill = int(bar_w * enemy.hp / enemy.max_hp)
-                if fill > 0:
-                    pygame.draw.rect(self.game.screen, (220, 50, 50), (bx, by, fill, bar_h))
+        # Gemy, projektily a orbitály — jeden fblits na vrstvu, jen v záběru
+        self._draw_gems(cx, cy)
+        for group in (game.projectiles, game.orbital_projectiles):
+            screen.fblits([
+                (sprite.image, (sprite.rect.left - cx, sprite.rect.top - cy))
+                for sprite in group if view.colliderect(sprite.rect)
+            ])
+
+    def _draw_gems(self, cx: int, cy: int) -> None:
+        """Gemy z GemStore — vzhled podle počtu sloučených gemů (GEM_TIERS)."""
+        gems = self.game.gems
+        reach = GEM_TIERS[-1][1]
+        slots = gems.query_rect(cx - reach, cy - reach, cx + SCREEN_WIDTH + reach, cy + SCREEN_HEIGHT + reach)
+        if not len(slots):
+            return
+        tier = np.searchsorted(self._gem_tier_counts, gems.count[slots], side="right") - 1
+        pos = gems.position[slots].astype(np.int64)
+        blits = []
+        for t, x, y in zip(tier.tolist(), pos[:, 0].tolist(), pos[:, 1].tolist()):
+            surface, radius = self._gem_surfaces[t]
+            blits.append((surface, (x - radius - cx, y - radius - cy)))
+        self.game.screen.fblits(blits)
+
+    def _draw_hp_bars(self, cx: int, cy: int) -> None:
+        """HP bary nepřátel v záběru — předrenderovaný atlas, jeden fblits.
+
+        Fill ratio comes from the EnemyPool columns, quantized up to
+        HP_BAR_LEVELS (any remaining HP shows at least one level).
+        """
+        enemies = self._visible_enemies
+        if not enemies:
+            return
+        pool = self.game.enemies
+        slots = np.fromiter((e._slot for e in enemies), dtype=np.int64, count=len(enemies))
+        max_hp = pool.max_hp[slots]
+        hp = pool.hp[slots]
+        shown = max_hp > 1
+        if HP_BARS_DAMAGED_ONLY:
+            shown &= hp < max_hp
+        levels = np.ceil(np.clip(hp / np.maximum(max_hp, 1), 0.0, 1.0) * HP_BAR_LEVELS).astype(np.int64)
+
+        blits = []
+        atlases: dict[int, list[pygame.Surface]] = {}   # šířka → atlas (jeden lookup na šířku)
+        for i, level in zip(np.flatnonzero(shown).tolist(), levels[shown].tolist()):
+            rect = enemies[i].rect
+            bars = atlases.get(rect.width)
+            if bars is None:
+                bars = atlases[rect.width] = _get_hp_bars(rect.width, HP_BAR_LEVELS)
+            blits.append((bars[level], (rect.left - cx, rect.top - cy - 6)))
+        self.game.screen.fblits(blits)
 
     def _draw_ui(self) -> None:
         """Draw HUD: score, level, XP bar, HP bar, game over."""
@@ -186,6 +283,20 @@ class Renderer:
         # XP bar
         self._draw_xp_bar()
 
+    def notify(self, text: str) -> None:
+        """Zobrazí krátké hlášení (výsledek hotkeye) na NOTICE_MS."""
+        self._notice = (text, pygame.time.get_ticks() + NOTICE_MS)
+
+    def _draw_notice(self) -> None:
+        text, expires = self._notice
+        if pygame.time.get_ticks() >= expires:
+            self._notice = None
+            return
+        surface = self._cached_render(self.font_small, text, WHITE, "notice")
+        rect = surface.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT - 60))
+        self.game.screen.fill((0, 0, 0), rect.inflate(16, 8))
+        self.game.screen.blit(surface, rect)
+
     def _draw_player_hp(self) -> None:
         """Draw player HP as a red bar in top-right corner."""
         screen = self.game.screen
@@ -281,6 +392,69 @@ class Renderer:
             desc = self.font_small.render(upgrade["desc"], True, (160, 200, 255))
             screen.blit(desc, desc.get_rect(center=(cx + card_w // 2, card_y + 90)))
 
+    def _draw_profiler_overlay(self) -> None:
+        """Per-stage ms, entity counts and frame budget usage (F3)."""
+        self._profiler_age += 1
+        if self._profiler_surface is None or self._profiler_age >= PROFILER_REFRESH_FRAMES:
+            self._profiler_surface = self._build_profiler_overlay()
+            self._profiler_age = 0
+        self.game.screen.blit(self._profiler_surface, (10, 110))
+
+    def _build_profiler_overlay(self) -> pygame.Surface:
+        """Vykreslí panel profileru do vlastní (průhledné) surface."""
+        game = self.game
+        profiler = game.profiler
+        font = self.font_tiny
+        budget_ms = 1000.0 / FPS
+        line_h = 16
+        width = 360
+        col_mean = 220      # pravý okraj sloupce průměru
+        col_p99 = 280       # pravý okraj sloupce p99
+        bar_x = 290
+        bar_w = width - bar_x - 6
+
+        frame = profiler.stats("frame")
+        header = f"frame {frame['mean']:.2f} ms, budget {frame['mean'] / budget_ms * 100:.0f} %"
+        rows = [(name, profiler.depth(name), profiler.stats(name))
+                for name in profiler.stage_names() if name != "frame"]
+        counts = (f"enemies {len(game.enemies)}  proj {len(game.projectiles)}  "
+                  f"gems {len(game.gems)}  particles {len(game.particle_system)}")
+
+        spark_h = 30
+        height = (len(rows) + 3) * line_h + spark_h + 12
+        panel = pygame.Surface((width, height), pygame.SRCALPHA)
+        panel.fill((0, 0, 0, 170))
+
+        def right(text: str, x: int, y: int, color) -> None:
+            surf = font.render(text, True, color)
+            panel.blit(surf, (x - surf.get_width(), y))
+
+        panel.blit(font.render(header, True, (255, 220, 50)), (4, 4))
+        right("ms", col_mean, 4, (180, 180, 180))
+        right("p99", col_p99, 4, (180, 180, 180))
+
+        for i, (name, depth, st) in enumerate(rows, start=1):
+            y = 4 + i * line_h
+            panel.blit(font.render(name, True, WHITE), (4 + depth * 10, y))
+            right(f"{st['mean']:.2f}", col_mean, y, WHITE)
+            right(f"{st['p99']:.2f}", col_p99, y, WHITE)
+            # Podíl na rozpočtu snímku
+            w = min(bar_w, int(bar_w * st["mean"] / budget_ms))
+            color = (80, 200, 120) if st["p99"] < budget_ms else (220, 60, 60)
+            pygame.draw.rect(panel, color, (bar_x, y + 4, max(1, w), 6))
+
+        panel.blit(font.render(counts, True, (160, 200, 255)), (4, 4 + (len(rows) + 1) * line_h))
+
+        # Sparkline posledních časů snímku; žlutá čára = rozpočet 1/FPS
+        base_y = height - 6
+        recent = profiler.recent("frame")[-(width - 8):]
+        for x, ms in enumerate(recent):
+            h = min(spark_h, int(spark_h * ms / (budget_ms * 2)))
+            color = (80, 200, 120) if ms <= budget_ms else (220, 60, 60)
+            pygame.draw.line(panel, color, (4 + x, base_y), (4 + x, base_y - h))
+        pygame.draw.line(panel, (255, 220, 50), (4, base_y - spark_h // 2), (width - 4, base_y - spark_h // 2))
+        return panel
+
     def _draw_debug_grid(self) -> None:
         """Draw debug grid with tileset tiles — souřadnice = pozice v tilesetu."""
         cell_size = TILE_SIZE * TILESET_SCALE
@@ -0,0 +1,88 @@
+"""BloodWar - Headless simulation.
+
+Runs Game.update logic without a window or Renderer, with a fixed timestep,
+seeded RNG and scripted/bot input — for balancing and regression runs
+faster than real time.
+
+Usage:
+    python -m src.simulation --seed 1 --seconds 300
+"""
+
+import argparse
+import time
+
+from constants import FPS, FIXED_DT
+from game import Game
+from src.controllers import BotController
+
+
+def random_upgrade(choices: list[dict], rng) -> dict:
+    """Default level-up policy: uniformly random choice (seeded)."""
+    return rng.choice(choices)
+
+
+class Simulation:
+    """Deterministic headless game session."""
+
+    def __init__(self, seed: int = 0, controller=None, upgrade_policy=random_upgrade) -> None:
+        """controller: objekt s direction(player) -> (dx, dy) a reset(); None = BotController.
+        upgrade_policy: funkce (choices, rng) -> upgrade pro level-up obrazovku.
+        """
+        self.game = Game(headless=True, seed=seed)
+        self.game.player.controller = controller if controller is not None else BotController(self.game)
+        self.upgrade_policy = upgrade_policy
+
+    def step(self) -> None:
+        """Advance the game by one fixed timestep (level-up choices are made automatically)."""
+        game = self.game
+        if game.level_up_pending:
+            game.apply_upgrade(self.upgrade_policy(game.upgrade_choices, game.rng))
+        game.update(FIXED_DT)
+
+    def run(self, max_frames: int) -> dict:
+        """Step until game over or max_frames; return a summary of the run."""
+        game = self.game
+        start = time.perf_counter()
+        frames = 0
+        step_ns: list[int] = []
+        clock = time.perf_counter_ns
+        while frames < max_frames and not game.game_over:
+            t0 = clock()
+            self.step()
+            step_ns.append(clock() - t0)
+            frames += 1
+        wall = time.perf_counter() - start
+        step_ns.sort()
+        count = max(len(step_ns), 1)
+        return {
+            "seed": game.seed,
+            "frames": frames,
+            "time_survived": game.frame_count / FPS,
+            "game_over": game.game_over,
+            "kills": game.kills,
+            "level": game.level,
+            "player_hp": game.player.hp,
+            "enemies": len(game.enemies),
+            "wall_seconds": wall,
+            "frames_per_second": frames / wall if wall > 0 else 0.0,
+            # Čas jednoho simulačního kroku (update bez kreslení), ms
+            "frame_ms_mean": sum(step_ns) / count / 1e6,
+            "frame_ms_p50": step_ns[len(step_ns) // 2] / 1e6 if step_ns else 0.0,
+            "frame_ms_p99": step_ns[min(len(step_ns) - 1, int(len(step_ns) * 0.99))] / 1e6 if step_ns else 0.0,
+            "frame_ms_max": step_ns[-1] / 1e6 if step_ns else 0.0,
+        }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Headless BloodWar simulation")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--seconds", type=float, default=300.0, help="max simulated time")
+    args = parser.parse_args()
+
+    result = Simulation(seed=args.seed).run(int(args.seconds * FPS))
+    for key, value in result.items():
+        print(f"{key:>18}: {value}")
+
+
+if __name__ == "__main__":
+    main()
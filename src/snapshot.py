@@ -0,0 +1,516 @@
+"""BloodWar - Snapshot module.
+
+Binární snímky stavu hry pro uložení/obnovení běhu a rychlý rewind při
+ladění. Formát: hlavička + sekce (tag, délka, data); entity se ukládají po
+sloupcích (NumPy pole, struct pro skaláry), žádný pickle spritů. Snímek
+10k nepřátel + 500 projektilů + 2000 gemů má ~460 KB (nepřátelé ~360 KB,
+37 B na řádek); dump trvá ~7 ms, restore ~90 ms (nepřátelé se berou
+z ObjectPool bez reset()).
+
+Částice (čistě vizuální) a flow field / indexy (odvozené) se neukládají.
+"""
+
+import math
+import struct
+import zlib
+from collections import deque
+
+import numpy as np
+import pygame
+
+from constants import FPS, UPGRADES
+from enemy import Enemy, FastEnemy, TankEnemy, OrbitalProjectile
+from player import Player
+from src.enemy_pool import EnemyPool
+from src.population import Horde
+from src.sprite_cache import _get_enemy_frames
+
+MAGIC = b"BWS1"
+VERSION = 3
+
+_HEADER = struct.Struct("<4sHHI")     # magic, verze, počet sekcí, CRC32 zbytku
+_SECTION = struct.Struct("<4sI")      # tag, délka dat
+_COUNT = struct.Struct("<I")
+
+# Kód třídy nepřítele v sekci ENEM (pořadí je součástí formátu)
+ENEMY_CLASSES = (Enemy, FastEnemy, TankEnemy)
+_ENEMY_CODES = {cls: code for code, cls in enumerate(ENEMY_CLASSES)}
+
+# Sloupce EnemyPool v sekci ENEM a jejich uložený dtype (pořadí = formát).
+# velocity, half_size, lod_dt a lod_band se neukládají: rychlost i LOD pásmo
+# se počítají každý snímek znovu, half_size plyne ze snímků vzhledu a lod_dt
+# je u blízkého pásma vždy nula (vzdálení nepřátelé přijdou o nejvýš jeden
+# LOD interval pohybu).
+_ENEMY_COLUMNS = (
+    ("position", np.float32),
+    ("hp", np.float32),
+    ("max_hp", np.int32),
+    ("speed_mult", np.float32),
+    ("contact_damage", np.int32),
+    ("animation_timer", np.float32),
+    ("current_frame", np.uint8),
+)
+
+# Herní stav (pořadí polí = formát _GAME); poslední je seed světa
+_GAME_FIELDS = (
+    "frame_count", "kills", "xp", "level", "wand_cooldown_frames", "game_over", "level_up_pending",
+    "wand_timer", "spawn_timer", "gem_merge_timer", "camera_x", "camera_y", "seed",
+)
+_GAME = struct.Struct("<qqqqq??dddddQ")
+_GAUSS = struct.Struct("<?d")         # random.Random: je gauss_next, hodnota
+_F64 = struct.Struct("<d")
+
+# Atributy Player v pořadí formátu: (název, struct kód)
+PLAYER_FIELDS = (
+    ("speed", "q"), ("magnet_radius", "q"), ("projectile_count", "q"),
+    ("proj_size", "q"), ("proj_speed", "q"), ("proj_lifetime", "d"),
+    ("pierce", "q"), ("bonus_damage", "q"), ("xp_bonus", "q"), ("gem_speed_mult", "d"),
+    ("heal_on_kill", "d"), ("heal_accum", "d"), ("regen_rate", "d"), ("regen_accum", "d"),
+    ("adrenalin", "?"), ("adrenalin_damage_mult", "d"),
+    ("has_explosion", "?"), ("explosion_damage", "d"), ("explosion_radius", "d"),
+    ("aura_radius", "q"), ("aura_slow", "d"), ("orbital_count", "q"),
+    ("max_hp", "q"), ("hp", "q"), ("invincibility_timer", "d"),
+    ("last_direction", "q"), ("current_frame", "q"), ("animation_timer", "d"),
+)
+_PLAYER = struct.Struct("<4d" + "".join(code for _, code in PLAYER_FIELDS))   # + pozice a rychlost
+_CASTS = {"q": int, "d": float, "?": bool}
+
+
+# --- Kódování ---
+
+class _Writer:
+    """Skládá payload sekce z kousků (jeden join na konci)."""
+
+    def __init__(self) -> None:
+        self.parts: list[bytes] = []
+
+    def pack(self, fmt: struct.Struct, *values) -> None:
+        self.parts.append(fmt.pack(*values))
+
+    def count(self, n: int) -> None:
+        self.parts.append(_COUNT.pack(n))
+
+    def array(self, values, dtype) -> None:
+        self.parts.append(np.ascontiguousarray(values, dtype=dtype).tobytes())
+
+    def names(self, names: list[str]) -> None:
+        encoded = "\n".join(names).encode()
+        self.count(len(encoded))
+        self.parts.append(encoded)
+
+    def payload(self) -> bytes:
+        return b"".join(self.parts)
+
+
+class _Reader:
+    """Čte payload sekce po částech; pole jsou kopie (zapisovatelné)."""
+
+    def __init__(self, data: memoryview) -> None:
+        self.data = data
+        self.offset = 0
+
+    def unpack(self, fmt: struct.Struct) -> tuple:
+        values = fmt.unpack_from(self.data, self.offset)
+        self.offset += fmt.size
+        return values
+
+    def count(self) -> int:
+        return self.unpack(_COUNT)[0]
+
+    def array(self, dtype, count: int, shape: tuple = ()) -> np.ndarray:
+        dtype = np.dtype(dtype)
+        items = count * math.prod(shape)
+        values = np.frombuffer(self.data, dtype=dtype, count=items, offset=self.offset)
+        self.offset += items * dtype.itemsize
+        return values.reshape((count,) + shape).copy()
+
+    def names(self) -> list[str]:
+        size = self.count()
+        text = bytes(self.data[self.offset:self.offset + size]).decode()
+        self.offset += size
+        return text.split("\n") if text else []
+
+
+# --- Uložení ---
+
+def dump(game) -> bytes:
+    """Zakóduje stav hry do bajtů."""
+    sections = [
+        (b"GAME", _dump_game(game)),
+        (b"PLYR", _dump_player(game.player)),
+        (b"ENEM", _dump_enemies(game.enemies)),
+        (b"PROJ", _dump_projectiles(game.projectiles)),
+        (b"GEMS", _dump_gems(game.gems)),
+        (b"ORBS", _dump_orbitals(game.orbital_projectiles)),
+        (b"HORD", _dump_hordes(game.population)),
+    ]
+    parts = []
+    for tag, payload in sections:
+        parts.append(_SECTION.pack(tag, len(payload)))
+        parts.append(payload)
+    body = b"".join(parts)
+    return _HEADER.pack(MAGIC, VERSION, len(sections), zlib.crc32(body)) + body
+
+
+def _dump_game(game) -> bytes:
+    w = _Writer()
+    w.pack(_GAME, *(getattr(game, name) for name in _GAME_FIELDS[:-1]), game.world.seed)
+    # Upgrady: stacky (id + počet) a nabídnuté volby level-upu
+    w.names(list(game.upgrade_stacks))
+    w.array(list(game.upgrade_stacks.values()), np.int64)
+    w.names([upgrade["id"] for upgrade in game.upgrade_choices])
+    # Herní RNG — po obnovení se hra odvíjí stejně jako od okamžiku uložení
+    _, state, gauss_next = game.rng.getstate()
+    w.count(len(state))
+    w.array(state, np.uint32)
+    w.pack(_GAUSS, gauss_next is not None, gauss_next or 0.0)
+    return w.payload()
+
+
+def _dump_player(player) -> bytes:
+    w = _Writer()
+    w.pack(
+        _PLAYER, player.position.x, player.position.y, player.velocity.x, player.velocity.y,
+        *(_CASTS[code](getattr(player, name)) for name, code in PLAYER_FIELDS),
+    )
+    return w.payload()
+
+
+def _dump_enemies(pool) -> bytes:
+    n = pool.count
+    views = pool.views
+    # Vzhled (třída, měřítko, tint) sdílí tisíce nepřátel — paleta + index na řádek
+    looks: dict[tuple, int] = {}
+    look_index = [looks.setdefault((type(e), e.anim_scale, e.color_tint), len(looks)) for e in views]
+    w = _Writer()
+    w.count(len(looks))
+    w.array([_ENEMY_CODES[cls] for cls, _, _ in looks], np.uint8)
+    w.array([scale for _, scale, _ in looks], np.uint8)
+    # Tint (RGB + příznak "má tint")
+    w.array([(*tint, 1) if tint is not None else (0, 0, 0, 0) for _, _, tint in looks], np.uint8)
+    w.count(n)
+    w.array(look_index, np.uint16)
+    w.array([e.gem_count for e in views], np.uint16)
+    w.array([e.uid for e in views], np.uint32)
+    for name, dtype in _ENEMY_COLUMNS:
+        w.array(getattr(pool, name)[:n], dtype)
+    return w.payload()
+
+
+def _dump_projectiles(projectiles) -> bytes:
+    items = list(projectiles)
+    w = _Writer()
+    w.count(len(items))
+    w.array([
+        (p.position.x, p.position.y, p.prev_position.x, p.prev_position.y,
+         p.velocity.x, p.velocity.y, p._lifetime, p._max_lifetime)
+        for p in items
+    ], np.float64)
+    w.array([(p.rect.width, p.pierce_remaining) for p in items], np.int64)
+    # Už zasažení nepřátelé (uid) — ragged: počty + plochý seznam
+    w.array([len(p._hit_enemies) for p in items], np.int64)
+    w.array([uid for p in items for uid in p._hit_enemies], np.int64)
+    return w.payload()
+
+
+def _dump_gems(gems) -> bytes:
+    slots = np.flatnonzero(gems.alive[:gems._high])
+    w = _Writer()
+    w.count(len(slots))
+    w.array(gems.position[slots], np.float64)
+    w.array(gems.count[slots], np.int64)
+    w.array(np.isin(slots, np.fromiter(gems._moving, dtype=np.int64)), np.bool_)
+    return w.payload()
+
+
+def _dump_orbitals(orbitals) -> bytes:
+    items = list(orbitals)
+    w = _Writer()
+    w.count(len(items))
+    w.array([orb.angle for orb in items], np.float64)
+    w.array([len(orb._hit_cooldowns) for orb in items], np.int64)
+    w.array([uid for orb in items for uid in orb._hit_cooldowns], np.int64)
+    w.array([left for orb in items for left in orb._hit_cooldowns.values()], np.float64)
+    return w.payload()
+
+
+def _dump_hordes(population) -> bytes:
+    hordes = population.hordes
+    w = _Writer()
+    w.count(len(hordes))
+    w.pack(_F64, population.timer)
+    w.array([(h.x, h.y, h.speed_mult) for h in hordes], np.float64)
+    w.array([len(h.members) for h in hordes], np.int64)
+    w.array([_ENEMY_CODES[cls] for h in hordes for cls, _ in h.members], np.uint8)
+    w.array([fraction for h in hordes for _, fraction in h.members], np.float64)
+    return w.payload()
+
+
+# --- Načtení ---
+
+def parse(data: bytes) -> dict[bytes, memoryview]:
+    """Rozdělí snímek na sekce (tag → data); kontroluje hlavičku, CRC32 a délky."""
+    view = memoryview(data)
+    if len(view) < _HEADER.size:
+        raise ValueError("Snapshot is truncated")
+    magic, version, count, checksum = _HEADER.unpack_from(view)
+    if magic != MAGIC:
+        raise ValueError("Not a BloodWar snapshot")
+    if version != VERSION:
+        raise ValueError(f"Unsupported snapshot version {version} (expected {VERSION})")
+    if zlib.crc32(view[_HEADER.size:]) != checksum:
+        raise ValueError("Snapshot checksum mismatch")
+    sections = {}
+    offset = _HEADER.size
+    for _ in range(count):
+        if offset + _SECTION.size > len(view):
+            raise ValueError("Snapshot is truncated")
+        tag, size = _SECTION.unpack_from(view, offset)
+        offset += _SECTION.size
+        if offset + size > len(view):
+            raise ValueError("Snapshot is truncated")
+        sections[tag] = view[offset:offset + size]
+        offset += size
+    missing = {b"GAME", b"PLYR", b"ENEM", b"PROJ", b"GEMS", b"ORBS", b"HORD"} - sections.keys()
+    if missing:
+        raise ValueError(f"Snapshot is missing sections: {sorted(missing)}")
+    return sections
+
+
+def restore(game, data: bytes) -> None:
+    """Obnoví stav hry ze snímku (jako reset(), jen do uloženého okamžiku).
+
+    Every section is decoded before the game is touched, so a corrupt
+    snapshot raises ValueError and leaves the game unchanged. Restored
+    enemies get fresh uids; projectile hit sets and orbital cooldowns are
+    remapped to them (uids of enemies dead at save time are dropped).
+    """
+    sections = parse(data)
+    try:
+        game_state = _read_game(_Reader(sections[b"GAME"]))
+        player_state = _Reader(sections[b"PLYR"]).unpack(_PLAYER)
+        enemies = _read_enemies(_Reader(sections[b"ENEM"]))
+        projectiles = _read_projectiles(_Reader(sections[b"PROJ"]))
+        gems = _read_gems(_Reader(sections[b"GEMS"]))
+        orbitals = _read_orbitals(_Reader(sections[b"ORBS"]))
+        hordes = _read_hordes(_Reader(sections[b"HORD"]))
+    except (struct.error, UnicodeDecodeError, IndexError) as exc:
+        raise ValueError(f"Corrupt snapshot: {exc}") from exc
+
+    game._clear_entities()
+    world_changed = game_state["seed"] != game.world.seed
+    if world_changed:
+        game.world.close()
+        game.world = game._create_world(game_state["seed"])
+
+    # Hráč — nový objekt (animace, rect), controller zůstává (bez stavu z minulého běhu)
+    controller = game.player.controller
+    x, y, vx, vy = player_state[:4]
+    player = game.player = Player(x, y)
+    player.controller = controller
+    if controller is not None:
+        controller.reset()
+    player.velocity.update(vx, vy)
+    for (name, _), value in zip(PLAYER_FIELDS, player_state[4:]):
+        setattr(player, name, value)
+    player.image = player.animations[player.direction_map[player.last_direction]][player.current_frame]
+    game.all_sprites.add(player)
+
+    for name in _GAME_FIELDS[:-1]:
+        setattr(game, name, game_state[name])
+    game.score = game.frame_count // FPS
+    game.upgrade_stacks = game_state["upgrade_stacks"]
+    by_id = {upgrade["id"]: upgrade for upgrade in UPGRADES}
+    game.upgrade_choices = [by_id[uid] for uid in game_state["upgrade_choices"] if uid in by_id]
+    game.rng.setstate(game_state["rng"])
+
+    uid_map = _apply_enemies(game, *enemies)
+    _apply_projectiles(game, *projectiles, uid_map)
+    game.gems.restore(*gems)
+    _apply_orbitals(game, *orbitals, uid_map)
+    game.population.timer, game.population.hordes = hordes
+
+    game.world.activate(player.position.x, player.position.y)
+    game.flow_field.set_obstacles(game.world.obstacle_map)
+    game.flow_field.clear()
+    game._rebuild_enemy_index()
+    if game.renderer is not None:
+        game.renderer.reset(world_changed)
+
+
+def _read_game(r: _Reader) -> dict:
+    state = dict(zip(_GAME_FIELDS, r.unpack(_GAME)))
+    stack_ids = r.names()
+    stacks = r.array(np.int64, len(stack_ids)).tolist()
+    state["upgrade_stacks"] = dict(zip(stack_ids, stacks))
+    state["upgrade_choices"] = r.names()
+    words = r.count()
+    rng_state = tuple(r.array(np.uint32, words).tolist())
+    has_gauss, gauss_next = r.unpack(_GAUSS)
+    state["rng"] = (3, rng_state, gauss_next if has_gauss else None)
+    return state
+
+
+def _read_classes(r: _Reader, count: int) -> list[type]:
+    return [ENEMY_CLASSES[code] for code in r.array(np.uint8, count).tolist()]
+
+
+def _read_enemies(r: _Reader) -> tuple:
+    look_count = r.count()
+    classes = _read_classes(r, look_count)
+    scales = r.array(np.uint8, look_count).tolist()
+    tints = [tuple(tint[:3]) if tint[3] else None for tint in r.array(np.uint8, look_count, (4,)).tolist()]
+    looks = list(zip(classes, scales, tints))
+    n = r.count()
+    look_index = r.array(np.uint16, n)
+    if n and int(look_index.max()) >= look_count:
+        raise IndexError("enemy look index out of range")
+    gem_counts = r.array(np.uint16, n).tolist()
+    uids = r.array(np.uint32, n).tolist()
+    shapes = {name: shape for name, shape, _ in EnemyPool.COLUMNS}
+    columns = {name: r.array(dtype, n, shapes[name]) for name, dtype in _ENEMY_COLUMNS}
+    return looks, look_index, gem_counts, uids, columns
+
+
+def _apply_enemies(game, looks, look_index, gem_counts, uids, stored) -> dict[int, int]:
+    # Objekty z ObjectPool bez reset() — vzhled a uid dostanou rovnou, stav pak sloupci
+    n = len(look_index)
+    look_frames = [_get_enemy_frames(scale, tint) for _, scale, tint in looks]
+    look_classes = np.array([_ENEMY_CODES[cls] for cls, _, _ in looks], dtype=np.uint8).reshape(-1)
+    row_classes = look_classes[look_index]
+    enemies = [None] * n
+    for code, cls in enumerate(ENEMY_CLASSES):
+        rows = np.flatnonzero(row_classes == code).tolist()
+        for row, enemy in zip(rows, game.enemy_pools[cls].acquire_bulk(len(rows), cls.blank)):
+            enemies[row] = enemy
+
+    uid_map = {}
+    look_list = look_index.tolist()
+    frames = stored["current_frame"].tolist()
+    for enemy, i, gem_count, uid, frame in zip(enemies, look_list, gem_counts, uids, frames):
+        # Snímky jsou sdílené v cache dle (měřítko, tint) — jedno vyhledání na vzhled
+        _, scale, tint = looks[i]
+        enemy.revive(scale, tint, look_frames[i], frame, gem_count)
+        uid_map[uid] = enemy.uid
+
+    # Neuložené sloupce: half_size z velikosti snímků, zbytek se dopočítá v update
+    half_sizes = np.array([(f[0].get_width() * 0.5, f[0].get_height() * 0.5) for f in look_frames]).reshape(-1, 2)
+    columns = {name: np.zeros((n,) + shape, dtype=dtype) for name, shape, dtype in EnemyPool.COLUMNS}
+    for name, values in stored.items():
+        columns[name][:] = values
+    columns["half_size"][:] = half_sizes[look_index]
+    pool = game.enemies
+    pool.add_rows(enemies, columns)
+    game.all_sprites.add(enemies)
+    pool.sync_views()
+    return uid_map
+
+
+def _read_projectiles(r: _Reader) -> tuple:
+    n = r.count()
+    floats = r.array(np.float64, n, (8,)).tolist()
+    ints = r.array(np.int64, n, (2,)).tolist()
+    hit_counts = r.array(np.int64, n).tolist()
+    hits = r.array(np.int64, sum(hit_counts)).tolist()
+    return floats, ints, hit_counts, hits
+
+
+def _apply_projectiles(game, floats, ints, hit_counts, hits, uid_map: dict[int, int]) -> None:
+    start = 0
+    for (x, y, px, py, vx, vy, lifetime, max_lifetime), (size, pierce), count in zip(floats, ints, hit_counts):
+        direction = pygame.math.Vector2(vx, vy)
+        speed = direction.length()
+        projectile = game.projectile_pool.acquire(
+            x, y, direction if speed else pygame.math.Vector2(1, 0), speed=speed or 1.0,
+            size=size, lifetime=max_lifetime, pierce=pierce,
+        )
+        projectile.prev_position.update(px, py)
+        projectile.velocity.update(vx, vy)
+        projectile._lifetime = lifetime
+        projectile._hit_enemies.update(uid_map[uid] for uid in hits[start:start + count] if uid in uid_map)
+        start += count
+        game.projectiles.add(projectile)
+        game.all_sprites.add(projectile)
+
+
+def _read_gems(r: _Reader) -> tuple:
+    n = r.count()
+    return r.array(np.float64, n, (2,)), r.array(np.int64, n), r.array(np.bool_, n)
+
+
+def _read_orbitals(r: _Reader) -> tuple:
+    n = r.count()
+    angles = r.array(np.float64, n).tolist()
+    counts = r.array(np.int64, n).tolist()
+    uids = r.array(np.int64, sum(counts)).tolist()
+    remaining = r.array(np.float64, sum(counts)).tolist()
+    return angles, counts, uids, remaining
+
+
+def _apply_orbitals(game, angles, counts, uids, remaining, uid_map: dict[int, int]) -> None:
+    start = 0
+    for angle, count in zip(angles, counts):
+        orb = OrbitalProjectile(angle)
+        for uid, left in zip(uids[start:start + count], remaining[start:start + count]):
+            if uid in uid_map:
+                orb._hit_cooldowns[uid_map[uid]] = left
+        start += count
+        orb.update(0.0, game.player.position)
+        game.orbital_projectiles.add(orb)
+
+
+def _read_hordes(r: _Reader) -> tuple[float, list[Horde]]:
+    n = r.count()
+    timer = r.unpack(_F64)[0]
+    heads = r.array(np.float64, n, (3,)).tolist()
+    sizes = r.array(np.int64, n).tolist()
+    classes = _read_classes(r, sum(sizes))
+    fractions = r.array(np.float64, sum(sizes)).tolist()
+    hordes = []
+    start = 0
+    for (x, y, speed_mult), size in zip(heads, sizes):
+        end = start + size
+        hordes.append(Horde(x, y, list(zip(classes[start:end], fractions[start:end])), speed_mult))
+        start = end
+    return timer, hordes
+
+
+# --- Rewind ---
+
+class SnapshotRing:
+    """Ring buffer of recent snapshots (bytes) for instant rewind.
+
+    `record(game, dt)` takes a snapshot every `interval` seconds of game
+    time; `rewind(game)` restores the newest one and drops it, so repeated
+    rewinds walk further back.
+    """
+
+    def __init__(self, capacity: int, interval: float) -> None:
+        self.interval = interval
+        self.timer = 0.0
+        self._snapshots: deque[bytes] = deque(maxlen=capacity)
+
+    def __len__(self) -> int:
+        return len(self._snapshots)
+
+    @property
+    def nbytes(self) -> int:
+        return sum(len(snapshot) for snapshot in self._snapshots)
+
+    def clear(self) -> None:
+        self._snapshots.clear()
+        self.timer = 0.0
+
+    def record(self, game, dt: float) -> None:
+        self.timer += dt
+        if self.timer >= self.interval:
+            self.timer = 0.0
+            self._snapshots.append(dump(game))
+
+    def rewind(self, game) -> bool:
+        """Obnoví nejnovější snímek; False, pokud žádný není."""
+        if not self._snapshots:
+            return False
+        restore(game, self._snapshots.pop())
+        self.timer = 0.0
+        return True
@@ -0,0 +1,177 @@
+"""BloodWar - Spatial index module.
+
+Per-frame snapshot of entity positions and half extents, indexed by a
+CellList. Built once per frame and shared by the systems that query
+enemies by area or distance (projectile hits, explosions, orbitals,
+player contact, targeting).
+"""
+
+from typing import Callable
+
+import numpy as np
+
+from src.cell_list import CellList
+
+
+class SpatialIndex:
+    """Cell-list index over a snapshot of entity positions.
+
+    Queries return snapshot indices into `items` / `positions`. Entities
+    killed after the build stay in the snapshot, so callers check alive().
+    """
+
+    def __init__(self, cell_size: float) -> None:
+        self.cells = CellList(cell_size)
+        self.clear()
+
+    def clear(self) -> None:
+        self.cells.clear()
+        self.items: list = []
+        self.positions = np.zeros((0, 2))
+        self.half_sizes = np.zeros((0, 2))
+        self.max_half = 0.0
+        self._bounds = np.zeros((2, 2))   # [min, max] pozic ve snapshotu
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def build(self, positions: np.ndarray, items: list, half_sizes: np.ndarray | None = None) -> None:
+        """Snapshot positions (copied) and items, then sort them into cells."""
+        self.items = list(items)
+        self.positions = np.array(positions, dtype=np.float64)
+        if half_sizes is None:
+            half_sizes = np.zeros_like(self.positions)
+        self.half_sizes = np.array(half_sizes, dtype=np.float64)
+        self.max_half = float(self.half_sizes.max()) if len(self.half_sizes) else 0.0
+        if len(self.positions):
+            self._bounds = np.array((self.positions.min(axis=0), self.positions.max(axis=0)))
+        self.cells.build(self.positions)
+
+    def query_rects(self, x0, y0, x1, y1) -> tuple[np.ndarray, np.ndarray]:
+        """Candidates whose extents may overlap each rect: (rect number, index) arrays."""
+        pad = self.max_half
+        return self.cells.query_rects(
+            np.asarray(x0) - pad, np.asarray(y0) - pad,
+            np.asarray(x1) + pad, np.asarray(y1) + pad,
+        )
+
+    def query_rect(self, x0: float, y0: float, x1: float, y1: float) -> np.ndarray:
+        """Snapshot indices of entities whose extents overlap the rect."""
+        _, idx = self.query_rects(np.array([x0]), np.array([y0]), np.array([x1]), np.array([y1]))
+        pos = self.positions[idx]
+        half = self.half_sizes[idx]
+        hit = (
+            (pos[:, 0] + half[:, 0] > x0) & (pos[:, 0] - half[:, 0] < x1)
+            & (pos[:, 1] + half[:, 1] > y0) & (pos[:, 1] - half[:, 1] < y1)
+        )
+        return idx[hit]
+
+    def items_in_rect(
+        self, x0: float, y0: float, x1: float, y1: float,
+        accept: Callable[[object], bool] | None = None,
+    ) -> list:
+        """Items whose extents overlap the rect (optionally filtered by accept)."""
+        items = self.items
+        found = [items[i] for i in self.query_rect(x0, y0, x1, y1).tolist()]
+        if accept is not None:
+            found = [item for item in found if accept(item)]
+        return found
+
+    def within_many(self, centers: np.ndarray, radius: float) -> tuple[np.ndarray, np.ndarray]:
+        """Entities whose position lies within radius of each center.
+
+        Returns (center number, index) arrays, grouped by center.
+        """
+        centers = np.asarray(centers, dtype=np.float64).reshape(-1, 2)
+        owner, idx = self.cells.query_rects(
+            centers[:, 0] - radius, centers[:, 1] - radius,
+            centers[:, 0] + radius, centers[:, 1] + radius,
+        )
+        diff = self.positions[idx] - centers[owner]
+        inside = diff[:, 0] * diff[:, 0] + diff[:, 1] * diff[:, 1] <= radius * radius
+        return owner[inside], idx[inside]
+
+    def within(self, pos, radius: float) -> np.ndarray:
+        """Snapshot indices of entities within radius of pos."""
+        return self.within_many(np.array([(pos[0], pos[1])]), radius)[1]
+
+    def k_nearest(self, pos, k: int, accept: Callable[[object], bool] | None = None) -> list[int]:
+        """Snapshot indices of the k nearest entities to pos, nearest first.
+
+        Expanding square search: the query square starts at one cell and
+        doubles until it holds k accepted entities within its inscribed
+        radius (or covers the whole snapshot). `accept(item)` filters
+        candidates, e.g. entities killed since the build.
+        """
+        if k <= 0 or not self.items:
+            return []
+        center = np.array([(pos[0], pos[1])], dtype=np.float64)
+        items = self.items
+        # Čtverec s touto polovinou strany už pokryje celý snapshot
+        reach = float(np.abs(self._bounds - center).max())
+        radius = self.cells.cell_size
+        while True:
+            _, idx = self.cells.query_rects(
+                center[:, 0] - radius, center[:, 1] - radius,
+                center[:, 0] + radius, center[:, 1] + radius,
+            )
+            diff = self.positions[idx] - center
+            dist_sq = diff[:, 0] * diff[:, 0] + diff[:, 1] * diff[:, 1]
+            exhaustive = radius >= reach
+            if not exhaustive:
+                # Mimo vepsaný kruh mohou existovat bližší entity v nedotazovaných buňkách
+                inside = dist_sq <= radius * radius
+                idx, dist_sq = idx[inside], dist_sq[inside]
+            found = []
+            for i in idx[np.argsort(dist_sq, kind="stable")].tolist():
+                if accept is None or accept(items[i]):
+                    found.append(i)
+                    if len(found) == k:
+                        return found
+            if exhaustive:
+                return found
+            radius *= 2.0
+
+    def nearest(self, pos, accept: Callable[[object], bool] | None = None) -> int | None:
+        """Snapshot index of the nearest (accepted) entity, or None."""
+        found = self.k_nearest(pos, 1, accept)
+        return found[0] if found else None
+
+    def sweep_boxes(
+        self, start: np.ndarray, end: np.ndarray, half: np.ndarray,
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Swept AABB test of moving boxes against the indexed extents.
+
+        start/end: (m, 2) box centers at the beginning/end of the step,
+        half: (m,) box half size. Returns (box, index, t) for every overlap,
+        t ∈ [0, 1] being the entry time along the path; sorted by box, then t.
+        """
+        lo = np.minimum(start, end) - half[:, None]
+        hi = np.maximum(start, end) + half[:, None]
+        box, idx = self.query_rects(lo[:, 0], lo[:, 1], hi[:, 0], hi[:, 1])
+        if len(box) == 0:
+            return box, idx, np.zeros(0)
+
+        # Minkowského součet: bod (střed boxu) proti obdélníku rozšířenému o half
+        p0 = start[box]
+        d = end[box] - p0
+        ext = self.half_sizes[idx] + half[box][:, None]
+        near = self.positions[idx] - ext - p0
+        far = self.positions[idx] + ext - p0
+        with np.errstate(divide="ignore", invalid="ignore"):
+            t_a = near / d
+            t_b = far / d
+        t_near = np.minimum(t_a, t_b)
+        t_far = np.maximum(t_a, t_b)
+        # Osa bez pohybu: uvnitř slabu = (-inf, inf), mimo = žádný zásah
+        still = d == 0
+        inside = (near < 0) & (far > 0)
+        t_near = np.where(still, np.where(inside, -np.inf, np.inf), t_near)
+        t_far = np.where(still, np.where(inside, np.inf, -np.inf), t_far)
+
+        t_enter = t_near.max(axis=1)
+        t_exit = t_far.min(axis=1)
+        hit = (t_enter < t_exit) & (t_exit > 0) & (t_enter <= 1)
+        box, idx, t = box[hit], idx[hit], np.maximum(t_enter[hit], 0.0)
+        order = np.lexsort((t, box))
+        return box[order], idx[order], t[order]
@@ -1,10 +1,6 @@
 """BloodWar - Spawner module."""
 
-import random
-
-import pygame
-
-from constants import SCREEN_WIDTH, SCREEN_HEIGHT, ENEMY_SIZE
+from constants import SCREEN_WIDTH, SCREEN_HEIGHT, ENEMY_SIZE, SPAWN_GROUP_STEP_SECONDS
 from enemy import Enemy, FastEnemy, TankEnemy
 
 
@@ -22,40 +18,52 @@ class Spawner:
             return Enemy
         elif elapsed < 120:
             # 60–120s — mix slimů a rychlých
-            return random.choice([Enemy, Enemy, FastEnemy])
+            return self.game.rng.choice([Enemy, Enemy, FastEnemy])
         else:
             # 120s+ — všechny typy včetně tanků
-            return random.choice([Enemy, FastEnemy, TankEnemy])
+            return self.game.rng.choice([Enemy, FastEnemy, TankEnemy])
 
     def _spawn_count(self) -> int:
-        """Počet nepřátel na jeden spawn — roste lineárně každou minutu."""
-        return 1 + int(self.game.elapsed_seconds // 60)
+        """Počet nepřátel na jeden spawn — roste lineárně (+1 za SPAWN_GROUP_STEP_SECONDS)."""
+        return 1 + int(self.game.elapsed_seconds // SPAWN_GROUP_STEP_SECONDS)
 
-    def _spawn_one(self) -> None:
-        """Spawnuje jednoho nepřítele na náhodném okraji obrazovky."""
+    def spawn_position(self) -> tuple[float, float]:
+        """Náhodný bod na spawn ringu — těsně za okrajem obrazovky."""
         cx = self.game.camera_x
         cy = self.game.camera_y
-        side = random.randint(0, 3)
+        side = self.game.rng.randint(0, 3)
 
         if side == 0:  # Top
-            x = cx + random.randint(0, SCREEN_WIDTH)
+            x = cx + self.game.rng.randint(0, SCREEN_WIDTH)
             y = cy - ENEMY_SIZE
         elif side == 1:  # Bottom
-            x = cx + random.randint(0, SCREEN_WIDTH)
+            x = cx + self.game.rng.randint(0, SCREEN_WIDTH)
             y = cy + SCREEN_HEIGHT + ENEMY_SIZE
         elif side == 2:  # Left
             x = cx - ENEMY_SIZE
-            y = cy + random.randint(0, SCREEN_HEIGHT)
+            y = cy + self.game.rng.randint(0, SCREEN_HEIGHT)
         else:  # Right
             x = cx + SCREEN_WIDTH + ENEMY_SIZE
-            y = cy + random.randint(0, SCREEN_HEIGHT)
+            y = cy + self.game.rng.randint(0, SCREEN_HEIGHT)
+        return x, y
 
+    def _spawn_one(self) -> None:
+        """Spawnuje jednoho nepřítele na náhodném okraji obrazovky."""
+        x, y = self.spawn_position()
         EnemyClass = self._pick_enemy_class()
-        enemy = EnemyClass(x, y, elapsed_seconds=self.game.elapsed_seconds)
+        enemy = self.game.enemy_pools[EnemyClass].acquire(x, y, elapsed_seconds=self.game.elapsed_seconds)
         self.game.enemies.add(enemy)
         self.game.all_sprites.add(enemy)
 
     def spawn_enemy(self) -> None:
-        """Spawnuje skupinu nepřátel — počet roste lineárně s časem."""
-        for _ in range(self._spawn_count()):
+        """Spawnuje skupinu nepřátel — počet roste lineárně s časem.
+
+        Above the population cap the farthest enemies are moved to the
+        spawn ring instead, so spawn pressure is kept without new entities.
+        """
+        count = self._spawn_count()
+        room = self.game.population.room(count)
+        for _ in range(room):
             self._spawn_one()
+        if room < count:
+            self.game.population.recycle_farthest(count - room)
@@ -1,18 +1,74 @@
 """BloodWar - Sprite caching module.
 
-Centralized sprite caching for enemies to avoid repeated loading and scaling.
+Centralized sprite caching for enemies, projectiles, gems, orbitals, the
+ice aura and HP bars to avoid repeated loading, scaling and drawing.
+Each cache is a bounded LRU with hit/miss counters (see cache_stats()).
 """
 
+from collections import OrderedDict
+from typing import Callable
+
 import pygame
-from typing import Optional
 
+from constants import GEM_SIZE, GREEN
+
+from src.assets import get_assets
+
+
+class SurfaceCache:
+    """Keyed LRU cache of surfaces (or lists of surfaces) with hit/miss counters."""
+
+    def __init__(self, name: str, max_entries: int) -> None:
+        self.name = name
+        self.max_entries = max_entries
+        self._entries: OrderedDict = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        _caches.append(self)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key, factory: Callable[[], object]):
+        """Return the cached value for key, creating it with factory() on a miss."""
+        entries = self._entries
+        value = entries.get(key)
+        if value is not None:
+            self.hits += 1
+            entries.move_to_end(key)
+            return value
+        self.misses += 1
+        value = entries[key] = factory()
+        if len(entries) > self.max_entries:
+            entries.popitem(last=False)
+        return value
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+
+_caches: list[SurfaceCache] = []
+
+# Frame cache (zvětšené sheety drží src/assets.py)
+# (scale, tint) -> 2 frames; tint se mění s časem, proto LRU strop
+_sprite_cache = SurfaceCache("enemy_frames", 256)
+
+# Projectile surface cache: (size, color) -> surface
+_projectile_cache = SurfaceCache("projectiles", 32)
+
+# HP bar atlas: (width, levels) -> list of bar surfaces indexed by fill level
+_hp_bar_cache = SurfaceCache("hp_bars", 32)
 
-# Module-level sprite sheet (loaded once on first use) and frame cache
-_sprite_sheet: Optional[pygame.Surface] = None
-_sprite_cache: dict[tuple[int, tuple], list[pygame.Surface]] = {}
+# Gemy, orbitály a ledová aura (poloměr aury roste upgradem)
+_gem_cache = SurfaceCache("gems", 8)
+_orbital_cache = SurfaceCache("orbitals", 8)
+_aura_cache = SurfaceCache("aura", 8)
 
-# Projectile surface cache: size -> surface
-_projectile_cache: dict[int, pygame.Surface] = {}
+HP_BAR_HEIGHT = 4
+HP_BAR_BACK = (60, 0, 0)
+HP_BAR_FILL = (220, 50, 50)
 
 
 def _get_enemy_frames(anim_scale: int, color_tint: tuple | None) -> list[pygame.Surface]:
@@ -25,35 +81,22 @@ def _get_enemy_frames(anim_scale: int, color_tint: tuple | None) -> list[pygame.
     Returns:
         List of 2 pygame.Surface objects (the 2 animation frames)
     """
-    global _sprite_sheet, _sprite_cache
-    
-    key = (anim_scale, color_tint)
-    cached = _sprite_cache.get(key)
-    if cached is not None:
-        return cached
+    return _sprite_cache.get((anim_scale, color_tint), lambda: _build_enemy_frames(anim_scale, color_tint))
 
-    if _sprite_sheet is None:
-        _sprite_sheet = pygame.image.load("image/slime.png").convert()
-        _sprite_sheet.set_colorkey((0, 0, 0))
 
-    sheet = _sprite_sheet
+def _build_enemy_frames(anim_scale: int, color_tint: tuple | None) -> list[pygame.Surface]:
+    # Sheet zvětšený jednou za běh (src/assets.py), snímky jsou jeho výřezy
+    sheet = get_assets().scaled("slime.png", anim_scale)
     frame_width = sheet.get_width() // 2
     frame_height = sheet.get_height()
-    scaled_w = frame_width * anim_scale
-    scaled_h = frame_height * anim_scale
 
     frames = []
     for col in range(2):
-        frame = sheet.subsurface(
-            pygame.Rect(col * frame_width, 0, frame_width, frame_height)
-        )
-        scaled = pygame.transform.scale(frame, (scaled_w, scaled_h))
+        frame = sheet.subsurface(pygame.Rect(col * frame_width, 0, frame_width, frame_height))
         if color_tint is not None:
-            scaled = scaled.copy()
-            scaled.fill(color_tint, special_flags=pygame.BLEND_RGB_MULT)
-        frames.append(scaled)
-
-    _sprite_cache[key] = frames
+            frame = frame.copy()
+            frame.fill(color_tint, special_flags=pygame.BLEND_RGB_MULT)
+        frames.append(frame)
     return frames
 
 
@@ -67,20 +110,102 @@ def _get_projectile_surface(size: int, color: tuple) -> pygame.Surface:
     Returns:
         pygame.Surface object
     """
-    key = (size, color)
-    cached = _projectile_cache.get(key)
-    if cached is not None:
-        return cached
+    def build() -> pygame.Surface:
+        surface = pygame.Surface((size, size))
+        surface.fill(color)
+        return surface
+
+    return _projectile_cache.get((size, color), build)
+
+
+def _get_hp_bars(width: int, levels: int) -> list[pygame.Surface]:
+    """Return cached HP bar surfaces for one bar width.
+
+    Args:
+        width: Bar width in pixels (= enemy sprite width)
+        levels: Number of fill levels; index 0 is empty, `levels` is full
+
+    Returns:
+        List of levels + 1 pygame.Surface objects
+    """
+    def build() -> list[pygame.Surface]:
+        bars = []
+        for level in range(levels + 1):
+            surface = pygame.Surface((width, HP_BAR_HEIGHT))
+            surface.fill(HP_BAR_BACK)
+            fill = round(width * level / levels)
+            if fill > 0:
+                surface.fill(HP_BAR_FILL, (0, 0, fill, HP_BAR_HEIGHT))
+            bars.append(surface)
+        return bars
+
+    return _hp_bar_cache.get((width, levels), build)
+
+
+def _get_gem_surface(size: int = GEM_SIZE, color: tuple = GREEN) -> pygame.Surface:
+    """Return cached gem surface - coloured disc with an opaque black centre.
+
+    Args:
+        size: Outer radius in pixels
+        color: RGB color of the outer disc
+
+    Returns:
+        pygame.Surface object (SRCALPHA, shared by all gems)
+    """
+    def build() -> pygame.Surface:
+        surface = pygame.Surface((size * 2, size * 2), pygame.SRCALPHA)
+        pygame.draw.circle(surface, color, (size, size), size)
+        pygame.draw.circle(surface, (0, 0, 0), (size, size), size // 2)
+        return surface
+
+    return _gem_cache.get((size, color), build)
+
+
+def _get_orbital_surface(radius: int, color: tuple) -> pygame.Surface:
+    """Return cached orbital projectile surface (filled circle).
+
+    Args:
+        radius: Circle radius in pixels
+        color: RGB color
+
+    Returns:
+        pygame.Surface object (SRCALPHA, shared by all orbitals)
+    """
+    def build() -> pygame.Surface:
+        surface = pygame.Surface((radius * 2, radius * 2), pygame.SRCALPHA)
+        pygame.draw.circle(surface, color, (radius, radius), radius)
+        return surface
+
+    return _orbital_cache.get((radius, color), build)
+
+
+def _get_aura_surface(radius: int) -> pygame.Surface:
+    """Return cached ice aura surface for given radius.
+
+    Args:
+        radius: Aura radius in pixels
+
+    Returns:
+        pygame.Surface object (SRCALPHA, translucent disc with a rim)
+    """
+    def build() -> pygame.Surface:
+        surface = pygame.Surface((radius * 2, radius * 2), pygame.SRCALPHA)
+        pygame.draw.circle(surface, (100, 180, 255, 35), (radius, radius), radius)
+        pygame.draw.circle(surface, (150, 220, 255, 90), (radius, radius), radius, 2)
+        return surface
+
+    return _aura_cache.get(radius, build)
+
 
-    surface = pygame.Surface((size, size))
-    surface.fill(color)
-    _projectile_cache[key] = surface
-    return surface
+def cache_stats() -> dict[str, dict[str, int]]:
+    """Hit/miss counters and sizes of all sprite caches."""
+    return {
+        cache.name: {"hits": cache.hits, "misses": cache.misses, "entries": len(cache)}
+        for cache in _caches
+    }
 
 
 def clear_cache() -> None:
     """Clear all cached sprites. Useful for testing or memory management."""
-    global _sprite_sheet, _sprite_cache, _projectile_cache
-    _sprite_sheet = None
-    _sprite_cache.clear()
-    _projectile_cache.clear()
+    for cache in _caches:
+        cache.clear()
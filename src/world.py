@@ -0,0 +1,289 @@
+"""BloodWar - Streaming world module.
+
+Neomezený svět složený z chunků (WorldGenerator). Vygenerované chunky drží
+LRU (WORLD_CHUNK_CACHE), upečená pozadí vlastní menší LRU
+(WORLD_BACKGROUND_CACHE) — paměť je konstantní, ať hráč dojde kamkoli.
+Kolem hráče je aktivní okno (2 * WORLD_ACTIVE_RADIUS + 1)² chunků: jeho
+stromy a mapa překážek se přestaví jen při přechodu hráče do jiného chunku.
+S threaded=True generuje vlákno na pozadí chunky (a pozadí) ve směru pohybu
+hráče dřív, než je hra potřebuje, a staví i nové aktivní okno — do té doby
+platí staré, které hráče v sousedním chunku pořád pokrývá.
+"""
+
+import math
+import queue
+import threading
+from collections import OrderedDict
+
+import pygame
+
+from constants import (
+    SCREEN_WIDTH, SCREEN_HEIGHT, WORLD_SPAWN_X, WORLD_SPAWN_Y,
+    WORLD_ACTIVE_RADIUS, WORLD_PREFETCH_DISTANCE, WORLD_CHUNK_CACHE, WORLD_BACKGROUND_CACHE,
+)
+from src.background_cache import bake_chunk
+from src.obstacle_map import ObstacleMap
+from src.world_generator import Chunk, WorldGenerator
+
+_WINDOW_CACHE = 4   # naposledy použitá aktivní okna — přešlapování přes hranu chunku nic nestojí
+
+
+class World:
+    """Chunk store with LRU eviction, an active window and a prefetch worker.
+
+    `chunk(key)` returns a chunk, generating it on the main thread on a
+    miss (counted in `sync_loads` — with prefetch working this stays at the
+    initial window). `trees` and `obstacle_map` describe the active window
+    around the player; `version` changes whenever they do. Without the
+    worker the window follows the player synchronously, so headless runs
+    stay deterministic. Backgrounds are baked only for chunks that get
+    drawn or prefetched, never in headless simulations.
+    """
+
+    def __init__(
+        self, seed: int, grass_tile: pygame.Surface, threaded: bool = False,
+        spawn: tuple[float, float] = (WORLD_SPAWN_X, WORLD_SPAWN_Y),
+        chunk_cache: int = WORLD_CHUNK_CACHE, background_cache: int = WORLD_BACKGROUND_CACHE,
+    ) -> None:
+        self.seed = seed
+        self.generator = WorldGenerator(seed, spawn)
+        self.chunk_px = self.generator.chunk_px
+        self.grass_tile = grass_tile
+        self.chunk_cache = chunk_cache
+        self.background_cache = background_cache
+        self.radius = WORLD_ACTIVE_RADIUS
+        self._lock = threading.Lock()   # chunky a pozadí sdílí hlavní vlákno s workerem
+        self._chunks: OrderedDict[tuple[int, int], Chunk] = OrderedDict()
+        self._backgrounds: OrderedDict[tuple[int, int], None] = OrderedDict()   # klíče chunků s pozadím
+        self._windows: OrderedDict[tuple[int, int], tuple] = OrderedDict()
+        self._ready: dict[tuple[int, int], tuple] = {}   # okna postavená workerem
+        self._active_keys: frozenset[tuple[int, int]] = frozenset()
+
+        # Statistiky
+        self.generated = 0
+        self.evicted = 0
+        self.sync_loads = 0        # chunky vygenerované až v hlavním vlákně (prefetch nestihl)
+        self.sync_bakes = 0
+        self.prefetched = 0
+        self.windows_built = 0
+
+        # Prefetch — fronta (druh, klíč) pro worker; hodnota v _queued = péct i pozadí
+        self._queue: queue.SimpleQueue | None = None
+        self._queued: dict[tuple[int, int], bool] = {}
+        self._window_requested: tuple[int, int] | None = None
+        self._ahead: tuple[int, int] | None = None
+        self._thread: threading.Thread | None = None
+        if threaded:
+            self._queue = queue.SimpleQueue()
+            self._thread = threading.Thread(target=self._worker, name="world-prefetch", daemon=True)
+            self._thread.start()
+
+        # Aktivní okno kolem spawnu
+        self.center: tuple[int, int] | None = None
+        self.version = 0
+        self.trees = pygame.sprite.Group()
+        self.obstacle_map: ObstacleMap | None = None
+        self.update(*spawn)
+
+    def close(self) -> None:
+        """Ukončí prefetch vlákno (svět jde dál použít bez něj)."""
+        if self._thread is not None:
+            self._queue.put(None)
+            self._thread = None
+
+    def chunk_of(self, x: float, y: float) -> tuple[int, int]:
+        return math.floor(x / self.chunk_px), math.floor(y / self.chunk_px)
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "chunks": len(self._chunks),
+            "backgrounds": len(self._backgrounds),
+            "generated": self.generated,
+            "evicted": self.evicted,
+            "sync_loads": self.sync_loads,
+            "sync_bakes": self.sync_bakes,
+            "prefetched": self.prefetched,
+            "windows_built": self.windows_built,
+        }
+
+    # --- Chunky (LRU) ---
+
+    def chunk(self, key: tuple[int, int]) -> Chunk:
+        """Chunk z cache; při chybění ho vygeneruje hned (v hlavním vlákně)."""
+        return self._load(key, sync=True)
+
+    def _load(self, key: tuple[int, int], sync: bool) -> Chunk:
+        with self._lock:
+            chunk = self._chunks.get(key)
+            if chunk is not None:
+                self._chunks.move_to_end(key)
+                return chunk
+        chunk = self.generator.generate_chunk(*key)
+        with self._lock:
+            if sync:
+                self.sync_loads += 1
+            else:
+                self.prefetched += 1
+            return self._store(chunk)
+
+    def _store(self, chunk: Chunk) -> Chunk:
+        """Vloží chunk (zámek držený); vyhrává ten, kdo byl první."""
+        chunks = self._chunks
+        existing = chunks.get(chunk.key)
+        if existing is not None:
+            chunks.move_to_end(chunk.key)
+            return existing
+        chunks[chunk.key] = chunk
+        self.generated += 1
+        # LRU — nejdéle nepoužité, kromě chunků aktivního okna
+        while len(chunks) > self.chunk_cache:
+            victim = next((key for key in chunks if key not in self._active_keys), None)
+            if victim is None:
+                break
+            del chunks[victim]
+            self._backgrounds.pop(victim, None)
+            self.evicted += 1
+        return chunk
+
+    def background(self, key: tuple[int, int]) -> pygame.Surface:
+        """Upečené pozadí chunku; pokud ho prefetch nestihl, upeče se hned."""
+        chunk = self.chunk(key)
+        surface = chunk.background
+        if surface is None:
+            surface = bake_chunk(chunk, self.grass_tile, self.generator.chunk_tiles)
+            self.sync_bakes += 1
+        with self._lock:
+            return self._set_background(chunk, surface)
+
+    def _set_background(self, chunk: Chunk, surface: pygame.Surface) -> pygame.Surface:
+        """Uloží pozadí do LRU (zámek držený); nejstarší pozadí se zahodí."""
+        if chunk.background is None:
+            chunk.background = surface
+        backgrounds = self._backgrounds
+        backgrounds[chunk.key] = None
+        backgrounds.move_to_end(chunk.key)
+        while len(backgrounds) > self.background_cache:
+            victim, _ = backgrounds.popitem(last=False)
+            evicted = self._chunks.get(victim)
+            if evicted is not None:
+                evicted.background = None
+        return chunk.background
+
+    # --- Aktivní okno ---
+
+    def update(self, x: float, y: float, vx: float = 0.0, vy: float = 0.0) -> bool:
+        """Posune aktivní okno za hráčem a naplánuje prefetch; True = okno se změnilo."""
+        if self._thread is None:
+            return self.activate(x, y)
+        changed = self._activate_async(x, y)
+        self._prefetch(x, y, vx, vy)
+        return changed
+
+    def _activate_async(self, x: float, y: float) -> bool:
+        """Jako activate(), ale nové okno staví worker; do sousedního chunku stačí staré."""
+        center = self.chunk_of(x, y)
+        if center == self.center:
+            return False
+        with self._lock:
+            ready = self._ready.pop(center, None)
+        if ready is not None:
+            self._windows[center] = ready
+        elif center not in self._windows and self.center is not None \
+                and max(abs(center[0] - self.center[0]), abs(center[1] - self.center[1])) <= 1:
+            if self._window_requested != center:
+                self._window_requested = center
+                self._queue.put(("window", center))
+            return False
+        return self.activate(x, y)
+
+    def activate(self, x: float, y: float) -> bool:
+        """Aktivní okno kolem chunku pod (x, y), postavené hned; True = změnilo se."""
+        center = self.chunk_of(x, y)
+        if center == self.center:
+            return False
+        window = self._windows.get(center)
+        if window is None:
+            window = self._windows[center] = self._build_window(center)
+            if len(self._windows) > _WINDOW_CACHE:
+                self._windows.popitem(last=False)
+        else:
+            self._windows.move_to_end(center)
+            for key in window[0]:
+                self.chunk(key)   # dotknout se v LRU (případně znovu vygenerovat)
+        self._active_keys, self.trees, self.obstacle_map = window
+        self.center = center
+        self.version += 1
+        return True
+
+    def _build_window(self, center: tuple[int, int], sync: bool = True) -> tuple:
+        """(klíče chunků, stromy, ObstacleMap) okna kolem chunku `center`."""
+        r = self.radius
+        keys = frozenset((center[0] + dx, center[1] + dy) for dy in range(-r, r + 1) for dx in range(-r, r + 1))
+        # Pevné pořadí — mapa překážek i pořadí stromů nezávisí na hashování
+        chunks = [self._load(key, sync) for key in sorted(keys, key=lambda k: (k[1], k[0]))]
+        water_tiles = set().union(*(chunk.water_tiles for chunk in chunks))
+        trees = pygame.sprite.Group([tree for chunk in chunks for tree in chunk.trees])
+        n = self.generator.chunk_tiles
+        size = (2 * r + 1) * n
+        origin = ((center[0] - r) * n, (center[1] - r) * n)
+        self.windows_built += 1
+        return keys, trees, ObstacleMap(size, size, water_tiles, trees, origin)
+
+    # --- Prefetch ---
+
+    def _prefetch(self, x: float, y: float, vx: float, vy: float) -> None:
+        """Naplánuje okno kolem bodu WORLD_PREFETCH_DISTANCE před hráčem (jen při změně chunku)."""
+        speed = math.hypot(vx, vy)
+        if speed > 0:
+            x += vx / speed * WORLD_PREFETCH_DISTANCE
+            y += vy / speed * WORLD_PREFETCH_DISTANCE
+        ahead = self.chunk_of(x, y)
+        if ahead == self._ahead:
+            return
+        self._ahead = ahead
+        # Pozadí jen pro chunky, které by byly v záběru kolem bodu před hráčem
+        bake_x = range(math.floor((x - SCREEN_WIDTH / 2) / self.chunk_px),
+                       math.floor((x + SCREEN_WIDTH / 2) / self.chunk_px) + 1)
+        bake_y = range(math.floor((y - SCREEN_HEIGHT / 2) / self.chunk_px),
+                       math.floor((y + SCREEN_HEIGHT / 2) / self.chunk_px) + 1)
+        r = self.radius
+        for dy in range(-r, r + 1):
+            for dx in range(-r, r + 1):
+                key = (ahead[0] + dx, ahead[1] + dy)
+                self._request(key, key[0] in bake_x and key[1] in bake_y)
+
+    def _request(self, key: tuple[int, int], bake: bool) -> None:
+        with self._lock:
+            chunk = self._chunks.get(key)
+            if chunk is not None and (not bake or chunk.background is not None):
+                return
+            if key in self._queued:
+                self._queued[key] |= bake
+                return
+            self._queued[key] = bake
+        self._queue.put(("chunk", key))
+
+    def _worker(self) -> None:
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            kind, key = item
+            if kind == "window":
+                window = self._build_window(key, sync=False)
+                with self._lock:
+                    self._ready = {key: window}   # starší nevyzvednutá okna už nejsou potřeba
+                continue
+            with self._lock:
+                bake = self._queued.pop(key, False)
+                ahead = self._ahead
+                chunk = self._chunks.get(key)
+            # Hráč mezitím změnil směr — požadavky mimo nové okno se zahodí
+            if ahead is not None and max(abs(key[0] - ahead[0]), abs(key[1] - ahead[1])) > self.radius:
+                continue
+            if chunk is None:
+                chunk = self._load(key, sync=False)
+            if bake and chunk.background is None:
+                surface = bake_chunk(chunk, self.grass_tile, self.generator.chunk_tiles)
+                with self._lock:
+                    self._set_background(chunk, surface)
@@ -1,119 +1,130 @@
 """BloodWar - World generation module.
 
-Handles world generation including water tiles and trees.
+Svět je neomezený a dělí se na chunky WORLD_CHUNK_TILES × WORLD_CHUNK_TILES
+dlaždic. Obsah chunku (jezera a stromy) je čistá funkce (seed, chunk_x,
+chunk_y) — nezávisí na pořadí generování ani na sousedních chuncích, takže
+chunk lze kdykoli zahodit a později vygenerovat znovu stejný.
 """
 
 import random
-from typing import Set
 
 import pygame
 
 from constants import (
-    WORLD_WIDTH, WORLD_HEIGHT,
-    TILE_SIZE, TILESET_SCALE,
+    TILE_SIZE, TILESET_SCALE, TREE_WIDTH, TREE_HEIGHT,
+    WORLD_SPAWN_X, WORLD_SPAWN_Y, WORLD_CHUNK_TILES, WORLD_CHUNK_LAKE_CHANCE, WORLD_CHUNK_TREES,
 )
+from items import Tree
+
+# Rozměry jezer v dlaždicích
+LAKE_SIZES = [
+    (2, 2), (2, 3), (3, 2),                    # malé
+    (3, 4), (4, 3), (4, 4), (5, 3), (3, 5),   # střední
+    (6, 4), (4, 6), (7, 5), (5, 7),            # velká jezírka
+]
+
+
+class Chunk:
+    """Generated content of one chunk.
+
+    `water_tiles` holds world (col, row) tiles; `background` is the baked
+    grass/water surface, filled lazily only when something draws the chunk.
+    """
+
+    __slots__ = ("key", "water_tiles", "trees", "background")
+
+    def __init__(self, key: tuple[int, int], water_tiles: set[tuple[int, int]], trees: list[Tree]) -> None:
+        self.key = key
+        self.water_tiles = water_tiles
+        self.trees = trees
+        self.background: pygame.Surface | None = None
 
 
 class WorldGenerator:
-    """Handles world generation - water tiles and trees."""
-    
-    def __init__(self, seed: int = 42) -> None:
-        """Initialize world generator with optional seed.
-        
-        Args:
-            seed: Random seed for reproducible world generation
-        """
-        self._rng = random.Random(seed)
-        self._water_tiles: Set[tuple[int, int]] = set()
-    
-    @property
-    def water_tiles(self) -> Set[tuple[int, int]]:
-        """Return set of water tile coordinates (col, row)."""
-        return self._water_tiles
-    
-    def generate_water(self, spawn_col: int, spawn_row: int) -> None:
-        """Generate water bodies (lakes) in the world.
-        
-        Creates rectangular lakes with at least 1-tile gap between them.
-        Lakes are not generated near the spawn area.
-        
-        Args:
-            spawn_col: World column of player spawn
-            spawn_row: World row of player spawn
-        """
-        tile_px = TILE_SIZE * TILESET_SCALE
-        world_tw = WORLD_WIDTH // tile_px
-        world_th = WORLD_HEIGHT // tile_px
-        
-        size_pool = [
-            (2, 2), (2, 3), (3, 2),                    # malé
-            (3, 4), (4, 3), (4, 4), (5, 3), (3, 5),   # střední
-            (6, 4), (4, 6), (7, 5), (5, 7),            # velká jezírka
-        ]
-        
-        for _ in range(30):
-            w, h = self._rng.choice(size_pool)
-            cx = self._rng.randint(2, world_tw - w - 2)
-            cy = self._rng.randint(2, world_th - h - 2)
-            
-            # Skip if near spawn
-            if abs(cx + w // 2 - spawn_col) < 10 and abs(cy + h // 2 - spawn_row) < 10:
-                continue
-            
-            # Check 1-tile border around new rectangle
-            if any((tx, ty) in self._water_tiles
-                   for ty in range(cy - 1, cy + h + 1)
-                   for tx in range(cx - 1, cx + w + 1)):
-                continue
-            
-            # Add water tiles
-            for ty in range(cy, cy + h):
-                for tx in range(cx, cx + w):
-                    self._water_tiles.add((tx, ty))
-    
-    def generate_trees(
-        self,
-        player_position: pygame.math.Vector2,
-        tree_count: int = 200,
-    ) -> list[tuple[int, int]]:
-        """Generate trees in the world, avoiding water and spawn area.
-        
+    """Deterministic per-chunk generator of lakes and trees.
+
+    Lakes keep a 1-tile margin inside their chunk and tree footprints stay
+    inside it too, so neighbouring chunks never interact (lakes of adjacent
+    chunks are at least 2 tiles apart, water autotiling never looks outside
+    the chunk). Nothing is generated near the spawn point.
+    """
+
+    def __init__(self, seed: int = 42, spawn: tuple[float, float] = (WORLD_SPAWN_X, WORLD_SPAWN_Y)) -> None:
+        """Initialize world generator.
+
         Args:
-            player_position: Player spawn position in world coordinates
-            tree_count: Number of trees to generate
-            
-        Returns:
-            List of (x, y) world coordinates for tree positions
+            seed: World seed; the same seed always yields the same world
+            spawn: Player spawn position in world coordinates (kept clear)
         """
-        tile_px = TILE_SIZE * TILESET_SCALE
-        tree_positions: list[tuple[int, int]] = []
-        
-        # TREE_WIDTH and TREE_HEIGHT in tiles
-        tree_width_tiles = 2
-        tree_height_tiles = 3
-        
-        for _ in range(tree_count * 2):  # Try more times to find valid positions
-            if len(tree_positions) >= tree_count:
-                break
-                
-            x = self._rng.randint(100, WORLD_WIDTH - 100)
-            y = self._rng.randint(100, WORLD_HEIGHT - 100)
-            
+        self.seed = seed
+        self.spawn = pygame.math.Vector2(spawn)
+        self.tile_px = TILE_SIZE * TILESET_SCALE
+        self.chunk_tiles = WORLD_CHUNK_TILES
+        self.chunk_px = WORLD_CHUNK_TILES * self.tile_px
+
+    def chunk_rng(self, chunk_x: int, chunk_y: int) -> random.Random:
+        """RNG chunku — seedování řetězcem jde přes SHA-512, stejné v každém procesu."""
+        return random.Random(f"{self.seed}:{chunk_x}:{chunk_y}")
+
+    def generate_chunk(self, chunk_x: int, chunk_y: int) -> Chunk:
+        """Vygeneruje jezero a stromy chunku (bez vedlejších efektů — lze volat z vlákna)."""
+        rng = self.chunk_rng(chunk_x, chunk_y)
+        water_tiles = self._generate_water(rng, chunk_x, chunk_y)
+        trees = self._generate_trees(rng, chunk_x, chunk_y, water_tiles)
+        return Chunk((chunk_x, chunk_y), water_tiles, trees)
+
+    def _generate_water(self, rng: random.Random, chunk_x: int, chunk_y: int) -> set[tuple[int, int]]:
+        """Nejvýš jedno obdélníkové jezero s 1-tile okrajem uvnitř chunku; ne u spawnu."""
+        water_tiles: set[tuple[int, int]] = set()
+        # Losuje se vždy stejný počet čísel — obsah nezávisí na tom, zda jezero vzniklo
+        chance = rng.random()
+        w, h = rng.choice(LAKE_SIZES)
+        n = self.chunk_tiles
+        col0 = chunk_x * n + rng.randint(1, n - w - 1)
+        row0 = chunk_y * n + rng.randint(1, n - h - 1)
+        if chance >= WORLD_CHUNK_LAKE_CHANCE:
+            return water_tiles
+
+        spawn_col = int(self.spawn.x // self.tile_px)
+        spawn_row = int(self.spawn.y // self.tile_px)
+        if abs(col0 + w // 2 - spawn_col) < 10 and abs(row0 + h // 2 - spawn_row) < 10:
+            return water_tiles
+
+        for row in range(row0, row0 + h):
+            for col in range(col0, col0 + w):
+                water_tiles.add((col, row))
+        return water_tiles
+
+    def _generate_trees(
+        self, rng: random.Random, chunk_x: int, chunk_y: int, water_tiles: set[tuple[int, int]],
+    ) -> list[Tree]:
+        """Stromy celé uvnitř chunku — ne ve vodě a ne u spawnu hráče."""
+        tile_px = self.tile_px
+        x0 = chunk_x * self.chunk_px
+        y0 = chunk_y * self.chunk_px
+        tree_w = TREE_WIDTH * tile_px
+        tree_h = TREE_HEIGHT * tile_px
+        trees: list[Tree] = []
+
+        for _ in range(WORLD_CHUNK_TREES):
+            # (x, y) = levý dolní roh stromu
+            x = rng.randint(x0, x0 + self.chunk_px - tree_w)
+            y = rng.randint(y0 + tree_h, y0 + self.chunk_px)
+
             # Skip if near player spawn
-            if player_position.distance_to(pygame.math.Vector2(x, y)) < 200:
+            if self.spawn.distance_to((x, y)) < 200:
                 continue
-            
-            # Check if tree area (2×3 tiles) overlaps with water
+
+            # Check if tree area (TREE_WIDTH × TREE_HEIGHT tiles) overlaps with water
             tc0 = x // tile_px
-            tc1 = (x + tree_width_tiles * tile_px - 1) // tile_px
-            tr0 = (y - tree_height_tiles * tile_px) // tile_px
+            tc1 = (x + tree_w - 1) // tile_px
+            tr0 = (y - tree_h) // tile_px
             tr1 = (y - 1) // tile_px
-            
-            if any((tc, tr) in self._water_tiles
+            if any((tc, tr) in water_tiles
                    for tr in range(tr0, tr1 + 1)
                    for tc in range(tc0, tc1 + 1)):
                 continue
-            
-            tree_positions.append((x, y))
-        
-        return tree_positions
+
+            trees.append(Tree(x, y))
+
+        return trees
@@ -0,0 +1,19 @@
+"""Společné nastavení testů: headless pygame a kořen repozitáře (assety z image/)."""
+
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+
+@pytest.fixture(autouse=True)
+def repo_root(monkeypatch):
+    """Assety se načítají relativně ke kořeni repozitáře."""
+    monkeypatch.chdir(ROOT)
@@ -0,0 +1,17 @@
+"""Dotazy ObstacleMap nad oknem dlaždic (src/obstacle_map.py)."""
+
+import numpy as np
+
+from src.obstacle_map import ObstacleMap
+
+
+def test_blocked_at_marks_water_and_ignores_positions_outside_window():
+    obstacle_map = ObstacleMap(4, 4, water_tiles={(3, 2)}, trees=[], origin=(2, 1))
+    tile = obstacle_map.tile_px
+    positions = np.array([
+        (3.5 * tile, 2.5 * tile),     # voda
+        (2.5 * tile, 1.5 * tile),     # volná dlaždice v okně
+        (3.5 * tile, -5.0 * tile),    # mimo okno
+        (-0.5 * tile, 2.5 * tile),    # mimo okno (záporná dlaždice)
+    ])
+    np.testing.assert_array_equal(obstacle_map.blocked_at(positions), [True, False, False, False])
@@ -0,0 +1,83 @@
+"""Round-trip snímků stavu hry (src/snapshot.py)."""
+
+import numpy as np
+import pytest
+
+from src import snapshot
+from src.simulation import Simulation
+
+# Pozice nepřátel se ukládají jako float32 — po pár sekundách hry drží pod pixelem
+POSITION_TOLERANCE = 0.05
+
+
+def _simulation(seed: int = 3, frames: int = 600) -> Simulation:
+    sim = Simulation(seed=seed)
+    for _ in range(frames):
+        sim.step()
+    return sim
+
+
+def _state(game) -> dict:
+    n = game.enemies.count
+    return {
+        "counts": (n, len(game.projectiles), len(game.gems), len(game.orbital_projectiles)),
+        "progress": (game.frame_count, game.kills, game.xp, game.level, game.player.hp),
+        "player": (game.player.position.x, game.player.position.y),
+        "enemies": game.enemies.position[:n].copy(),
+        "rng": game.rng.getstate(),
+    }
+
+
+def _assert_same(restored: dict, original: dict) -> None:
+    assert restored["counts"] == original["counts"]
+    assert restored["progress"] == original["progress"]
+    assert restored["rng"] == original["rng"]
+    assert restored["player"] == pytest.approx(original["player"])
+    np.testing.assert_allclose(restored["enemies"], original["enemies"], atol=POSITION_TOLERANCE)
+
+
+def test_round_trip_restores_state_and_replays_next_frames():
+    sim = _simulation()
+    game = sim.game
+    assert game.enemies.count > 0 and not game.game_over
+    data = snapshot.dump(game)
+    saved = _state(game)
+    trace = []
+    for _ in range(120):
+        sim.step()
+        trace.append(_state(game))
+
+    snapshot.restore(game, data)
+    _assert_same(_state(game), saved)
+    for expected in trace:
+        sim.step()
+        _assert_same(_state(game), expected)
+
+
+def test_restore_into_other_game_matches_original():
+    game = _simulation().game
+    data = snapshot.dump(game)
+    other = Simulation(seed=99).game
+    snapshot.restore(other, data)
+    _assert_same(_state(other), _state(game))
+    assert other.world.seed == game.world.seed
+
+
+def test_truncated_snapshot_raises():
+    data = snapshot.dump(_simulation(frames=120).game)
+    for size in (0, 5, len(data) // 2, len(data) - 1):
+        with pytest.raises(ValueError):
+            snapshot.parse(data[:size])
+
+
+def test_corrupt_snapshot_raises_and_leaves_game_untouched():
+    sim = _simulation(frames=120)
+    data = bytearray(snapshot.dump(sim.game))
+    before = _state(sim.game)
+    middle = len(data) // 2
+    data[middle:middle + 30] = b"\xff" * 30
+    with pytest.raises(ValueError):
+        snapshot.restore(sim.game, bytes(data))
+    after = _state(sim.game)
+    assert after["counts"] == before["counts"]
+    np.testing.assert_array_equal(after["enemies"], before["enemies"])
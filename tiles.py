@@ -7,24 +7,18 @@ from constants import (
     POND_TILE_X, POND_TILE_Y,
     _tileset_cache
 )
+from src.assets import get_assets
 
 
 def get_tile(col: int, row: int, width: int = 1, height: int = 1) -> pygame.Surface:
-    """Vyřízne dlaždici z tilesetu a zvětší ji."""
+    """Vyřízne dlaždici z tilesetu a zvětší ji (tileset se dekóduje jen jednou, viz src/assets.py)."""
     key = (col, row, width, height)
     if key in _tileset_cache:
         return _tileset_cache[key]
 
-    # Použij convert_alpha pro zachování průhlednosti
-    tileset = pygame.image.load("image/tileset.png").convert_alpha()
-
-    tile = tileset.subsurface(pygame.Rect(
-        col * TILE_SIZE, row * TILE_SIZE,
-        width * TILE_SIZE, height * TILE_SIZE
-    ))
-    scaled = pygame.transform.scale(
-        tile,
-        (width * TILE_SIZE * TILESET_SCALE, height * TILE_SIZE * TILESET_SCALE)
+    scaled = get_assets().scaled(
+        "tileset.png", TILESET_SCALE,
+        (col * TILE_SIZE, row * TILE_SIZE, width * TILE_SIZE, height * TILE_SIZE),
     )
     _tileset_cache[key] = scaled
     return scaled
@@ -67,9 +61,10 @@ def get_water_tile(top: bool, bottom: bool, left: bool, right: bool) -> pygame.S
 
 
 def init_grass_variants() -> None:
-    """Inicializace trávy a uložení rozměrů tilesetu (zavolat po pygame.init())."""
+    """Přednačtení assetů, tráva a rozměry tilesetu (zavolat po pygame.display.set_mode())."""
     global GRASS_TILE, _tileset_cols, _tileset_rows
+    get_assets().preload()
     GRASS_TILE = _load_grass_tile()
-    ts = pygame.image.load("image/tileset.png")
-    _tileset_cols = ts.get_width() // TILE_SIZE
-    _tileset_rows = ts.get_height() // TILE_SIZE
+    width, height = get_assets().source_size("tileset.png")
+    _tileset_cols = width // TILE_SIZE
+    _tileset_rows = height // TILE_SIZE